@@ -0,0 +1,208 @@
+"""Speed/accuracy trade-off of the inference backends on one audio file.
+
+Each backend transcribes the same decoded audio in a fresh process (clean
+peak RSS, no model left in memory by the previous one). The report gives the
+load and transcription times, the realtime factor, the speed-up over the
+first backend and the word error rate (WER) against a reference: a
+transcript file (``--reference``, plain text or SRT) or, by default, the
+output of the first backend.
+
+Usage:
+    python benchmarks/bench_backends.py AUDIO [--model small]
+        [--backends whisper whisper-int8 faster-whisper] [--reference REF.txt]
+        [--device cpu] [--threads N] [--save NAME]
+
+``--save NAME`` writes ``benchmarks/baselines/backends-NAME.json``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe.audio import SAMPLE_RATE, decode_pcm  # noqa: E402
+from yt_whisper_scribe.backends import BACKENDS, load_model  # noqa: E402
+from yt_whisper_scribe.metrics import peak_rss_bytes  # noqa: E402
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+_SRT_LINE = re.compile(r"^\s*(\d+|\d\d:\d\d:\d\d[,.]\d+\s*-->.*)\s*$")
+_WORD = re.compile(r"[\w']+")
+
+
+def normalize_words(text: str) -> List[str]:
+    """Lower-cased words without punctuation; SRT numbers and timings are dropped."""
+    lines = [line for line in text.splitlines() if not _SRT_LINE.match(line)]
+    return _WORD.findall(" ".join(lines).lower())
+
+
+def word_error_rate(reference: List[str], hypothesis: List[str]) -> float:
+    """(substitutions + deletions + insertions) / reference words."""
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (ref_word != hyp_word),
+                )
+            )
+        previous = current
+    return previous[-1] / len(reference)
+
+
+def _run_backend(
+    backend: str, model: str, device: str, threads: int, audio: Any, kwargs: Dict[str, Any]
+) -> Dict[str, Any]:
+    if threads:
+        import torch  # type: ignore
+
+        torch.set_num_threads(threads)
+    t0 = time.perf_counter()
+    whisper_model = load_model(backend, model, device, threads=threads)
+    load_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    result = whisper_model.transcribe(audio, **kwargs)
+    transcribe_s = time.perf_counter() - t0
+    return {
+        "load_seconds": round(load_s, 3),
+        "transcribe_seconds": round(transcribe_s, 3),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "text": result.get("text", ""),
+        "segments": len(result.get("segments", [])),
+    }
+
+
+def run_backends(
+    audio: Any,
+    backends: List[str],
+    *,
+    model: str,
+    device: str = "cpu",
+    threads: int = 0,
+    language: Optional[str] = "en",
+    reference: Optional[str] = None,
+) -> Dict[str, Any]:
+    audio_s = len(audio) / SAMPLE_RATE
+    kwargs: Dict[str, Any] = dict(language=language, fp16=device == "cuda", verbose=None)
+    results: Dict[str, Dict[str, Any]] = {}
+    for backend in backends:
+        # spawn: every backend starts from an empty process
+        with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            try:
+                r = pool.submit(
+                    _run_backend, backend, model, device, threads, audio, kwargs
+                ).result()
+            except Exception as e:  # noqa: BLE001
+                print(f"{backend:<16} indisponible: {e}")
+                continue
+        r["realtime_factor"] = round(audio_s / r["transcribe_seconds"], 2)
+        results[backend] = r
+    summarize(results, reference)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "model": model,
+            "device": device,
+            "threads": threads,
+            "audio_seconds": round(audio_s, 3),
+            # WER reference: the given transcript, else the first backend's output
+            "reference": "fichier" if reference is not None else next(iter(results), None),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def summarize(results: Dict[str, Dict[str, Any]], reference: Optional[str] = None) -> None:
+    """Add ``speedup`` and ``wer`` to each result and print the comparison table.
+
+    Without ``reference`` text, the first backend is the reference: its WER
+    is 0 and the others measure their drift from it.
+    """
+    if not results:
+        return
+    first = next(iter(results.values()))
+    ref_words = normalize_words(reference if reference is not None else first["text"])
+    print(
+        f"{'backend':<16} {'chargement':>10} {'transcription':>13} {'x temps réel':>12} "
+        f"{'accélération':>12} {'WER':>7} {'pic RSS':>9}"
+    )
+    for backend, r in results.items():
+        r["speedup"] = round(first["transcribe_seconds"] / r["transcribe_seconds"], 2)
+        r["wer"] = round(word_error_rate(ref_words, normalize_words(r["text"])), 4)
+        rss = r.get("peak_rss_bytes")
+        print(
+            f"{backend:<16} {r['load_seconds']:>9.1f}s {r['transcribe_seconds']:>12.1f}s "
+            f"{r['realtime_factor']:>12.2f} {r['speedup']:>11.2f}x {100 * r['wer']:>6.2f}% "
+            f"{(f'{rss / 2**20:.0f} MiB' if rss else '-'):>9}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark vitesse/précision des backends")
+    parser.add_argument("audio", help="Fichier audio ou vidéo (décodé par ffmpeg).")
+    parser.add_argument("--model", default="small", help="Modèle Whisper (défaut: small).")
+    parser.add_argument(
+        "--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS), help="Backends comparés."
+    )
+    parser.add_argument(
+        "--reference", default=None, help="Transcription de référence (texte ou SRT) pour le WER."
+    )
+    parser.add_argument("--language", default="en", help="Langue forcée (défaut: en).")
+    parser.add_argument("--device", default="cpu", choices=["cpu", "cuda"], help="Défaut: cpu.")
+    parser.add_argument("--threads", type=int, default=0, help="Threads CPU (0: défaut).")
+    parser.add_argument(
+        "--save", default=None, help="Enregistre benchmarks/baselines/backends-NOM.json."
+    )
+    args = parser.parse_args(argv)
+
+    reference = None
+    if args.reference:
+        with open(args.reference, encoding="utf-8") as f:
+            reference = f.read()
+    report = run_backends(
+        decode_pcm(args.audio),
+        args.backends,
+        model="large-v3-turbo" if args.model == "turbo" else args.model,
+        device=args.device,
+        threads=args.threads,
+        language=None if args.language == "auto" else args.language,
+        reference=reference,
+    )
+    if not report["results"]:
+        return 1
+    if args.save:
+        BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+        path = BASELINE_DIR / f"backends-{args.save}.json"
+        for r in report["results"].values():
+            r.pop("text", None)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Rapport enregistré: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
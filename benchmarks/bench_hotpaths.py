@@ -0,0 +1,316 @@
+"""Benchmarks of the glossary replacement and SRT hot paths.
+
+Synthetic, seeded transcripts (100 to 200k segments) are run against the SWOOD
+glossary and generated glossaries of up to 5k entries. Each case reports
+throughput (items/s, best of ``--repeat`` runs) and peak traced memory.
+
+Usage:
+    python benchmarks/bench_hotpaths.py run [--quick] [--save NAME]
+    python benchmarks/bench_hotpaths.py compare BASELINE [CANDIDATE] [--threshold 0.1]
+
+``run --save NAME`` writes ``benchmarks/baselines/NAME.json``. ``compare``
+runs the suite (or reads CANDIDATE, a name or path) and exits with code 1 when
+a case is slower than the baseline by more than ``--threshold``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe.replace import (  # noqa: E402
+    StreamingReplacer,
+    apply_glossary_replacements,
+    compile_glossary,
+    load_glossary,
+)
+from yt_whisper_scribe.segments import SegmentStore  # noqa: E402
+from yt_whisper_scribe.srt import format_timestamp, generate_srt_content  # noqa: E402
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+SWOOD_GLOSSARY = PROJECT_ROOT / "SWOOD_Glossary.json"
+
+SEGMENT_SIZES = (100, 10_000, 200_000)
+QUICK_SEGMENT_SIZES = (100, 2_000)
+GLOSSARY_SIZES = ("swood", 1_000, 5_000)
+QUICK_GLOSSARY_SIZES = ("swood", 1_000)
+
+_FILLER = (
+    "the we you this that then now here panel cabinet drawer edge board machine tool path "
+    "report module click select open save import export layer view part assembly design "
+    "and of to in on for with as is it a"
+).split()
+
+
+def synthetic_glossary(size: int | str, seed: int = 0) -> Dict[str, Any]:
+    """The SWOOD glossary, or ``size`` generated entries of 1-3 variants each."""
+    if size == "swood":
+        return load_glossary(SWOOD_GLOSSARY)
+    rng = random.Random(seed)
+    entries = []
+    for i in range(int(size)):
+        variants = []
+        for _ in range(rng.randint(1, 3)):
+            n_words = rng.randint(1, 3)
+            words = [f"w{rng.randrange(50_000)}" for _ in range(n_words - 1)]
+            variants.append(" ".join(words + [f"t{i}"]))
+        entries.append({"correct_term": f"Term{i}", "detected_variants": variants})
+    return {"glossary": entries}
+
+
+def synthetic_segments(
+    n: int, glossary: Dict[str, Any], hit_rate: float = 0.1, seed: int = 0
+) -> List[Dict[str, Any]]:
+    """``n`` segments of 8-16 words; about ``hit_rate`` of them contain a variant.
+
+    Some variants are split across the segment boundary to exercise the
+    cross-boundary path.
+    """
+    rng = random.Random(seed)
+    variants = [v for e in glossary["glossary"] for v in e.get("detected_variants", [])]
+    segments: List[Dict[str, Any]] = []
+    carry: List[str] = []
+    t = 0.0
+    for _ in range(n):
+        words = carry + [rng.choice(_FILLER) for _ in range(rng.randint(8, 16))]
+        carry = []
+        if variants and rng.random() < hit_rate:
+            variant = rng.choice(variants).split()
+            if len(variant) > 1 and rng.random() < 0.3:
+                cut = rng.randint(1, len(variant) - 1)
+                words += variant[:cut]
+                carry = variant[cut:]
+            else:
+                words.insert(rng.randrange(len(words) + 1), " ".join(variant))
+        dur = rng.uniform(1.5, 6.0)
+        segments.append(
+            {"start": round(t, 2), "end": round(t + dur, 2), "text": " " + " ".join(words)}
+        )
+        t += dur
+    return segments
+
+
+def _stream_replace(segments: List[Dict[str, Any]], compiled: Any, window: int = 8) -> None:
+    replacer = StreamingReplacer(compiled)
+    for i in range(0, len(segments), window):
+        replacer.feed(segments[i : i + window])
+    replacer.flush()
+
+
+def _cases(quick: bool) -> List[Tuple[str, int, Callable[[], Any]]]:
+    """(name, items processed per call, callable) for every benchmark case."""
+    seg_sizes = QUICK_SEGMENT_SIZES if quick else SEGMENT_SIZES
+    gloss_sizes = QUICK_GLOSSARY_SIZES if quick else GLOSSARY_SIZES
+    cases: List[Tuple[str, int, Callable[[], Any]]] = []
+    for g in gloss_sizes:
+        glossary = synthetic_glossary(g)
+        n_variants = sum(len(e.get("detected_variants", [])) for e in glossary["glossary"])
+        cases.append(
+            (f"compile_glossary[g={g}]", n_variants, lambda gl=glossary: compile_glossary(gl))
+        )
+        compiled = compile_glossary(glossary)
+        for n in seg_sizes:
+            segments = synthetic_segments(n, glossary)
+            cases.append(
+                (
+                    f"apply_glossary_replacements[n={n},g={g}]",
+                    n,
+                    lambda s=segments, c=compiled: apply_glossary_replacements(s, c),
+                )
+            )
+            if g == "swood":
+                store = SegmentStore.from_segments(segments)
+                cases.append(
+                    (
+                        f"apply_glossary_store[n={n},g={g}]",
+                        n,
+                        lambda s=store, c=compiled: apply_glossary_replacements(s, c),
+                    )
+                )
+                cases.append(
+                    (
+                        f"apply_glossary_counts[n={n},g={g}]",
+                        n,
+                        lambda s=store, c=compiled: apply_glossary_replacements(
+                            s, c, counts_only=True
+                        ),
+                    )
+                )
+                cases.append(
+                    (
+                        f"streaming_replace[n={n},g={g}]",
+                        n,
+                        lambda s=segments, c=compiled: _stream_replace(s, c),
+                    )
+                )
+    for n in seg_sizes:
+        segments = synthetic_segments(n, {"glossary": []})
+        cases.append(
+            (
+                f"generate_srt_content[n={n}]",
+                n,
+                lambda s=segments: generate_srt_content({"segments": s}),
+            )
+        )
+        cases.append(
+            (
+                f"generate_srt_store[n={n}]",
+                n,
+                lambda s=SegmentStore.from_segments(segments): generate_srt_content(
+                    {"segments": s}
+                ),
+            )
+        )
+    stamps = [i * 0.731 for i in range(seg_sizes[-1])]
+    cases.append(
+        (
+            f"format_timestamp[n={len(stamps)}]",
+            len(stamps),
+            lambda ts=stamps: [format_timestamp(x) for x in ts],
+        )
+    )
+    return cases
+
+
+def _measure(fn: Callable[[], Any], items: int, repeat: int) -> Dict[str, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    # Separate traced run: tracemalloc slows the code under test
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds": round(best, 6),
+        "ops_per_s": round(items / best, 1) if best > 0 else float("inf"),
+        "peak_mem_bytes": peak,
+    }
+
+
+def run_suite(
+    quick: bool = False, repeat: int = 3, pattern: Optional[str] = None
+) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, float]] = {}
+    for name, items, fn in _cases(quick):
+        if pattern and pattern not in name:
+            continue
+        results[name] = _measure(fn, items, repeat)
+        r = results[name]
+        print(
+            f"{name:<52} {r['ops_per_s']:>14,.0f} ops/s {r['seconds'] * 1000:>10.1f} ms "
+            f"{r['peak_mem_bytes'] / 2**20:>8.1f} MiB"
+        )
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "quick": quick,
+            "repeat": repeat,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any], candidate: Dict[str, Any], threshold: float = 0.1
+) -> List[str]:
+    """Print the per-case ratios and return the names of regressed cases.
+
+    A case regresses when its throughput drops by more than ``threshold``
+    (0.1 = 10 %) relative to the baseline. Cases missing on either side are
+    reported but never fail the comparison.
+    """
+    regressions: List[str] = []
+    base, cand = baseline["results"], candidate["results"]
+    for name in sorted(set(base) | set(cand)):
+        if name not in base or name not in cand:
+            print(f"{name:<52} {'(absent de la référence)' if name not in base else '(absent)'}")
+            continue
+        ratio = cand[name]["ops_per_s"] / base[name]["ops_per_s"]
+        mem = cand[name]["peak_mem_bytes"] / max(base[name]["peak_mem_bytes"], 1)
+        flag = ""
+        if ratio < 1 - threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<52} x{ratio:6.2f} débit   x{mem:6.2f} mémoire{flag}")
+    return regressions
+
+
+def _load(name_or_path: str) -> Dict[str, Any]:
+    path = Path(name_or_path)
+    if not path.suffix:
+        path = BASELINE_DIR / f"{name_or_path}.json"
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save(report: Dict[str, Any], name: str) -> Path:
+    BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+    path = BASELINE_DIR / f"{name}.json"
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks glossaire + SRT")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for cmd in ("run", "compare"):
+        p = sub.add_parser(cmd)
+        p.add_argument("--quick", action="store_true", help="Tailles réduites (CI).")
+        p.add_argument("--repeat", type=int, default=3, help="Répétitions (meilleur temps).")
+        p.add_argument("-k", dest="pattern", default=None, help="Filtre sur le nom des cas.")
+        if cmd == "run":
+            p.add_argument("--save", default=None, help="Enregistre benchmarks/baselines/NOM.json.")
+        else:
+            p.add_argument("baseline", help="Nom (benchmarks/baselines/) ou chemin JSON.")
+            p.add_argument("candidate", nargs="?", default=None, help="Sinon: exécute la suite.")
+            p.add_argument(
+                "--threshold", type=float, default=0.1, help="Baisse de débit tolérée (0.1 = 10%%)."
+            )
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run_suite(args.quick, args.repeat, args.pattern)
+        if args.save:
+            print(f"Référence enregistrée: {_save(report, args.save)}")
+        return 0
+
+    baseline = _load(args.baseline)
+    if args.candidate:
+        candidate = _load(args.candidate)
+    else:
+        candidate = run_suite(baseline["meta"].get("quick", False), args.repeat, args.pattern)
+    regressions = compare(baseline, candidate, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} régression(s) au-delà de {args.threshold:.0%}")
+        return 1
+    print("Aucune régression.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+# Supporte l'exécution directe sans installation (src-layout)
+try:  # pragma: no cover - chemin de prod
+    from yt_whisper_scribe.backends import BACKENDS, DEFAULT_BACKEND
+    from yt_whisper_scribe.batch import read_urls
+    from yt_whisper_scribe.jobqueue import JOB_STATES, JobQueue, run_workers
+    from yt_whisper_scribe.writers import output_formats
+except ModuleNotFoundError:  # pragma: no cover - chemin dev local
+    ROOT = Path(__file__).resolve().parents[1]
+    SRC = ROOT / "src"
+    if SRC.exists():
+        sys.path.insert(0, str(SRC))
+    from yt_whisper_scribe.backends import BACKENDS, DEFAULT_BACKEND
+    from yt_whisper_scribe.batch import read_urls
+    from yt_whisper_scribe.jobqueue import JOB_STATES, JobQueue, run_workers
+    from yt_whisper_scribe.writers import output_formats
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "File de jobs de transcription persistante (SQLite): ajout d'URLs, workers "
+            "(plusieurs processus ou machines sur le même fichier) et état."
+        ),
+    )
+    parser.add_argument(
+        "--db",
+        type=str,
+        default="data/jobs.sqlite",
+        help="Fichier SQLite de la file (défaut: data/jobs.sqlite).",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = sub.add_parser("enqueue", help="Ajoute des URLs à la file.")
+    enqueue.add_argument("urls", nargs="*", help="URLs des vidéos.")
+    enqueue.add_argument(
+        "--urls-file", type=str, default=None, help="Fichier d'URLs (une par ligne, '-' = stdin)."
+    )
+    enqueue.add_argument("--model", type=str, default=None, help="Modèle Whisper du job.")
+    enqueue.add_argument(
+        "--cascade-model",
+        type=str,
+        default=None,
+        help="Modèle plus précis pour les passages incertains (mode cascade).",
+    )
+    enqueue.add_argument(
+        "--output_format", type=output_formats, default=None, help="Format(s) de sortie du job."
+    )
+    enqueue.add_argument("--language", type=str, default=None, help="Langue du job.")
+    enqueue.add_argument(
+        "--task", type=str, default=None, choices=["transcribe", "translate"], help="Tâche."
+    )
+    enqueue.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        help="Tentatives maximales par job, reprises après crash comprises (défaut: 3).",
+    )
+
+    worker = sub.add_parser("worker", help="Exécute les jobs de la file.")
+    worker.add_argument(
+        "--processes", type=int, default=1, help="Nombre de processus workers (défaut: 1)."
+    )
+    worker.add_argument(
+        "--exit-when-empty",
+        action="store_true",
+        help=(
+            "S'arrête quand plus aucun job n'est en attente ni en cours, "
+            "nouvelles tentatives comprises (pratique depuis cron)."
+        ),
+    )
+    worker.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=300.0,
+        help="Durée du bail d'un job, renouvelé tant que le worker vit (défaut: 300).",
+    )
+    worker.add_argument(
+        "--backend",
+        type=str,
+        default=DEFAULT_BACKEND,
+        choices=BACKENDS,
+        help=(
+            "Moteur d'inférence: whisper (openai-whisper, défaut), whisper-int8 (mêmes "
+            "poids quantifiés int8 par PyTorch, CPU), faster-whisper (CTranslate2 int8, "
+            "paquet faster-whisper requis)."
+        ),
+    )
+    worker.add_argument("--output_dir", type=str, default="data", help="Dossier de sortie.")
+    worker.add_argument(
+        "--device",
+        type=str,
+        default="cuda",
+        choices=["auto", "cuda", "cpu"],
+        help="Périphérique d'exécution (défaut: cuda).",
+    )
+    worker.add_argument(
+        "--replace-map",
+        type=str,
+        default="SWOOD_Glossary.json",
+        help="Glossaire par défaut des jobs.",
+    )
+    worker.add_argument("--cookies-file", type=str, default=None, help="cookies.txt (yt-dlp).")
+    worker.add_argument(
+        "--audio-cache", type=str, default=None, help="Dossier de cache audio partagé."
+    )
+    worker.add_argument(
+        "--result-cache", type=str, default=None, help="Dossier de cache des résultats Whisper."
+    )
+    worker.add_argument(
+        "--dedupe-audio",
+        action="store_true",
+        help="Avec --result-cache: réutilise la transcription d'un audio déjà vu (réupload).",
+    )
+    worker.add_argument("--verbose", action="store_true", help="Active des logs détaillés.")
+
+    status = sub.add_parser("status", help="Affiche l'état de la file.")
+    status.add_argument(
+        "--list", choices=JOB_STATES, default=None, help="Liste les jobs dans cet état."
+    )
+    status.add_argument("--json", action="store_true", help="Sortie JSON.")
+
+    sub.add_parser("requeue", help="Remet en file les jobs en échec.")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    logging.basicConfig(
+        level=logging.INFO if getattr(args, "verbose", False) else logging.WARNING,
+        format="[%(levelname)s] %(message)s",
+    )
+    if args.command == "worker":
+        run_workers(
+            args.db,
+            processes=args.processes,
+            lease_seconds=args.lease_seconds,
+            exit_when_empty=args.exit_when_empty,
+            output_dir=args.output_dir,
+            device=args.device,
+            backend=args.backend,
+            replace_map=args.replace_map,
+            cookies_file=args.cookies_file,
+            audio_cache_dir=args.audio_cache,
+            result_cache_dir=args.result_cache,
+            dedupe_audio=args.dedupe_audio,
+            verbose=args.verbose,
+        )
+        return
+
+    queue = JobQueue(args.db)
+    if args.command == "enqueue":
+        urls = list(args.urls) + (read_urls(args.urls_file) if args.urls_file else [])
+        if not urls:
+            raise SystemExit("aucune URL à ajouter")
+        options = {
+            key: value
+            for key, value in (
+                ("model", args.model),
+                ("cascade_model", args.cascade_model),
+                ("output_format", args.output_format),
+                ("language", args.language),
+                ("task", args.task),
+            )
+            if value is not None
+        }
+        added = queue.enqueue(urls, options, max_attempts=args.max_attempts)
+        print(f"[jobs] {added} job(s) ajouté(s), {len(urls) - added} déjà présent(s)")
+    elif args.command == "requeue":
+        print(f"[jobs] {queue.requeue_failed()} job(s) remis en file")
+    else:
+        counts = queue.counts()
+        jobs = queue.jobs(args.list, limit=1000) if args.list else []
+        if args.json:
+            print(json.dumps({"counts": counts, "jobs": jobs}, ensure_ascii=False, indent=2))
+            return
+        print(" ".join(f"{state}={counts[state]}" for state in JOB_STATES))
+        for job in jobs:
+            detail = job["error"] or job["result"] or job["worker"] or ""
+            print(
+                f"{job['id']:>6} {job['state']:<8} {job['attempts']}/{job['max_attempts']} "
+                f"{job['url']} {detail}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Supporte l'exécution directe sans installation (src-layout)
+try:  # pragma: no cover - chemin de prod
+    from yt_whisper_scribe.recorrect import recorrect_corpus
+except ModuleNotFoundError:  # pragma: no cover - chemin dev local
+    ROOT = Path(__file__).resolve().parents[1]
+    SRC = ROOT / "src"
+    if SRC.exists():
+        sys.path.insert(0, str(SRC))
+    from yt_whisper_scribe.recorrect import recorrect_corpus
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Réapplique le glossaire aux sorties SRT/TXT existantes (récursivement), "
+            "sans retranscrire. Seuls les fichiers modifiés sont réécrits."
+        ),
+    )
+    parser.add_argument(
+        "output_dir", type=str, nargs="?", default="data", help="Dossier des sorties."
+    )
+    parser.add_argument(
+        "--replace-map",
+        type=str,
+        default="SWOOD_Glossary.json",
+        help="Glossaire JSON à appliquer (défaut: SWOOD_Glossary.json).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Nombre de processus (défaut: nombre de cœurs).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Retraite aussi les fichiers déjà corrigés avec ce glossaire.",
+    )
+    parser.add_argument(
+        "--dry-run-replace",
+        action="store_true",
+        help="N'écrit rien; compte seulement les fichiers qui changeraient.",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Active des logs détaillés.")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="[%(levelname)s] %(message)s",
+    )
+    summary = recorrect_corpus(
+        args.output_dir,
+        args.replace_map,
+        workers=args.workers,
+        dry_run=args.dry_run_replace,
+        force=args.force,
+    )
+    verb = "à modifier" if args.dry_run_replace else "modifié(s)"
+    print(
+        f"[recorrect] {summary['changed']} {verb}, {summary['unchanged']} inchangé(s), "
+        f"{summary['skipped']} déjà à jour, {summary['error']} erreur(s) "
+        f"({summary['replacements']} remplacements)"
+    )
+    if summary["error"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
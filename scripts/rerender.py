@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Supporte l'exécution directe sans installation (src-layout)
+try:  # pragma: no cover - chemin de prod
+    from yt_whisper_scribe.pipeline import rerender_cached
+    from yt_whisper_scribe.result_cache import ResultCache, read_entry
+    from yt_whisper_scribe.writers import output_formats
+except ModuleNotFoundError:  # pragma: no cover - chemin dev local
+    ROOT = Path(__file__).resolve().parents[1]
+    SRC = ROOT / "src"
+    if SRC.exists():
+        sys.path.insert(0, str(SRC))
+    from yt_whisper_scribe.pipeline import rerender_cached
+    from yt_whisper_scribe.result_cache import ResultCache, read_entry
+    from yt_whisper_scribe.writers import output_formats
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Regénère les sorties (SRT, TXT, VTT, TSV, JSON) depuis le cache de résultats Whisper "
+            "(glossaire et format), sans retélécharger ni retranscrire."
+        ),
+    )
+    parser.add_argument("result_cache", type=str, help="Dossier du cache (--result-cache).")
+    parser.add_argument(
+        "--video-id",
+        nargs="+",
+        default=None,
+        help="Limiter à ces identifiants vidéo (défaut: tout le cache).",
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=None,
+        help="Limiter aux résultats de ce modèle (défaut: le plus récent par vidéo).",
+    )
+    parser.add_argument(
+        "--output_format",
+        default="srt",
+        type=output_formats,
+        help=(
+            "Format(s) de sortie: srt, txt, vtt, tsv, json (segments + timings des mots). "
+            "Plusieurs séparés par des virgules, ex. 'srt,vtt,json': une seule transcription."
+        ),
+    )
+    parser.add_argument("--output_dir", type=str, default="data", help="Dossier de sortie.")
+    parser.add_argument(
+        "--replace-map",
+        type=str,
+        default="SWOOD_Glossary.json",
+        help="Glossaire JSON à appliquer (défaut: SWOOD_Glossary.json).",
+    )
+    parser.add_argument(
+        "--dry-run-replace",
+        action="store_true",
+        help="N'applique pas les remplacements; logge seulement les suggestions.",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Active des logs détaillés.")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="[%(levelname)s] %(message)s",
+    )
+    cache = ResultCache(args.result_cache)
+
+    # One entry per video: the most recent one (optionally for a given model)
+    latest = {}
+    for path in cache.entries(args.video_id):
+        if args.model and read_entry(path)["params"].get("model") != args.model:
+            continue
+        video_id = os.path.basename(os.path.dirname(path))
+        if video_id not in latest or os.path.getmtime(path) > os.path.getmtime(latest[video_id]):
+            latest[video_id] = path
+
+    for path in latest.values():
+        rerender_cached(
+            path,
+            output_format=args.output_format,
+            output_dir=args.output_dir,
+            replace_map=args.replace_map,
+            dry_run_replace=args.dry_run_replace,
+        )
+    print(f"[rerender] {len(latest)} sortie(s) regénérée(s)")
+
+
+if __name__ == "__main__":
+    main()
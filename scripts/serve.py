@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Supporte l'exécution directe sans installation (src-layout)
+try:  # pragma: no cover - chemin de prod
+    from yt_whisper_scribe.backends import BACKENDS, DEFAULT_BACKEND
+    from yt_whisper_scribe.server import TranscriptionService, serve
+except ModuleNotFoundError:  # pragma: no cover - chemin dev local
+    ROOT = Path(__file__).resolve().parents[1]
+    SRC = ROOT / "src"
+    if SRC.exists():
+        sys.path.insert(0, str(SRC))
+    from yt_whisper_scribe.backends import BACKENDS, DEFAULT_BACKEND
+    from yt_whisper_scribe.server import TranscriptionService, serve
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Serveur de transcription: garde les modèles Whisper chargés et accepte des jobs "
+            "JSON (POST /transcribe) en HTTP local ou sur socket Unix."
+        ),
+    )
+    parser.add_argument(
+        "--models",
+        nargs="+",
+        default=["small"],
+        help="Modèles préchargés, seuls servis (le 1er est le défaut des jobs). Ex: small turbo",
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Adresse d'écoute HTTP.")
+    parser.add_argument("--port", type=int, default=8765, help="Port HTTP (défaut: 8765).")
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        help="Chemin d'une socket Unix (remplace --host/--port).",
+    )
+    parser.add_argument(
+        "--device",
+        type=str,
+        default="cuda",
+        choices=["auto", "cuda", "cpu"],
+        help="Périphérique d'exécution (auto/cuda/cpu). Par défaut: cuda.",
+    )
+    parser.add_argument(
+        "--backend",
+        type=str,
+        default=DEFAULT_BACKEND,
+        choices=BACKENDS,
+        help=(
+            "Moteur d'inférence: whisper (openai-whisper, défaut), whisper-int8 (mêmes "
+            "poids quantifiés int8 par PyTorch, CPU), faster-whisper (CTranslate2 int8, "
+            "paquet faster-whisper requis)."
+        ),
+    )
+    parser.add_argument("--output_dir", type=str, default="data", help="Dossier de sortie.")
+    parser.add_argument(
+        "--audio_format",
+        type=str,
+        default="native",
+        choices=["native", "m4a", "wav"],
+        help=(
+            "Format audio intermédiaire pour le téléchargement. 'native' (défaut) garde le flux "
+            "d'origine sans réencodage; il est décodé une seule fois en PCM 16 kHz en mémoire."
+        ),
+    )
+    parser.add_argument(
+        "--replace-map",
+        type=str,
+        default="SWOOD_Glossary.json",
+        help="Glossaire par défaut des jobs (rechargé automatiquement s'il change).",
+    )
+    parser.add_argument("--cookies-file", type=str, default=None, help="cookies.txt (yt-dlp).")
+    parser.add_argument(
+        "--audio-cache",
+        type=str,
+        default=None,
+        help="Dossier de cache audio (par id vidéo et format); évite de retélécharger.",
+    )
+    parser.add_argument(
+        "--audio-cache-max-gb",
+        type=float,
+        default=10.0,
+        help="Taille maximale du cache audio en Go (éviction LRU, défaut: 10).",
+    )
+    parser.add_argument(
+        "--result-cache",
+        type=str,
+        default=None,
+        help=(
+            "Dossier de cache des résultats Whisper: une vidéo déjà transcrite avec les mêmes "
+            "paramètres est rendue sans téléchargement ni modèle."
+        ),
+    )
+    parser.add_argument(
+        "--download-concurrency",
+        type=int,
+        default=2,
+        help="Téléchargements yt-dlp simultanés au plus, tous jobs confondus (défaut: 2).",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Active des logs détaillés.")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="[%(levelname)s] %(message)s",
+    )
+    service = TranscriptionService(
+        models=args.models,
+        device=args.device,
+        backend=args.backend,
+        output_dir=args.output_dir,
+        audio_format=args.audio_format,
+        cookies_file=args.cookies_file,
+        verbose=args.verbose,
+        audio_cache_dir=args.audio_cache,
+        audio_cache_max_gb=args.audio_cache_max_gb,
+        result_cache_dir=args.result_cache,
+        download_concurrency=args.download_concurrency,
+        replace_map=args.replace_map,
+    )
+    serve(service, host=args.host, port=args.port, socket_path=args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,20 +7,32 @@ import time
 
 # Supporte l'exécution directe sans installation (src-layout)
 try:  # pragma: no cover - chemin de prod
+    from yt_whisper_scribe.backends import BACKENDS, DEFAULT_BACKEND
+    from yt_whisper_scribe.batch import read_urls, transcribe_batch
     from yt_whisper_scribe.pipeline import transcribe_youtube
+    from yt_whisper_scribe.writers import output_formats
 except ModuleNotFoundError:  # pragma: no cover - chemin dev local
     ROOT = Path(__file__).resolve().parents[1]
     SRC = ROOT / "src"
     if SRC.exists():
         sys.path.insert(0, str(SRC))
+    from yt_whisper_scribe.backends import BACKENDS, DEFAULT_BACKEND
+    from yt_whisper_scribe.batch import read_urls, transcribe_batch
     from yt_whisper_scribe.pipeline import transcribe_youtube
+    from yt_whisper_scribe.writers import output_formats
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Transcrire une vidéo YouTube avec Whisper et un vocabulaire personnalisé.",
     )
-    parser.add_argument("url", type=str, help="L'URL de la vidéo YouTube.")
+    parser.add_argument(
+        "url",
+        type=str,
+        nargs="?",
+        default=None,
+        help="L'URL de la vidéo YouTube (ou d'une playlist/chaîne avec --playlist).",
+    )
     parser.add_argument(
         "--model",
         type=str,
@@ -42,11 +54,31 @@ def build_parser() -> argparse.ArgumentParser:
         ),
     )
     parser.add_argument(
-        "--output_format",
+        "--cascade-model",
         type=str,
+        default=None,
+        choices=[
+            "medium",
+            "large",
+            "large-v2",
+            "large-v3",
+            "large-v3-turbo",
+            "turbo",
+        ],
+        help=(
+            "Mode cascade: --model transcrit toute la vidéo, puis ce modèle plus précis "
+            "retranscrit seulement les passages incertains (avg_logprob bas, compression "
+            "élevée, no_speech élevé, mots-clés « anti » du glossaire)."
+        ),
+    )
+    parser.add_argument(
+        "--output_format",
         default="srt",
-        choices=["txt", "srt"],
-        help="Format de sortie (txt ou srt).",
+        type=output_formats,
+        help=(
+            "Format(s) de sortie: srt, txt, vtt, tsv, json (segments + timings des mots). "
+            "Plusieurs séparés par des virgules, ex. 'srt,vtt,json': une seule transcription."
+        ),
     )
     parser.add_argument(
         "--output_dir",
@@ -76,9 +108,12 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--audio_format",
         type=str,
-        default="m4a",
-        choices=["m4a", "wav"],
-        help="Format audio intermédiaire pour le téléchargement.",
+        default="native",
+        choices=["native", "m4a", "wav"],
+        help=(
+            "Format audio intermédiaire pour le téléchargement. 'native' (défaut) garde le flux "
+            "d'origine sans réencodage; il est décodé une seule fois en PCM 16 kHz en mémoire."
+        ),
     )
     parser.add_argument(
         "--verbose",
@@ -143,16 +178,120 @@ def build_parser() -> argparse.ArgumentParser:
             "Useful if some GPU/driver/torch combos produce degenerate outputs."
         ),
     )
+    parser.add_argument(
+        "--audio-cache",
+        type=str,
+        default=None,
+        help="Dossier de cache audio (par id vidéo et format); évite de retélécharger.",
+    )
+    parser.add_argument(
+        "--audio-cache-max-gb",
+        type=float,
+        default=10.0,
+        help="Taille maximale du cache audio en Go (éviction LRU, défaut: 10).",
+    )
+    parser.add_argument(
+        "--result-cache",
+        type=str,
+        default=None,
+        help=(
+            "Dossier de cache des résultats Whisper bruts. Un même couple vidéo/paramètres "
+            "n'est plus retranscrit; voir scripts/rerender.py pour regénérer les sorties."
+        ),
+    )
+    parser.add_argument(
+        "--dedupe-audio",
+        action="store_true",
+        help=(
+            "Avec --result-cache: empreinte audio de chaque vidéo; un réupload ou un extrait "
+            "d'une vidéo déjà transcrite réutilise sa transcription (horodatage recalé)."
+        ),
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Écrit la sortie (SRT/TXT) au fil de la transcription, fenêtre par fenêtre, "
+            "avec la progression en secondes d'audio."
+        ),
+    )
+    parser.add_argument(
+        "--backend",
+        type=str,
+        default=DEFAULT_BACKEND,
+        choices=BACKENDS,
+        help=(
+            "Moteur d'inférence: whisper (openai-whisper, défaut), whisper-int8 (mêmes "
+            "poids quantifiés int8 par PyTorch, CPU), faster-whisper (CTranslate2 int8, "
+            "paquet faster-whisper requis)."
+        ),
+    )
+    parser.add_argument(
+        "--cpu-workers",
+        type=int,
+        default=0,
+        help=(
+            "Avec --device cpu: découpe l'audio en fenêtres (coupées sur les silences) "
+            "transcrites en parallèle par N processus (défaut: 0, désactivé)."
+        ),
+    )
+    parser.add_argument(
+        "--chunk-seconds",
+        type=float,
+        default=120.0,
+        help="Durée cible des fenêtres pour --cpu-workers (défaut: 120).",
+    )
+    parser.add_argument(
+        "--metrics-jsonl",
+        type=str,
+        default=None,
+        help=(
+            "Ajoute une ligne JSON par vidéo: durées par étape (téléchargement, chargement "
+            "du modèle, transcription, glossaire, écriture), durée audio, facteur temps réel, "
+            "pic RSS, octets téléchargés, tentatives et remplacements."
+        ),
+    )
+    parser.add_argument(
+        "--metrics-prom",
+        type=str,
+        default=None,
+        help="Fichier texte Prometheus (collecteur textfile de node_exporter), réécrit par vidéo.",
+    )
+    parser.add_argument(
+        "--urls-file",
+        type=str,
+        default=None,
+        help="Mode batch: fichier d'URLs (une par ligne, '-' pour stdin).",
+    )
+    parser.add_argument(
+        "--playlist",
+        action="store_true",
+        help="Mode batch: développe les URLs de playlist/chaîne en vidéos.",
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=2,
+        help="Mode batch: nombre de téléchargements préchargés en avance (défaut: 2).",
+    )
+    parser.add_argument(
+        "--download-workers",
+        type=int,
+        default=2,
+        help="Mode batch: threads de téléchargement en arrière-plan (défaut: 2).",
+    )
     return parser
 
 
 def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
+    if not args.url and not args.urls_file:
+        parser.error("une URL ou --urls-file est requis")
+    if args.dedupe_audio and not args.result_cache:
+        parser.error("--dedupe-audio nécessite --result-cache")
 
-    start = time.monotonic()
-    transcribe_youtube(
-        args.url,
+    options = dict(
         model=args.model,
         output_format=args.output_format,
         output_dir=args.output_dir,
@@ -170,8 +309,37 @@ def main() -> None:
         overwrite=args.overwrite,
         skip_existing=args.skip_existing,
         cookies_file=args.cookies_file,
+        audio_cache_dir=args.audio_cache,
+        audio_cache_max_gb=args.audio_cache_max_gb,
+        result_cache_dir=args.result_cache,
+        dedupe_audio=args.dedupe_audio,
+        cascade_model=args.cascade_model,
+        backend=args.backend,
+        stream=args.stream,
+        cpu_workers=args.cpu_workers,
+        chunk_seconds=args.chunk_seconds,
+        metrics_jsonl=args.metrics_jsonl,
+        metrics_prom=args.metrics_prom,
     )
 
+    start = time.monotonic()
+    exit_code = 0
+    if args.urls_file or args.playlist:
+        urls = ([args.url] if args.url else []) + (
+            read_urls(args.urls_file) if args.urls_file else []
+        )
+        items = transcribe_batch(
+            urls,
+            expand_playlists=args.playlist,
+            prefetch=args.prefetch,
+            download_workers=args.download_workers,
+            **options,
+        )
+        if any(item.error for item in items):
+            exit_code = 1
+    else:
+        transcribe_youtube(args.url, **options)
+
     # Global elapsed time from CLI start to end
     elapsed = time.monotonic() - start
     h = int(elapsed // 3600)
@@ -179,6 +347,8 @@ def main() -> None:
     s = int(elapsed % 60)
     total_fmt = f"{h:02d}:{m:02d}:{s:02d}"
     print(f"Temps total de la procédure: {total_fmt}")
+    if exit_code:
+        raise SystemExit(exit_code)
 
 
 if __name__ == "__main__":
@@ -4,9 +4,10 @@ Provides utilities to download audio from YouTube, transcribe with Whisper,
 and generate SRT/TXT outputs.
 """
 
-from .srt import format_timestamp, generate_srt_content
+from .srt import format_timestamp, generate_srt_content, parse_srt
 
 __all__ = [
     "format_timestamp",
     "generate_srt_content",
+    "parse_srt",
 ]
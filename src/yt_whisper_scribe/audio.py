@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import subprocess
+import tempfile
+
+import numpy as np
+
+# Whisper's input rate
+SAMPLE_RATE = 16000
+
+
+def decode_pcm(path: str, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Decode any audio/video file to mono float32 PCM in memory.
+
+    One ffmpeg process writes raw ``f32le`` samples to a pipe, so the
+    downloaded stream is decoded exactly once and nothing is written to disk.
+    The array can be passed to ``transcribe`` instead of a path.
+    """
+    cmd = [
+        "ffmpeg",
+        "-nostdin",
+        "-threads",
+        "0",
+        "-i",
+        path,
+        "-f",
+        "f32le",
+        "-acodec",
+        "pcm_f32le",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-",
+    ]
+    # Samples are read into one bytearray and viewed in place: the array is
+    # writable (torch needs it) without a second full-size copy. stderr goes
+    # to a temporary file so a chatty ffmpeg cannot block on a full pipe
+    pcm = bytearray()
+    with tempfile.TemporaryFile() as stderr:
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr) as proc:
+            assert proc.stdout is not None
+            for chunk in iter(lambda: proc.stdout.read(1 << 20), b""):
+                pcm += chunk
+        if proc.returncode != 0:
+            stderr.seek(0)
+            tail = stderr.read().decode("utf-8", errors="replace").strip()[-500:]
+            raise RuntimeError(f"Échec du décodage audio de {path}: {tail}")
+    del pcm[len(pcm) - len(pcm) % 4 :]
+    return np.frombuffer(pcm, np.float32)
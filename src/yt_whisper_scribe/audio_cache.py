@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+# info_dict keys kept next to the cached audio: enough to name the output offline
+_INFO_KEYS = ("id", "title", "duration", "webpage_url", "channel", "uploader", "upload_date")
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+class AudioCache:
+    """Content-addressed audio store keyed by ``(video_id, audio_format)``.
+
+    Entries are ``<id>.<format>`` plus a ``<id>.<format>.json`` sidecar holding
+    the trimmed info_dict. Inserts are atomic (temp file + ``os.replace``) so
+    concurrent jobs and processes can share the directory. Total size is kept
+    under ``max_bytes`` by evicting the least recently used entries (a hit
+    refreshes the entry's mtime).
+    """
+
+    def __init__(self, root: str, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _paths(self, video_id: str, audio_format: str) -> Tuple[str, str]:
+        audio = os.path.join(self.root, f"{video_id}.{audio_format}")
+        return audio, audio + ".json"
+
+    def fetch(
+        self, video_id: str, audio_format: str, dest: str
+    ) -> Optional[Tuple[Dict[str, Any], str]]:
+        """Materialize a cached entry at ``dest`` (hard link, else copy).
+
+        Returns ``(info_dict, dest)`` on a hit, None on a miss. ``dest`` stays
+        valid even if the entry is evicted meanwhile.
+        """
+        audio, meta = self._paths(video_id, audio_format)
+        try:
+            with open(meta, encoding="utf-8") as f:
+                info_dict = json.load(f)
+            _link_or_copy(audio, dest)
+            os.utime(audio)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            logging.info(
+                "[audio-cache] miss %s.%s (hits=%d, misses=%d)",
+                video_id,
+                audio_format,
+                self.hits,
+                self.misses,
+            )
+            return None
+        with self._lock:
+            self.hits += 1
+        logging.info(
+            "[audio-cache] hit %s.%s (hits=%d, misses=%d)",
+            video_id,
+            audio_format,
+            self.hits,
+            self.misses,
+        )
+        return info_dict, dest
+
+    def store(self, info_dict: Dict[str, Any], audio_format: str, src: str) -> None:
+        """Insert ``src`` (left in place) for ``info_dict['id']``, then evict if needed."""
+        video_id = info_dict.get("id")
+        if not video_id:
+            return
+        audio, meta = self._paths(video_id, audio_format)
+        tmp = os.path.join(self.root, f".{uuid.uuid4().hex}.tmp")
+        try:
+            _link_or_copy(src, tmp)
+            os.replace(tmp, audio)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({k: info_dict[k] for k in _INFO_KEYS if k in info_dict}, f)
+            # Sidecar last: an entry is visible only once its audio is complete
+            os.replace(tmp, meta)
+        except OSError as e:
+            logging.warning("[audio-cache] Insertion impossible pour %s: %s", video_id, e)
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits ``max_bytes``."""
+        entries = []
+        total = 0
+        try:
+            names = os.listdir(self.root)
+        except OSError:
+            return
+        for name in names:
+            if name.startswith(".") or name.endswith(".json"):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                st = os.stat(path)
+                meta_size = os.path.getsize(path + ".json") if os.path.exists(path + ".json") else 0
+            except OSError:
+                continue
+            size = st.st_size + meta_size
+            entries.append((st.st_mtime, path, size))
+            total += size
+        entries.sort()
+        for _, path, size in entries:
+            if total <= self.max_bytes:
+                break
+            for p in (path + ".json", path):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+            total -= size
+            logging.info("[audio-cache] Éviction: %s", os.path.basename(path))
+
+
+_caches: Dict[str, AudioCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_audio_cache(root: str, max_gb: float = 10.0) -> AudioCache:
+    """Process-wide AudioCache for ``root`` (shared hit/miss counters)."""
+    key = os.path.abspath(root)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = AudioCache(root, int(max_gb * 1024**3))
+        return cache
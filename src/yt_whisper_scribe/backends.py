@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterator, Tuple
+
+# Inference engines. A loaded model exposes ``transcribe(audio, **kwargs)``
+# returning openai-whisper's result structure ({"text", "language", "segments"});
+# it may also expose ``segments(audio, **kwargs)`` to iterate segments as they
+# are decoded (see SegmentStream) and ``close()``.
+BACKENDS = ("whisper", "whisper-int8", "faster-whisper")
+DEFAULT_BACKEND = "whisper"
+# Backends whose int8 kernels only run on the CPU
+CPU_ONLY_BACKENDS = ("whisper-int8",)
+
+# openai-whisper options with a different name in faster-whisper
+_FASTER_OPTION_NAMES = {"logprob_threshold": "log_prob_threshold"}
+# openai-whisper options faster-whisper has no use for
+_FASTER_IGNORED_OPTIONS = ("verbose", "fp16")
+
+
+def backend_device(backend: str, device: str) -> str:
+    """Device the backend actually runs on: CPU-only backends ignore ``cuda``."""
+    if backend in CPU_ONLY_BACKENDS and device != "cpu":
+        logging.warning(
+            "--backend %s: exécution sur cpu (int8 non disponible sur %s)", backend, device
+        )
+        return "cpu"
+    return device
+
+
+def load_model(backend: str, model: str, device: str, *, threads: int = 0) -> Any:
+    """Load ``model`` (a resolved Whisper name such as ``large-v3-turbo``) with ``backend``.
+
+    ``threads`` sets faster-whisper's CPU threads (0: its default); torch
+    backends use the process-wide torch setting.
+    """
+    if backend == "whisper":
+        import whisper  # type: ignore
+
+        return whisper.load_model(model, device=device)
+    if backend == "whisper-int8":
+        import whisper  # type: ignore
+
+        return quantize_int8(whisper.load_model(model, device="cpu"))
+    if backend == "faster-whisper":
+        return FasterWhisperModel(model, device=device, threads=threads)
+    raise ValueError(f"backend inconnu: {backend!r} (choix: {', '.join(BACKENDS)})")
+
+
+def quantize_int8(whisper_model: Any) -> Any:
+    """Dynamic int8 quantization of an openai-whisper model's linear layers (CPU).
+
+    Weights are stored as int8 and activations quantized on the fly: the
+    attention and MLP matmuls, most of the encoder and decoder time, run on
+    int8 kernels. Convolutions, embeddings and layer norms stay in float32.
+    """
+    import torch  # type: ignore
+
+    for module in whisper_model.modules():
+        if isinstance(module, torch.nn.Linear):
+            # whisper.model.Linear only casts its weights to the input dtype,
+            # a no-op in float32; the quantizer only swaps exact nn.Linear
+            module.__class__ = torch.nn.Linear
+    return torch.ao.quantization.quantize_dynamic(
+        whisper_model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+    )
+
+
+def _segment_dict(index: int, segment: Any) -> Dict[str, Any]:
+    seg: Dict[str, Any] = {
+        "id": index,
+        "seek": segment.seek,
+        "start": segment.start,
+        "end": segment.end,
+        "text": segment.text,
+        "tokens": list(segment.tokens),
+        "temperature": segment.temperature,
+        "avg_logprob": segment.avg_logprob,
+        "compression_ratio": segment.compression_ratio,
+        "no_speech_prob": segment.no_speech_prob,
+    }
+    if segment.words is not None:
+        seg["words"] = [
+            {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability}
+            for w in segment.words
+        ]
+    return seg
+
+
+class FasterWhisperModel:
+    """A CTranslate2 model (faster-whisper) behind openai-whisper's ``transcribe``.
+
+    Weights are int8 on CPU (``int8_float16`` on CUDA). Options are mapped to
+    faster-whisper's names; decoding is greedy unless ``beam_size`` is given,
+    like openai-whisper's ``transcribe``. Segments have the same keys as
+    openai-whisper's, words included.
+    """
+
+    def __init__(
+        self, model: str, *, device: str = "cpu", compute_type: str = "", threads: int = 0
+    ) -> None:
+        try:
+            from faster_whisper import WhisperModel  # type: ignore
+        except ImportError as e:
+            raise RuntimeError(
+                "Le backend faster-whisper nécessite le paquet faster-whisper "
+                "(pip install faster-whisper)."
+            ) from e
+        self.compute_type = compute_type or ("int8_float16" if device == "cuda" else "int8")
+        self._model = WhisperModel(
+            model, device=device, compute_type=self.compute_type, cpu_threads=threads
+        )
+
+    def segments(
+        self, audio: Any, **kwargs: Any
+    ) -> Tuple[Iterator[Dict[str, Any]], Dict[str, Any]]:
+        """Lazy segments and ``{"language", "duration"}``, known before the first segment."""
+        options = {
+            _FASTER_OPTION_NAMES.get(k, k): v
+            for k, v in kwargs.items()
+            if k not in _FASTER_IGNORED_OPTIONS
+        }
+        options.setdefault("beam_size", 1)
+        segments, info = self._model.transcribe(audio, **options)
+        iterator = (_segment_dict(i, seg) for i, seg in enumerate(segments))
+        return iterator, {"language": info.language, "duration": info.duration}
+
+    def transcribe(self, audio: Any, **kwargs: Any) -> Dict[str, Any]:
+        iterator, info = self.segments(audio, **kwargs)
+        segments = list(iterator)
+        return {
+            "text": "".join(seg["text"] for seg in segments),
+            "segments": segments,
+            "language": info["language"],
+        }
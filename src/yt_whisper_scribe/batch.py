@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import logging
+import os
+import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, List, Optional, TextIO, Tuple
+
+from .audio_cache import get_audio_cache
+from .backends import DEFAULT_BACKEND, backend_device
+from .download import download_audio, expand_playlist
+from .fingerprint import fingerprint_index_for
+from .metrics import JobMetrics, MetricsSink
+from .output_index import video_id_from_url
+from .pipeline import (
+    CACHED_RESULT_OPTIONS,
+    check_ffmpeg,
+    close_transcriber,
+    discard_model_load,
+    find_existing_output,
+    remove_temp_audio,
+    render_cached_result,
+    resolve_device,
+    selected_model_name,
+    start_model_load,
+    transcribe_downloaded,
+)
+from .result_cache import ResultCache
+from .session import DownloadSession
+from .workspace import JobWorkspace
+
+
+@dataclass
+class BatchItem:
+    url: str
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+
+
+def read_urls(source: str | TextIO) -> List[str]:
+    """Read one URL per line from a file path, ``-`` (stdin) or an open stream.
+
+    Blank lines and ``#`` comments are ignored.
+    """
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    elif isinstance(source, str):
+        with open(source, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    else:
+        lines = source.read().splitlines()
+    return [s.strip() for s in lines if s.strip() and not s.strip().startswith("#")]
+
+
+def transcribe_batch(
+    urls: Iterable[str],
+    *,
+    model: str = "small",
+    device: str = "cuda",
+    output_dir: str = "data",
+    audio_format: str = "native",
+    verbose: bool = False,
+    cookies_file: Optional[str] = None,
+    expand_playlists: bool = False,
+    prefetch: int = 2,
+    download_workers: int = 2,
+    audio_cache_dir: Optional[str] = None,
+    audio_cache_max_gb: float = 10.0,
+    result_cache_dir: Optional[str] = None,
+    cpu_workers: int = 0,
+    chunk_seconds: float = 120.0,
+    metrics_jsonl: Optional[str] = None,
+    metrics_prom: Optional[str] = None,
+    session: Optional[DownloadSession] = None,
+    dedupe_audio: bool = False,
+    cascade_model: Optional[str] = None,
+    backend: str = DEFAULT_BACKEND,
+    **options: Any,
+) -> List[BatchItem]:
+    """Transcribe many URLs with a single loaded Whisper model.
+
+    Downloads run in ``download_workers`` background threads while the current
+    item is transcribed; at most ``prefetch`` downloaded-or-downloading items wait
+    ahead of it, which bounds the temporary audio kept on disk. With
+    ``expand_playlists``, playlist and channel URLs are expanded to their videos.
+    ``cpu_workers``/``chunk_seconds`` select chunked parallel CPU transcription
+    (see ``load_transcriber``). ``metrics_jsonl``/``metrics_prom`` export one
+    metrics record per item (see MetricsSink). All downloads and metadata probes
+    go through one DownloadSession (``session``, or one opened for the batch
+    with ``download_workers`` concurrent instances). ``dedupe_audio`` reuses
+    the cached result of audio already transcribed under another video id
+    (requires ``result_cache_dir``). ``cascade_model`` re-transcribes the
+    uncertain regions of ``model`` with a stronger model (see
+    CascadeTranscriber). ``backend`` selects the inference engine (see
+    ``backends.BACKENDS``). Remaining keyword ``options`` are passed to
+    ``transcribe_downloaded``.
+
+    A failing item is recorded in its BatchItem and does not stop the batch.
+    """
+    logging.basicConfig(
+        level=logging.INFO if verbose else logging.WARNING,
+        format="[%(levelname)s] %(message)s",
+    )
+    run_device = backend_device(backend, resolve_device(device))
+    check_ffmpeg()
+    os.makedirs(output_dir, exist_ok=True)
+
+    video_urls: List[str] = []
+    for url in urls:
+        if not expand_playlists:
+            video_urls.append(url)
+            continue
+        try:
+            video_urls.extend(
+                expand_playlist(
+                    url, verbose=verbose, cookies_file=cookies_file, output_dir=output_dir
+                )
+            )
+        except Exception as e:  # noqa: BLE001
+            logging.warning("[batch] Impossible de lister %s (%s), traitée comme vidéo", url, e)
+            video_urls.append(url)
+    print(f"[batch] {len(video_urls)} vidéo(s) à traiter")
+    if not video_urls:
+        return []
+
+    audio_cache = get_audio_cache(audio_cache_dir, audio_cache_max_gb) if audio_cache_dir else None
+    result_cache = ResultCache(result_cache_dir) if result_cache_dir else None
+    fingerprints = (
+        fingerprint_index_for(result_cache_dir) if dedupe_audio and result_cache_dir else None
+    )
+    own_session = session is None
+    if session is None:
+        session = DownloadSession(
+            cookies_file=cookies_file,
+            output_dir=output_dir,
+            verbose=verbose,
+            max_concurrent=download_workers,
+        )
+    if cascade_model and options.get("stream"):
+        logging.warning("--stream ignoré avec --cascade-model")
+        options["stream"] = False
+
+    def _start_load() -> Future:
+        return start_model_load(
+            model,
+            run_device,
+            cpu_workers=cpu_workers,
+            chunk_seconds=chunk_seconds,
+            cascade_model=cascade_model,
+            cascade_glossary=options.get("replace_map", "SWOOD_Glossary.json"),
+            backend=backend,
+        )
+
+    # Loaded in the background while the first downloads run. With
+    # skip_existing, deferred to the first item to transcribe: a rerun where
+    # every output exists never loads it
+    whisper_model = None
+    model_future: Optional[Future] = None
+    if not options.get("skip_existing"):
+        model_future = _start_load()
+
+    sink = MetricsSink(metrics_jsonl, metrics_prom)
+    item_metrics = [
+        JobMetrics(
+            model=selected_model_name(model), backend=backend, video_id=video_id_from_url(url)
+        )
+        for url in video_urls
+    ]
+
+    def _fetch(
+        index: int, url: str
+    ) -> Tuple[Optional[str], str, Dict[str, Any], str, Optional[JobWorkspace]]:
+        # Returns (output_path, status, info_dict, audio_path, workspace). Items
+        # skipped or rendered from the result cache download nothing
+        metrics = item_metrics[index]
+        if options.get("skip_existing"):
+            with metrics.stage("skip_check"):
+                existing = find_existing_output(
+                    url,
+                    output_dir=output_dir,
+                    output_format=options.get("output_format", "srt"),
+                    language=options.get("language", "en"),
+                    task=options.get("task", "transcribe"),
+                    verbose=verbose,
+                    cookies_file=cookies_file,
+                    session=session,
+                )
+            if existing:
+                return existing, "skipped", {}, "", None
+        if result_cache is not None:
+            cached = render_cached_result(
+                url,
+                result_cache,
+                model=model,
+                output_dir=output_dir,
+                cascade_model=cascade_model,
+                backend=backend,
+                metrics=metrics,
+                **{k: options[k] for k in CACHED_RESULT_OPTIONS if k in options},
+            )
+            if cached is not None:
+                return cached, "ok", {}, "", None
+        # One workspace per item: prefetched downloads must not overwrite each other.
+        # Keyed by video id, a failed download is resumed by a later run
+        workspace = JobWorkspace(output_dir, key=video_id_from_url(url))
+        try:
+            with metrics.stage("download"):
+                info_dict, audio_path = download_audio(
+                    url,
+                    workspace.path("audio"),
+                    audio_format=audio_format,
+                    verbose=verbose,
+                    cookies_file=cookies_file,
+                    output_dir=output_dir,
+                    audio_cache=audio_cache,
+                    metrics=metrics,
+                    session=session,
+                )
+        except BaseException:
+            workspace.release()
+            raise
+        return None, "", info_dict, audio_path, workspace
+
+    items: List[BatchItem] = []
+    queue = iter(enumerate(video_urls))
+    pending: Deque[Tuple[int, str, Future]] = deque()
+    pool = ThreadPoolExecutor(
+        max_workers=max(1, download_workers), thread_name_prefix="yt-download"
+    )
+    # The pool shuts down (pending downloads done) before the session closes
+    with session if own_session else nullcontext(), pool:
+
+        def _refill() -> None:
+            while len(pending) < max(1, prefetch):
+                nxt = next(queue, None)
+                if nxt is None:
+                    return
+                pending.append((nxt[0], nxt[1], pool.submit(_fetch, *nxt)))
+
+        _refill()
+        while pending:
+            index, url, future = pending.popleft()
+            metrics = item_metrics[index]
+            # Top up only once this item's download is over, so at most
+            # ``prefetch`` downloads run at once; the next ones then download
+            # while it is transcribed
+            wait([future])
+            _refill()
+            item = BatchItem(url)
+            items.append(item)
+            print(f"[batch] {len(items)}/{len(video_urls)} {url}")
+            try:
+                done, status, info_dict, audio_path, workspace = future.result()
+            except Exception as e:  # noqa: BLE001
+                item.error = str(e)
+                logging.warning("[batch] Téléchargement échoué pour %s: %s", url, e)
+                if sink:
+                    sink.emit(metrics.record("error"))
+                continue
+            if done:
+                item.output_path = done
+                if status == "skipped":
+                    print(f"Fichier existant détecté, opération ignorée: {done}")
+                if sink:
+                    sink.emit(metrics.record(status))
+                continue
+            try:
+                if whisper_model is None:
+                    if model_future is None:
+                        model_future = _start_load()
+                    with metrics.stage("model_wait"):
+                        whisper_model = model_future.result()
+                item.output_path = transcribe_downloaded(
+                    info_dict,
+                    audio_path,
+                    whisper_model=whisper_model,
+                    model=model,
+                    device=run_device,
+                    output_dir=output_dir,
+                    result_cache=result_cache,
+                    metrics=metrics,
+                    fingerprints=fingerprints,
+                    cascade_model=cascade_model,
+                    backend=backend,
+                    **options,
+                )
+            except Exception as e:  # noqa: BLE001
+                item.error = str(e)
+                print(f"Une erreur est survenue pendant la transcription : {e}")
+            finally:
+                remove_temp_audio(audio_path)
+                if workspace is not None:
+                    workspace.cleanup()
+                if sink:
+                    sink.emit(metrics.record("error" if item.error else "ok"))
+
+    if whisper_model is not None:
+        close_transcriber(whisper_model)
+    elif model_future is not None:
+        # Every item was skipped, cached or failed to download: the eager load
+        # was never used
+        discard_model_load(model_future)
+    failed = sum(1 for it in items if it.error)
+    print(f"[batch] Terminé: {len(items) - failed} réussie(s), {failed} échec(s)")
+    return items
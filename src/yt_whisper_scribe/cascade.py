@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .audio import SAMPLE_RATE, decode_pcm
+from .chunked import stitch_segments
+from .replace import CompiledGlossary, load_compiled_glossary
+
+
+@dataclass
+class CascadeThresholds:
+    """When a fast-model segment is re-transcribed by the strong model.
+
+    The defaults are Whisper's own fallback thresholds.
+    """
+
+    min_avg_logprob: float = -1.0
+    max_compression_ratio: float = 2.4
+    max_no_speech_prob: float = 0.6
+
+
+def _term_in_doubt(text: str, glossary: CompiledGlossary) -> bool:
+    """True when a variant of some entry and one of that entry's anti keywords both occur.
+
+    As in the replacement gate, an anti keyword that is a word of the entry's
+    own variants ("this") only counts inside the matched variant.
+    """
+    matches = glossary.matcher.scan(text)
+    if not matches:
+        return False
+    keywords = {p for _, _, p in glossary.keyword_matcher.scan(text)}
+    for start, end, p in matches:
+        entry = glossary.variants[p].entry_index
+        anti = glossary.anti_ids[entry]
+        if (keywords - glossary.variant_anti_ids[entry]) & anti:
+            return True
+        if any(k in anti for _, _, k in glossary.keyword_matcher.scan(text[start:end])):
+            return True
+    return False
+
+
+def flag_segments(
+    segments: List[Dict[str, Any]],
+    thresholds: CascadeThresholds,
+    glossary: Optional[CompiledGlossary] = None,
+) -> List[int]:
+    """Indexes of the segments the fast model is unsure about.
+
+    A segment is flagged for a low ``avg_logprob``, a high ``compression_ratio``
+    (repetition loop) or a high ``no_speech_prob``, or when it contains a
+    variant of a glossary entry together with one of that entry's
+    ``anti_keywords``: a term decision hinges on what exactly was said.
+    """
+    flagged = []
+    for i, seg in enumerate(segments):
+        if (
+            seg.get("avg_logprob", 0.0) < thresholds.min_avg_logprob
+            or seg.get("compression_ratio", 0.0) > thresholds.max_compression_ratio
+            or seg.get("no_speech_prob", 0.0) > thresholds.max_no_speech_prob
+        ):
+            flagged.append(i)
+        elif glossary is not None and _term_in_doubt(seg.get("text", ""), glossary):
+            flagged.append(i)
+    return flagged
+
+
+def plan_regions(
+    segments: List[Dict[str, Any]], flagged: List[int], merge_gap: float = 2.0
+) -> List[Tuple[float, float]]:
+    """Time ranges covering the flagged segments, merged when less than ``merge_gap`` apart.
+
+    A merged range also covers the segments between its flagged ones: every
+    decoded window costs a full 30 s pass, so a few confident seconds are
+    cheaper to redo than to splice around.
+    """
+    regions: List[Tuple[float, float]] = []
+    for i in flagged:
+        start, end = float(segments[i]["start"]), float(segments[i]["end"])
+        if regions and start - regions[-1][1] < merge_gap:
+            regions[-1] = (regions[-1][0], max(regions[-1][1], end))
+        else:
+            regions.append((start, end))
+    return regions
+
+
+class CascadeTranscriber:
+    """Fast model everywhere, strong model only where the fast one is unsure.
+
+    Exposes ``transcribe(audio, **kwargs)`` like a Whisper model. The audio is
+    transcribed by ``fast_model``; the segments flagged by ``flag_segments``
+    are grouped into regions (``plan_regions``), each region is transcribed
+    again by the strong model (loaded on first need by ``strong_loader``) and
+    its segments replace the fast ones. A region is decoded with ``pad_seconds``
+    of audio on each side, the detected language forced and the preceding
+    fast text as prompt. The result carries a ``cascade`` summary (regions,
+    escalated seconds and share).
+    """
+
+    def __init__(
+        self,
+        fast_model: Any,
+        strong_loader: Callable[[], Any],
+        *,
+        thresholds: Optional[CascadeThresholds] = None,
+        glossary_path: Optional[str] = None,
+        pad_seconds: float = 0.5,
+        merge_gap: float = 2.0,
+    ) -> None:
+        self.fast_model = fast_model
+        self._strong_loader = strong_loader
+        self._strong: Any = None
+        self.thresholds = thresholds or CascadeThresholds()
+        self.glossary_path = glossary_path
+        self.pad_seconds = pad_seconds
+        self.merge_gap = merge_gap
+
+    def _glossary(self) -> Optional[CompiledGlossary]:
+        if not self.glossary_path:
+            return None
+        try:
+            return load_compiled_glossary(self.glossary_path)
+        except Exception as e:  # noqa: BLE001
+            logging.warning("[cascade] Glossaire ignoré: %s", e)
+            return None
+
+    @property
+    def strong_model(self) -> Any:
+        if self._strong is None:
+            self._strong = self._strong_loader()
+        return self._strong
+
+    def transcribe(self, audio: Any, **kwargs: Any) -> Dict[str, Any]:
+        if isinstance(audio, str):
+            audio = decode_pcm(audio)
+        duration = len(audio) / SAMPLE_RATE
+        result = self.fast_model.transcribe(audio, **kwargs)
+        segments = result.get("segments", [])
+        regions = plan_regions(
+            segments, flag_segments(segments, self.thresholds, self._glossary()), self.merge_gap
+        )
+        escalated = sum(b - a for a, b in regions)
+        result["cascade"] = {
+            "regions": len(regions),
+            "escalated_seconds": round(escalated, 3),
+            "escalated_share": round(escalated / duration, 4) if duration else 0.0,
+        }
+        if not regions:
+            return result
+
+        t0 = time.monotonic()
+        strong_kwargs = dict(kwargs, language=kwargs.get("language") or result.get("language"))
+        strong_kwargs.pop("verbose", None)
+        prompt = kwargs.get("initial_prompt") or ""
+        parts: List[Tuple[float, float, float, List[Dict[str, Any]]]] = []
+        previous_end = 0.0
+        for a, b in regions:
+            parts.append((0.0, previous_end, a, segments))
+            context = "".join(s.get("text", "") for s in segments if previous_end <= s["end"] <= a)[
+                -200:
+            ]
+            lo = max(0.0, a - self.pad_seconds)
+            hi = min(duration, b + self.pad_seconds)
+            clip = np.ascontiguousarray(audio[int(lo * SAMPLE_RATE) : int(hi * SAMPLE_RATE)])
+            strong_kwargs["initial_prompt"] = (prompt + " " + context).strip() or None
+            strong = self.strong_model.transcribe(clip, **strong_kwargs)
+            parts.append((lo, a, b, strong.get("segments", [])))
+            previous_end = b
+        parts.append((0.0, previous_end, float("inf"), segments))
+
+        merged = stitch_segments(parts)
+        logging.info(
+            "[cascade] %d région(s), %.1fs/%.1fs audio retranscrits en %.1fs",
+            len(regions),
+            escalated,
+            duration,
+            time.monotonic() - t0,
+        )
+        result["segments"] = merged
+        result["text"] = "".join(seg.get("text", "") for seg in merged)
+        return result
+
+    def close(self) -> None:
+        for model in (self.fast_model, self._strong):
+            close = getattr(model, "close", None)
+            if callable(close):
+                close()
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .audio import SAMPLE_RATE, decode_pcm
+
+# Energy is measured on 20 ms frames when looking for a quiet cut point
+_FRAME = SAMPLE_RATE // 50
+
+# Per-worker model, loaded once by the pool initializer
+_worker_model: Any = None
+
+
+def find_quiet_point(audio: np.ndarray, center: int, search: int) -> int:
+    """Sample index of the lowest-energy 20 ms frame within ``center ± search``."""
+    lo = max(0, center - search)
+    hi = min(len(audio), center + search)
+    n_frames = (hi - lo) // _FRAME
+    if n_frames < 2:
+        return center
+    frames = audio[lo : lo + n_frames * _FRAME].reshape(n_frames, _FRAME)
+    energy = np.einsum("ij,ij->i", frames, frames)
+    return lo + int(np.argmin(energy)) * _FRAME + _FRAME // 2
+
+
+def plan_chunks(
+    audio: np.ndarray,
+    chunk_seconds: float = 120.0,
+    overlap_seconds: float = 5.0,
+    search_seconds: float = 5.0,
+) -> List[Tuple[int, int, int, int]]:
+    """Split ``audio`` into windows cut at low-energy points.
+
+    Returns ``(lo, hi, own_start, own_end)`` sample ranges: the window
+    ``[lo, hi)`` is transcribed, and only segments overlapping
+    ``[own_start, own_end)`` are kept (see ``stitch_segments``). Windows overlap
+    by ``overlap_seconds`` on each side of a cut so words near it are decoded
+    with context.
+    """
+    total = len(audio)
+    step = int(chunk_seconds * SAMPLE_RATE)
+    overlap = int(overlap_seconds * SAMPLE_RATE)
+    search = int(search_seconds * SAMPLE_RATE)
+    cuts = [0]
+    while total - cuts[-1] > step + search:
+        cuts.append(find_quiet_point(audio, cuts[-1] + step, search))
+    cuts.append(total)
+    return [(max(0, a - overlap), min(total, b + overlap), a, b) for a, b in zip(cuts, cuts[1:])]
+
+
+def _words(text: str) -> List[str]:
+    return [re.sub(r"[^\w']", "", token.lower()) for token in text.split()]
+
+
+def _text_overlap(tail: List[str], head: List[str]) -> int:
+    """Length of the longest suffix of ``tail`` that is also a prefix of ``head``."""
+    for k in range(min(len(tail), len(head)), 0, -1):
+        if tail[-k:] == head[:k]:
+            return k
+    return 0
+
+
+def _trim_seam(seg: Dict[str, Any], tail: List[str], seam: float) -> Optional[Dict[str, Any]]:
+    """Part of ``seg`` not already transcribed before ``seam`` by the previous window.
+
+    The words ``seg`` repeats from the end of ``tail`` are removed; failing a
+    text match, the words centered before ``seam`` (with word timings) or the
+    whole segment if centered before it. None when nothing is left.
+    """
+    tokens = seg.get("text", "").split()
+    words = seg.get("words")
+    k = _text_overlap(tail, _words(seg.get("text", "")))
+    if k:
+        if k == len(tokens):
+            return None
+        seg["text"] = " " + " ".join(tokens[k:])
+        if words is not None and len(words) == len(tokens):
+            seg["words"] = words[k:]
+            seg["start"] = seg["words"][0]["start"]
+        else:
+            seg["start"] = max(seg["start"], seam)
+        return seg
+    if words:
+        kept = [w for w in words if (w["start"] + w["end"]) / 2 >= seam]
+        if not kept:
+            return None
+        if len(kept) < len(words):
+            seg["words"] = kept
+            seg["text"] = "".join(w["word"] for w in kept)
+            seg["start"] = kept[0]["start"]
+        return seg
+    return seg if (seg["start"] + seg["end"]) / 2 >= seam else None
+
+
+def stitch_segments(
+    parts: List[Tuple[float, float, float, List[Dict[str, Any]]]],
+) -> List[Dict[str, Any]]:
+    """Merge per-window segments into one timeline.
+
+    ``parts`` holds ``(offset, own_start, own_end, segments)`` in seconds, with
+    segment times relative to ``offset``. A window contributes the segments
+    overlapping ``[own_start, own_end)``. At each seam the two windows rarely
+    split the speech the same way, so a segment is checked against the end of
+    the timeline built so far: dropped if it ends before it, and when it
+    straddles it, stripped of the words that repeat the previous window's
+    tail (see ``_trim_seam``).
+    """
+    merged: List[Dict[str, Any]] = []
+    for offset, own_start, own_end, segments in parts:
+        for seg in segments:
+            start = seg["start"] + offset
+            end = seg["end"] + offset
+            if end <= own_start or start >= own_end:
+                continue
+            seg = dict(seg, start=start, end=end)
+            if "words" in seg:
+                seg["words"] = [
+                    dict(w, start=w["start"] + offset, end=w["end"] + offset) for w in seg["words"]
+                ]
+            seam = merged[-1]["end"] if merged else float("-inf")
+            if end <= seam + 1e-3:
+                continue
+            if start < seam:
+                tail = [w for m in merged if m["end"] > start for w in _words(m.get("text", ""))]
+                seg = _trim_seam(seg, tail, seam)
+                if seg is None:
+                    continue
+            seg["id"] = len(merged)
+            seg["start"] = round(seg["start"], 3)
+            seg["end"] = round(seg["end"], 3)
+            if "words" in seg:
+                seg["words"] = [
+                    dict(w, start=round(w["start"], 3), end=round(w["end"], 3))
+                    for w in seg["words"]
+                ]
+            seg.pop("seek", None)
+            merged.append(seg)
+    return merged
+
+
+def _init_worker(model_name: str, threads: int, backend: str = "whisper") -> None:
+    global _worker_model
+    import torch  # type: ignore
+
+    from .backends import load_model
+
+    torch.set_num_threads(threads)
+    _worker_model = load_model(backend, model_name, "cpu", threads=threads)
+
+
+def _worker_ready() -> None:
+    return None
+
+
+def _transcribe_window(audio: np.ndarray, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    result = _worker_model.transcribe(audio, **kwargs)
+    return {"language": result.get("language"), "segments": result.get("segments", [])}
+
+
+class ChunkedTranscriber:
+    """CPU transcription of one file split across a pool of Whisper processes.
+
+    Exposes ``transcribe(audio, **kwargs)`` like a Whisper model, so it can be
+    passed wherever a loaded model is expected. Each worker loads the model once
+    and gets ``threads_per_worker`` torch threads (default: cores / workers).
+    With automatic language detection, the first window is decoded alone and its
+    language is forced on the others so every window agrees. Context
+    (``condition_on_previous_text``) does not cross window boundaries; the
+    ``initial_prompt`` is given to every window. ``backend`` is the inference
+    engine of the workers (see ``backends.BACKENDS``).
+    """
+
+    def __init__(
+        self,
+        model: str,
+        *,
+        workers: int,
+        threads_per_worker: Optional[int] = None,
+        chunk_seconds: float = 120.0,
+        overlap_seconds: float = 5.0,
+        backend: str = "whisper",
+    ) -> None:
+        self.model = model
+        self.workers = max(1, workers)
+        self.threads = threads_per_worker or max(1, (os.cpu_count() or 1) // self.workers)
+        self.chunk_seconds = chunk_seconds
+        self.overlap_seconds = overlap_seconds
+        print(
+            f"Chargement du modèle Whisper '{model}' dans {self.workers} processus "
+            f"({self.threads} thread(s) chacun)..."
+        )
+        # spawn: torch state must not be inherited through fork
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model, self.threads, backend),
+        )
+
+    def warm_up(self) -> None:
+        """Start every worker now and wait until they are ready.
+
+        The pool otherwise spawns its processes (and loads the model in each)
+        on the first ``transcribe``, after the download. A worker that fails to
+        load breaks the pool and raises here.
+        """
+        for future in [self._pool.submit(_worker_ready) for _ in range(self.workers)]:
+            future.result()
+
+    def transcribe(self, audio: Any, **kwargs: Any) -> Dict[str, Any]:
+        if isinstance(audio, str):
+            audio = decode_pcm(audio)
+        kwargs["fp16"] = False
+        kwargs["verbose"] = None
+        windows = plan_chunks(audio, self.chunk_seconds, self.overlap_seconds)
+        logging.info(
+            "[chunked] %d fenêtre(s) sur %d processus (%.0fs audio)",
+            len(windows),
+            self.workers,
+            len(audio) / SAMPLE_RATE,
+        )
+        t0 = time.monotonic()
+
+        def _submit(window: Tuple[int, int, int, int]) -> Future:
+            lo, hi = window[0], window[1]
+            return self._pool.submit(_transcribe_window, audio[lo:hi], kwargs)
+
+        futures: List[Future] = []
+        if not kwargs.get("language"):
+            first = _submit(windows[0])
+            kwargs["language"] = first.result()["language"]
+            futures.append(first)
+            futures.extend(_submit(w) for w in windows[1:])
+        else:
+            futures = [_submit(w) for w in windows]
+        outputs = [f.result() for f in futures]
+
+        segments = stitch_segments(
+            [
+                (lo / SAMPLE_RATE, a / SAMPLE_RATE, b / SAMPLE_RATE, out["segments"])
+                for (lo, _hi, a, b), out in zip(windows, outputs)
+            ]
+        )
+        logging.info("[chunked] Assemblage terminé en %.1fs", time.monotonic() - t0)
+        return {
+            "text": "".join(seg.get("text", "") for seg in segments),
+            "segments": segments,
+            "language": kwargs["language"],
+        }
+
+    def close(self) -> None:
+        self._pool.shutdown()
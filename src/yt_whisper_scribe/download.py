@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .audio_cache import AudioCache
+from .metrics import JobMetrics
+from .output_index import video_id_from_url
+from .retry import CircuitBreaker, backoff_delay, host_key, is_permanent_error
+
+if TYPE_CHECKING:
+    from .session import DownloadSession
+
+
+class DownloadError(RuntimeError):
+    """Raised when the audio of a URL cannot be downloaded after all retries."""
+
+
+def autodetect_cookies(cookies_file: Optional[str], output_dir: str) -> Optional[str]:
+    """Return the first existing cookies.txt among the known candidates.
+
+    Order: explicit ``cookies_file``, ``$YT_COOKIES_FILE``, ``./data/cookies.txt``,
+    then ``data/cookies.txt`` next to ``output_dir``.
+    """
+    candidates = []
+    if cookies_file:
+        candidates.append(cookies_file)
+    # Check environment variable first (secure option)
+    env_cookies = os.getenv("YT_COOKIES_FILE")
+    if env_cookies:
+        candidates.append(env_cookies)
+    # Default candidate in CWD
+    candidates.append(os.path.join(os.getcwd(), "data", "cookies.txt"))
+    # Candidate relative to output_dir
+    candidates.append(os.path.join(os.path.abspath(output_dir), "..", "data", "cookies.txt"))
+    for c in candidates:
+        try:
+            if c and os.path.isfile(c):
+                return os.path.abspath(c)
+        except Exception:
+            pass
+    return None
+
+
+# Audio format meaning "no re-encoding": the stream is stored in its own container
+NATIVE_FORMAT = "native"
+
+# Breaker of the downloads made without a DownloadSession (single URL, jobs
+# worker): the process still backs off a host that keeps failing
+_default_breaker = CircuitBreaker()
+
+
+def _downloaded_path(ydl: Any, info_dict: Dict[str, Any]) -> str:
+    for download in info_dict.get("requested_downloads") or []:
+        if download.get("filepath"):
+            return download["filepath"]
+    return ydl.prepare_filename(info_dict)
+
+
+def build_ydl_opts(
+    temp_stem: str,
+    *,
+    audio_format: str = "m4a",
+    verbose: bool = False,
+    cookiefile_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    ydl_opts: Dict[str, Any] = {
+        "format": "bestaudio[ext=m4a]/bestaudio/best",
+        "postprocessors": [
+            {
+                "key": "FFmpegExtractAudio",
+                "preferredcodec": audio_format,
+                "preferredquality": "192",
+            }
+        ],
+        "outtmpl": temp_stem,
+        "quiet": not verbose,
+        "noplaylist": True,
+        # Resume a ``.part`` file left by an earlier attempt (HTTP Range request)
+        "continuedl": True,
+    }
+    if audio_format == NATIVE_FORMAT:
+        # Keep the downloaded stream as is: it is decoded once, straight to PCM
+        ydl_opts["format"] = "bestaudio/best"
+        ydl_opts["postprocessors"] = []
+        ydl_opts["outtmpl"] = f"{temp_stem}.%(ext)s"
+    if cookiefile_path:
+        ydl_opts["cookiefile"] = cookiefile_path
+    return ydl_opts
+
+
+def download_audio(
+    url: str,
+    temp_stem: str,
+    *,
+    audio_format: str = "m4a",
+    verbose: bool = False,
+    cookies_file: Optional[str] = None,
+    output_dir: str = "data",
+    attempts: int = 3,
+    audio_cache: Optional[AudioCache] = None,
+    metrics: Optional[JobMetrics] = None,
+    session: Optional[DownloadSession] = None,
+    breaker: Optional[CircuitBreaker] = None,
+) -> Tuple[Dict[str, Any], str]:
+    """Download and extract the audio of ``url`` to ``<temp_stem>.<audio_format>``.
+
+    With ``audio_format="native"``, the audio stream is kept in its original
+    container (``<temp_stem>.<ext>``, no transcoding).
+
+    Returns ``(info_dict, audio_path)``. Raises DownloadError once all attempts
+    have failed. With ``audio_cache``, a cached entry for the video id parsed
+    from the URL is used without any network call, and fresh downloads are
+    added to the cache; ``audio_path`` is always the caller's own file.
+    ``metrics`` receives ``download_bytes``, ``download_retries`` and
+    ``audio_cache_hit``. With ``session``, its shared YoutubeDL instances and
+    cookie jar are used (``cookies_file``/``verbose`` are then the session's).
+
+    Retries wait with jittered exponential backoff and resume the partial
+    download left next to ``temp_stem``; errors naming an unavailable video are
+    not retried. ``breaker`` (default: the session's, else one shared by the
+    process) pauses jobs while their host keeps failing.
+    """
+    audio_path = f"{temp_stem}.{audio_format}"
+    if audio_cache is not None:
+        video_id = video_id_from_url(url)
+        if video_id:
+            cached = audio_cache.fetch(video_id, audio_format, audio_path)
+            if cached is not None:
+                if metrics is not None:
+                    metrics.set("audio_cache_hit", True)
+                    metrics.set("download_bytes", 0)
+                return cached
+
+    if session is not None:
+
+        def _open() -> Any:
+            return session.downloader(temp_stem, audio_format=audio_format)
+
+    else:
+        import yt_dlp  # type: ignore
+
+        cookiefile_path = autodetect_cookies(cookies_file, output_dir)
+        if cookiefile_path:
+            logging.info("[cookies] Utilisation du cookies.txt: %s", cookiefile_path)
+        ydl_opts = build_ydl_opts(
+            temp_stem, audio_format=audio_format, verbose=verbose, cookiefile_path=cookiefile_path
+        )
+
+        def _open() -> Any:
+            return yt_dlp.YoutubeDL(ydl_opts)
+
+    if breaker is None:
+        breaker = session.breaker if session is not None else _default_breaker
+    host = host_key(url)
+    for attempt in range(attempts):
+        wait = breaker.wait_time(host)
+        while wait > 0:
+            logging.info("[circuit] %s en pause, attente de %.0fs", host, wait)
+            time.sleep(wait)
+            wait = breaker.wait_time(host)
+        try:
+            with _open() as ydl:
+                info_dict = ydl.extract_info(url, download=True)
+                if info_dict is not None and audio_format == NATIVE_FORMAT:
+                    audio_path = _downloaded_path(ydl, info_dict)
+            breaker.record_success(host)
+            if info_dict is not None:
+                if metrics is not None:
+                    metrics.set("download_retries", attempt)
+                    metrics.set("download_bytes", os.path.getsize(audio_path))
+                if audio_cache is not None:
+                    audio_cache.store(info_dict, audio_format, audio_path)
+                return info_dict, audio_path
+        except Exception as e:  # noqa: BLE001
+            logging.warning(f"Tentative {attempt+1}/{attempts} échouée pour le téléchargement: {e}")
+            if is_permanent_error(e):
+                # The host answered: the video itself is the problem
+                breaker.record_success(host)
+                raise DownloadError(f"Vidéo indisponible: {url} ({e})") from e
+            breaker.record_failure(host)
+            if metrics is not None:
+                metrics.set("download_retries", attempt + 1)
+            if attempt + 1 < attempts:
+                time.sleep(backoff_delay(attempt))
+        finally:
+            # No-op once an outcome is recorded; frees a trial interrupted by
+            # a BaseException (KeyboardInterrupt, SystemExit...)
+            breaker.release_trial(host)
+    raise DownloadError(f"Échec du téléchargement après {attempts} tentatives: {url}")
+
+
+def probe_info(
+    url: str,
+    *,
+    verbose: bool = False,
+    cookies_file: Optional[str] = None,
+    output_dir: str = "data",
+    session: Optional[DownloadSession] = None,
+) -> Dict[str, Any]:
+    """Fetch the video metadata only (``extract_info(download=False)``)."""
+    if session is not None:
+        return session.extract_info(url)
+    import yt_dlp  # type: ignore
+
+    opts: Dict[str, Any] = {"quiet": not verbose, "noplaylist": True, "skip_download": True}
+    cookiefile_path = autodetect_cookies(cookies_file, output_dir)
+    if cookiefile_path:
+        opts["cookiefile"] = cookiefile_path
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        return ydl.extract_info(url, download=False)
+
+
+def expand_playlist(
+    url: str,
+    *,
+    verbose: bool = False,
+    cookies_file: Optional[str] = None,
+    output_dir: str = "data",
+) -> List[str]:
+    """Return the video URLs of a playlist/channel URL, or ``[url]`` for a single video.
+
+    Uses flat extraction: only the listing is fetched, not the videos' metadata.
+    """
+    import yt_dlp  # type: ignore
+
+    opts: Dict[str, Any] = {
+        "quiet": not verbose,
+        "extract_flat": "in_playlist",
+        "skip_download": True,
+    }
+    cookiefile_path = autodetect_cookies(cookies_file, output_dir)
+    if cookiefile_path:
+        opts["cookiefile"] = cookiefile_path
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        info = ydl.extract_info(url, download=False)
+    if not info or info.get("_type") not in ("playlist", "multi_video"):
+        return [url]
+    urls: List[str] = []
+    for entry in info.get("entries") or []:
+        if not entry:
+            continue
+        entry_url = entry.get("url") or entry.get("webpage_url")
+        if not entry_url and entry.get("id"):
+            entry_url = f"https://www.youtube.com/watch?v={entry['id']}"
+        if not entry_url:
+            continue
+        # Channel URLs list their tabs (videos, shorts, ...) as nested playlists
+        if entry.get("_type") == "playlist" or entry.get("ie_key") == "YoutubeTab":
+            urls.extend(
+                expand_playlist(
+                    entry_url, verbose=verbose, cookies_file=cookies_file, output_dir=output_dir
+                )
+            )
+        else:
+            urls.append(entry_url)
+    return urls
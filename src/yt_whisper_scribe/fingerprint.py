@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .audio import SAMPLE_RATE
+from .result_cache import ResultCache
+
+FINGERPRINT_DB = "fingerprints.sqlite"
+
+# Fingerprints are computed at 8 kHz: speech and music peaks sit well below 4 kHz
+FP_RATE = 8000
+N_FFT = 1024
+HOP = 512
+FRAME_SECONDS = HOP / FP_RATE
+# Peak bands (FFT bins, ~100 Hz to ~3.5 kHz, log-spaced): one candidate per band and frame
+_BAND_EDGES = np.unique(np.geomspace(13, 448, 13).astype(int))
+# A candidate is a peak if it is the band's maximum within +-_PEAK_RADIUS frames
+_PEAK_RADIUS = 4
+# Each peak is paired with the next _FAN_OUT peaks at most _MAX_DT frames later
+_FAN_OUT = 6
+_MAX_DT = 63
+_BLOCK_FRAMES = 4096
+# Query slices used to check that a match spans the whole query
+_SLICE_SECONDS = 5.0
+# Hashes per SQLite ``IN`` query
+_LOOKUP_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    id INTEGER PRIMARY KEY,
+    video_id TEXT NOT NULL UNIQUE,
+    duration REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS hashes (
+    hash INTEGER NOT NULL,
+    video INTEGER NOT NULL,
+    t INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS hashes_hash ON hashes (hash);
+"""
+
+
+@dataclass
+class Fingerprint:
+    """Landmark hashes of an audio track and their times (frame index)."""
+
+    hashes: np.ndarray  # uint32
+    times: np.ndarray  # int32
+    duration: float
+
+
+@dataclass
+class FingerprintMatch:
+    video_id: str
+    offset: float  # where the query starts in the matched video, seconds
+    votes: int
+    coverage: float  # share of the query's slices that match at this offset
+
+
+def _band_peaks(pcm: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Strongest bin per band and frame: ``(log magnitudes, bins)``, both ``(frames, bands)``."""
+    # 16 kHz -> 8 kHz: averaging sample pairs is a good enough low-pass here
+    x = pcm[: len(pcm) // 2 * 2].reshape(-1, 2).mean(axis=1, dtype=np.float32)
+    if len(x) < N_FFT:
+        empty = np.empty((0, len(_BAND_EDGES) - 1))
+        return empty, empty.astype(np.int32)
+    frames = np.lib.stride_tricks.sliding_window_view(x, N_FFT)[::HOP]
+    window = np.hanning(N_FFT).astype(np.float32)
+    values, bins = [], []
+    for lo in range(0, len(frames), _BLOCK_FRAMES):
+        spec = np.log(np.abs(np.fft.rfft(frames[lo : lo + _BLOCK_FRAMES] * window)) + 1e-6)
+        band_values, band_bins = [], []
+        for b_lo, b_hi in zip(_BAND_EDGES[:-1], _BAND_EDGES[1:]):
+            band = spec[:, b_lo:b_hi]
+            arg = band.argmax(axis=1)
+            band_bins.append(arg + b_lo)
+            band_values.append(band[np.arange(len(band)), arg])
+        values.append(np.stack(band_values, axis=1))
+        bins.append(np.stack(band_bins, axis=1))
+    return np.concatenate(values), np.concatenate(bins).astype(np.int32)
+
+
+def compute_fingerprint(pcm: np.ndarray) -> Fingerprint:
+    """Hash pairs of spectral peaks of 16 kHz mono PCM (``decode_pcm`` output).
+
+    Peaks are the strongest bin of a band that is also a local maximum over
+    time and above the band's median; each peak is paired with the next few
+    peaks, and a pair hashes to ``(bin1, bin2, frame delta)``. The hashes
+    survive re-encoding and do not depend on where the audio starts, so a
+    cut of a longer track matches it at some offset.
+    """
+    duration = len(pcm) / SAMPLE_RATE
+    values, bins = _band_peaks(pcm)
+    if len(values) == 0:
+        empty = np.empty(0, np.uint32)
+        return Fingerprint(empty, empty.astype(np.int32), duration)
+    padded = np.pad(values, ((_PEAK_RADIUS, _PEAK_RADIUS), (0, 0)), constant_values=-np.inf)
+    local_max = np.lib.stride_tricks.sliding_window_view(padded, 2 * _PEAK_RADIUS + 1, axis=0).max(
+        axis=-1
+    )
+    is_peak = (values == local_max) & (values > np.median(values, axis=0))
+    t, band = np.nonzero(is_peak)  # sorted by time, then band
+    f = bins[t, band]
+
+    hashes, times = [], []
+    for k in range(1, _FAN_OUT + 1):
+        dt = t[k:] - t[:-k]
+        ok = (dt > 0) & (dt <= _MAX_DT)
+        hashes.append(
+            (f[:-k][ok].astype(np.uint32) << 15) | (f[k:][ok].astype(np.uint32) << 6) | dt[ok]
+        )
+        times.append(t[:-k][ok])
+    return Fingerprint(
+        np.concatenate(hashes).astype(np.uint32),
+        np.concatenate(times).astype(np.int32),
+        duration,
+    )
+
+
+class FingerprintIndex:
+    """Audio fingerprints of transcribed videos, in a SQLite file.
+
+    ``matches`` finds earlier videos that contain a query track: the same
+    audio re-uploaded, or a cut of it (a short taken from a stream). Hash hits
+    vote for ``(video, time offset)``; a candidate must gather ``min_ratio`` of
+    the query's hashes at one offset, spread over ``min_coverage`` of its
+    5-second slices, and the query must fit in the video at that offset.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def add(self, video_id: str, fingerprint: Fingerprint) -> None:
+        """Index ``fingerprint`` under ``video_id`` (no-op if the video is already indexed)."""
+        with self._connect() as conn, conn:
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO videos (video_id, duration) VALUES (?, ?)",
+                (video_id, fingerprint.duration),
+            )
+            if cur.rowcount != 1:
+                return
+            conn.executemany(
+                "INSERT INTO hashes (hash, video, t) VALUES (?, ?, ?)",
+                zip(
+                    fingerprint.hashes.tolist(),
+                    [cur.lastrowid] * len(fingerprint.hashes),
+                    fingerprint.times.tolist(),
+                ),
+            )
+
+    def _lookup(
+        self, conn: sqlite3.Connection, hashes: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        rows: List[Tuple[int, int, int]] = []
+        unique = np.unique(hashes).tolist()
+        for lo in range(0, len(unique), _LOOKUP_CHUNK):
+            chunk = unique[lo : lo + _LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(
+                conn.execute(
+                    f"SELECT hash, video, t FROM hashes WHERE hash IN ({placeholders})", chunk
+                )
+            )
+        arr = np.array(rows, dtype=np.int64).reshape(-1, 3)
+        return arr[:, 0], arr[:, 1], arr[:, 2]
+
+    def matches(
+        self,
+        fingerprint: Fingerprint,
+        *,
+        exclude: Optional[str] = None,
+        min_ratio: float = 0.05,
+        min_coverage: float = 0.9,
+        limit: int = 3,
+    ) -> List[FingerprintMatch]:
+        """Indexed videos containing the query track, best first."""
+        if len(fingerprint.hashes) == 0:
+            return []
+        order = np.argsort(fingerprint.hashes, kind="stable")
+        q_hash = fingerprint.hashes[order].astype(np.int64)
+        q_time = fingerprint.times[order].astype(np.int64)
+        with self._connect() as conn:
+            row_hash, row_video, row_time = self._lookup(conn, q_hash)
+            videos: Dict[int, Tuple[str, float]] = {
+                vid: (video_id, duration)
+                for vid, video_id, duration in conn.execute(
+                    "SELECT id, video_id, duration FROM videos"
+                )
+            }
+        if len(row_hash) == 0:
+            return []
+        # Every (db row, query occurrence) pair sharing a hash votes for an offset
+        left = np.searchsorted(q_hash, row_hash, "left")
+        counts = np.searchsorted(q_hash, row_hash, "right") - left
+        row_idx = np.repeat(np.arange(len(row_hash)), counts)
+        starts = np.repeat(left - np.cumsum(counts) + counts, counts)
+        q_idx = starts + np.arange(len(row_idx))
+        pair_video = row_video[row_idx]
+        pair_offset = row_time[row_idx] - q_time[q_idx]
+
+        keys, votes = np.unique(
+            np.stack([pair_video, pair_offset], axis=1), axis=0, return_counts=True
+        )
+        slices = np.floor(fingerprint.times * FRAME_SECONDS / _SLICE_SECONDS).astype(np.int64)
+        n_slices = len(np.unique(slices))
+        found: List[FingerprintMatch] = []
+        for i in np.argsort(-votes)[: 20 * limit]:
+            vid, offset = int(keys[i, 0]), int(keys[i, 1])
+            if vid not in videos or videos[vid][0] == exclude:
+                continue
+            if any(m.video_id == videos[vid][0] for m in found):
+                continue
+            # Frame alignment differs between uploads: neighbouring offsets count too
+            aligned = (pair_video == vid) & (np.abs(pair_offset - offset) <= 1)
+            total = int(aligned.sum())
+            if total < min_ratio * len(fingerprint.hashes):
+                continue
+            hit_slices = np.floor(q_time[q_idx[aligned]] * FRAME_SECONDS / _SLICE_SECONDS)
+            coverage = len(np.unique(hit_slices)) / n_slices
+            start = offset * FRAME_SECONDS
+            fits = start >= -1.0 and start + fingerprint.duration <= videos[vid][1] + 1.0
+            if coverage >= min_coverage and fits:
+                found.append(FingerprintMatch(videos[vid][0], max(0.0, start), total, coverage))
+                if len(found) >= limit:
+                    break
+        return found
+
+
+def fingerprint_index_for(result_cache_dir: str) -> FingerprintIndex:
+    """The fingerprint index kept next to the results it points to."""
+    os.makedirs(result_cache_dir, exist_ok=True)
+    return FingerprintIndex(os.path.join(result_cache_dir, FINGERPRINT_DB))
+
+
+def shift_result(result: Dict[str, Any], offset: float, duration: float) -> Dict[str, Any]:
+    """The part of a Whisper ``result`` covering ``[offset, offset + duration]``, re-timed to 0.
+
+    A segment is kept when at least half of it lies in the range; times are
+    shifted and clamped to the range, word timings included.
+    """
+    end = offset + duration
+    segments = []
+    for seg in result.get("segments", []):
+        s, e = float(seg["start"]), float(seg["end"])
+        overlap = min(e, end) - max(s, offset)
+        if overlap <= 0 or overlap < (e - s) / 2:
+            continue
+        new = dict(seg)
+        new["id"] = len(segments)
+        new["start"] = round(max(0.0, s - offset), 3)
+        new["end"] = round(min(duration, e - offset), 3)
+        if seg.get("words"):
+            new["words"] = [
+                dict(
+                    w,
+                    start=round(max(0.0, w["start"] - offset), 3),
+                    end=round(min(duration, w["end"] - offset), 3),
+                )
+                for w in seg["words"]
+                if offset <= (w["start"] + w["end"]) / 2 <= end
+            ]
+        segments.append(new)
+    return {
+        "text": "".join(seg.get("text", "") for seg in segments),
+        "language": result.get("language"),
+        "segments": segments,
+    }
+
+
+def find_reusable_result(
+    fingerprint: Fingerprint,
+    index: FingerprintIndex,
+    result_cache: ResultCache,
+    params: Dict[str, Any],
+    *,
+    exclude: Optional[str] = None,
+) -> Optional[Tuple[FingerprintMatch, Dict[str, Any]]]:
+    """A cached result (same ``params``) of a video containing this audio, re-timed to it."""
+    for match in index.matches(fingerprint, exclude=exclude):
+        entry = result_cache.load(match.video_id, params)
+        if entry is None:
+            continue
+        logging.info(
+            "[fingerprint] Audio trouvé dans %s à %.1fs (%d votes, couverture %.0f%%)",
+            match.video_id,
+            match.offset,
+            match.votes,
+            100 * match.coverage,
+        )
+        return match, shift_result(entry["result"], match.offset, fingerprint.duration)
+    return None
@@ -0,0 +1,407 @@
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .backends import DEFAULT_BACKEND, backend_device
+from .pipeline import close_transcriber, load_transcriber, resolve_device, transcribe_youtube
+from .retry import backoff_delay
+from .server import JOB_OPTIONS
+from .session import DownloadSession
+
+# Options a queued job may carry; everything else is a worker setting
+QUEUE_JOB_OPTIONS = ("model", "cascade_model") + JOB_OPTIONS
+JOB_STATES = ("queued", "running", "done", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    options TEXT NOT NULL DEFAULT '{}',
+    state TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    not_before REAL NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS jobs_url_options ON jobs (url, options);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, not_before);
+"""
+
+
+@dataclass
+class Job:
+    id: int
+    url: str
+    options: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobQueue:
+    """Durable job queue in a SQLite file, shared by worker processes and hosts.
+
+    A job is ``queued``, ``running`` (claimed under a lease), ``done`` (with its
+    result) or ``failed``. A worker renews its lease while it runs the job; a
+    job whose lease expired (its worker died) is claimed again by the next
+    worker, until ``max_attempts`` claims have been used. Failed attempts are
+    retried after a jittered exponential delay. Leases use wall-clock time:
+    hosts sharing the file need clocks in sync to well within a lease, and the
+    file must live on a filesystem with working locks.
+    """
+
+    def __init__(self, path: str, *, lease_seconds: float = 300.0) -> None:
+        self.path = path
+        self.lease_seconds = lease_seconds
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One connection per operation: workers use it from several threads
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            # Take the write lock up front: two workers never claim the same job
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def enqueue(
+        self,
+        urls: Iterable[str],
+        options: Optional[Dict[str, Any]] = None,
+        *,
+        max_attempts: int = 3,
+    ) -> int:
+        """Add one job per URL; a URL already queued with the same options is ignored.
+
+        Returns the number of jobs added.
+        """
+        options = dict(options or {})
+        unknown = set(options) - set(QUEUE_JOB_OPTIONS)
+        if unknown:
+            raise ValueError(f"options inconnues: {', '.join(sorted(unknown))}")
+        encoded = json.dumps(options, sort_keys=True)
+        now = time.time()
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (url, options, max_attempts, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(url, encoded, max(1, max_attempts), now, now) for url in urls],
+            )
+            return conn.total_changes - before
+
+    def claim(self, worker: str) -> Optional[Job]:
+        """Lease the next runnable job to ``worker``, reclaiming expired leases first."""
+        now = time.time()
+        with self._transaction() as conn:
+            expired = conn.execute(
+                "UPDATE jobs SET state = 'failed', worker = NULL, lease_expires = NULL,"
+                " error = 'bail expiré (worker disparu) après ' || attempts || ' tentative(s)',"
+                " updated_at = ?"
+                " WHERE state = 'running' AND lease_expires < ? AND attempts >= max_attempts",
+                (now, now),
+            ).rowcount
+            if expired:
+                logging.warning("[jobs] %d job(s) abandonné(s): bail expiré", expired)
+            row = conn.execute(
+                "SELECT * FROM jobs"
+                " WHERE (state = 'queued' AND not_before <= ?)"
+                " OR (state = 'running' AND lease_expires < ?)"
+                " ORDER BY id LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is None:
+                return None
+            if row["state"] == "running":
+                logging.warning("[jobs] Job %d repris: bail de %s expiré", row["id"], row["worker"])
+            conn.execute(
+                "UPDATE jobs SET state = 'running', worker = ?, lease_expires = ?,"
+                " attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (worker, now + self.lease_seconds, now, row["id"]),
+            )
+        return Job(
+            row["id"],
+            row["url"],
+            json.loads(row["options"]),
+            row["attempts"] + 1,
+            row["max_attempts"],
+        )
+
+    def renew(self, job_id: int, worker: str) -> bool:
+        """Extend the lease; False if ``worker`` no longer holds the job."""
+        now = time.time()
+        with self._connect() as conn:
+            return (
+                conn.execute(
+                    "UPDATE jobs SET lease_expires = ?, updated_at = ?"
+                    " WHERE id = ? AND worker = ? AND state = 'running'",
+                    (now + self.lease_seconds, now, job_id, worker),
+                ).rowcount
+                == 1
+            )
+
+    def complete(self, job_id: int, worker: str, result: Dict[str, Any]) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = 'done', result = ?, error = NULL, worker = NULL,"
+                " lease_expires = NULL, updated_at = ? WHERE id = ? AND worker = ?",
+                (json.dumps(result, ensure_ascii=False), time.time(), job_id, worker),
+            )
+
+    def fail(self, job: Job, worker: str, error: str) -> str:
+        """Record a failed attempt; the job is queued again unless it is out of attempts.
+
+        Returns the job's new state.
+        """
+        now = time.time()
+        if job.attempts < job.max_attempts:
+            state, not_before = (
+                "queued",
+                now + backoff_delay(job.attempts - 1, base=30.0, cap=3600.0),
+            )
+        else:
+            state, not_before = "failed", 0.0
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = ?, not_before = ?, error = ?, worker = NULL,"
+                " lease_expires = NULL, updated_at = ? WHERE id = ? AND worker = ?",
+                (state, not_before, error, now, job.id, worker),
+            )
+        return state
+
+    def release(self, job: Job, worker: str) -> None:
+        """Give a claimed job back untouched (worker shutting down): no attempt is used."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = 'queued', attempts = attempts - 1, worker = NULL,"
+                " lease_expires = NULL, updated_at = ? WHERE id = ? AND worker = ?",
+                (time.time(), job.id, worker),
+            )
+
+    def requeue_failed(self) -> int:
+        """Queue every failed job again with a fresh attempt budget."""
+        with self._connect() as conn:
+            return conn.execute(
+                "UPDATE jobs SET state = 'queued', attempts = 0, not_before = 0, updated_at = ?"
+                " WHERE state = 'failed'",
+                (time.time(),),
+            ).rowcount
+
+    def next_claim_delay(self) -> Optional[float]:
+        """Seconds until ``claim`` may return a job; None once no job is queued or running.
+
+        A queued job waits for its retry delay, a running one for its lease to
+        expire (or to finish sooner).
+        """
+        with self._connect() as conn:
+            (when,) = conn.execute(
+                "SELECT MIN(CASE state WHEN 'queued' THEN not_before ELSE lease_expires END)"
+                " FROM jobs WHERE state IN ('queued', 'running')"
+            ).fetchone()
+        return None if when is None else max(0.0, when - time.time())
+
+    def counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        counts = {state: 0 for state in JOB_STATES}
+        counts.update({row[0]: row[1] for row in rows})
+        return counts
+
+    def jobs(self, state: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        query = "SELECT * FROM jobs"
+        params: Tuple[Any, ...] = ()
+        if state:
+            query += " WHERE state = ?"
+            params = (state,)
+        with self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY id LIMIT ?", params + (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+
+class _Heartbeat:
+    """Renews a job's lease from a background thread while the job runs."""
+
+    def __init__(self, queue: JobQueue, job_id: int, worker: str) -> None:
+        self._queue = queue
+        self._job_id = job_id
+        self._worker = worker
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="jobs-heartbeat", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._queue.lease_seconds / 3):
+            try:
+                if not self._queue.renew(self._job_id, self._worker):
+                    logging.warning("[jobs] Bail du job %d perdu", self._job_id)
+                    return
+            except sqlite3.Error as e:
+                logging.warning("[jobs] Renouvellement du bail du job %d: %s", self._job_id, e)
+
+    def __enter__(self) -> _Heartbeat:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def run_worker(
+    db_path: str,
+    *,
+    worker_id: Optional[str] = None,
+    lease_seconds: float = 300.0,
+    poll_seconds: float = 10.0,
+    exit_when_empty: bool = False,
+    max_jobs: Optional[int] = None,
+    **defaults: Any,
+) -> int:
+    """Claim and run jobs with ``transcribe_youtube`` until stopped; returns the jobs run.
+
+    ``defaults`` are ``transcribe_youtube`` options (output_dir, device, ...),
+    overridden by each job's own options. The Whisper model stays loaded from
+    one job to the next while the model does not change, and all downloads go
+    through one DownloadSession. ``exit_when_empty`` stops the worker once no
+    job is queued or running, waiting for the retry delays and the other
+    workers' leases first.
+    """
+    queue = JobQueue(db_path, lease_seconds=lease_seconds)
+    worker = worker_id or default_worker_id()
+    defaults.setdefault("skip_existing", True)
+    backend = defaults.get("backend", DEFAULT_BACKEND)
+    device = backend_device(backend, resolve_device(defaults.get("device", "cuda")))
+    loaded: Optional[Tuple[Tuple[str, Optional[str]], Any]] = None
+    done = 0
+    session = DownloadSession(
+        cookies_file=defaults.get("cookies_file"),
+        output_dir=defaults.get("output_dir", "data"),
+        verbose=defaults.get("verbose", False),
+        max_concurrent=1,
+    )
+    logging.info("[jobs] Worker %s démarré sur %s", worker, db_path)
+    try:
+        while max_jobs is None or done < max_jobs:
+            job = queue.claim(worker)
+            if job is None:
+                delay = poll_seconds
+                if exit_when_empty:
+                    # Jobs waiting for a retry or held by another worker keep
+                    # the queue alive
+                    wait = queue.next_claim_delay()
+                    if wait is None:
+                        break
+                    delay = min(poll_seconds, max(wait, 0.1))
+                time.sleep(delay)
+                continue
+            options = dict(defaults)
+            options.update(job.options)
+            model = options.pop("model", "small")
+            cascade = options.get("cascade_model")
+            print(f"[jobs] Job {job.id} (tentative {job.attempts}/{job.max_attempts}): {job.url}")
+            try:
+                with _Heartbeat(queue, job.id, worker):
+                    if loaded is None or loaded[0] != (model, cascade):
+                        if loaded is not None:
+                            close_transcriber(loaded[1])
+                            loaded = None
+                        loaded = (
+                            (model, cascade),
+                            load_transcriber(
+                                model,
+                                device,
+                                cpu_workers=options.get("cpu_workers", 0),
+                                chunk_seconds=options.get("chunk_seconds", 120.0),
+                                warm_up=True,
+                                cascade_model=cascade,
+                                cascade_glossary=options.get("replace_map"),
+                                backend=backend,
+                            ),
+                        )
+                    output_path = transcribe_youtube(
+                        job.url,
+                        model=model,
+                        whisper_model=loaded[1],
+                        session=session,
+                        **options,
+                    )
+            except KeyboardInterrupt:
+                queue.release(job, worker)
+                raise
+            except BaseException as e:  # noqa: BLE001
+                # SystemExit included: transcribe_youtube reports fatal errors with it
+                error = f"code de sortie {e.code}" if isinstance(e, SystemExit) else str(e)
+                state = queue.fail(job, worker, error or type(e).__name__)
+                logging.warning("[jobs] Job %d échoué (%s): %s", job.id, state, error)
+            else:
+                queue.complete(job.id, worker, {"output_path": os.path.abspath(output_path)})
+            done += 1
+    finally:
+        if loaded is not None:
+            close_transcriber(loaded[1])
+        session.close()
+    return done
+
+
+def _worker_main(db_path: str, kwargs: Dict[str, Any]) -> None:
+    logging.basicConfig(
+        level=logging.INFO if kwargs.get("verbose") else logging.WARNING,
+        format="[%(levelname)s] %(message)s",
+    )
+    try:
+        run_worker(db_path, **kwargs)
+    except KeyboardInterrupt:
+        pass
+
+
+def run_workers(db_path: str, processes: int = 1, **kwargs: Any) -> None:
+    """Run ``processes`` workers (``run_worker``) in separate processes and wait for them."""
+    if processes <= 1:
+        run_worker(db_path, **kwargs)
+        return
+    procs = [
+        multiprocessing.Process(target=_worker_main, args=(db_path, kwargs), name=f"jobs-{i}")
+        for i in range(processes)
+    ]
+    for proc in procs:
+        proc.start()
+    try:
+        for proc in procs:
+            proc.join()
+    except KeyboardInterrupt:
+        # The workers received the interrupt too and give their jobs back
+        for proc in procs:
+            proc.join()
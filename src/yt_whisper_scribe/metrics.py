@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process so far (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kibibytes elsewhere
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+class JobMetrics:
+    """Stage timings and counters of one transcription job.
+
+    ``stage`` times a block (repeated stages add up); ``set``/``add`` record
+    values such as ``audio_seconds``, ``download_bytes``, ``download_retries``
+    or ``replacements``. ``record`` returns the flat dict exported by
+    MetricsSink.
+    """
+
+    def __init__(self, **labels: Any) -> None:
+        self.labels: Dict[str, Any] = {"host": socket.gethostname(), **labels}
+        self.stages: Dict[str, float] = {}
+        self.values: Dict[str, Any] = {}
+        self._t0 = time.monotonic()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t0 = time.monotonic()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.monotonic() - t0
+
+    def set(self, name: str, value: Any) -> None:
+        self.values[name] = value
+
+    def add(self, name: str, n: float = 1) -> None:
+        self.values[name] = self.values.get(name, 0) + n
+
+    def record(self, status: str = "ok") -> Dict[str, Any]:
+        audio_s = self.values.get("audio_seconds")
+        transcribe_s = self.stages.get("transcribe")
+        return {
+            "ts": round(time.time(), 3),
+            **self.labels,
+            "status": status,
+            "wall_seconds": round(time.monotonic() - self._t0, 3),
+            "stages": {k: round(v, 3) for k, v in self.stages.items()},
+            "realtime_factor": (
+                round(audio_s / transcribe_s, 2) if audio_s and transcribe_s else None
+            ),
+            "peak_rss_bytes": peak_rss_bytes(),
+            **self.values,
+        }
+
+
+_PROM_PREFIX = "yt_whisper"
+
+
+def _prom_labels(labels: Dict[str, Any]) -> str:
+    parts = []
+    for k, v in labels.items():
+        v = str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def prometheus_text(record: Dict[str, Any]) -> str:
+    """Render a job record as Prometheus text exposition (gauges of the last job)."""
+    base = {k: record[k] for k in ("host", "model") if record.get(k) is not None}
+    lines: List[str] = []
+
+    def _gauge(name: str, value: Any, help_text: str, **extra: Any) -> None:
+        if value is None:
+            return
+        metric = f"{_PROM_PREFIX}_{name}"
+        if not any(line.startswith(f"# TYPE {metric} ") for line in lines):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric}{_prom_labels({**base, **extra})} {float(value)}")
+
+    for stage, seconds in record.get("stages", {}).items():
+        _gauge("stage_seconds", seconds, "Duration of each stage of the last job.", stage=stage)
+    _gauge("wall_seconds", record.get("wall_seconds"), "Wall time of the last job.")
+    _gauge("audio_seconds", record.get("audio_seconds"), "Audio duration of the last job.")
+    _gauge(
+        "realtime_factor",
+        record.get("realtime_factor"),
+        "Audio seconds transcribed per second of transcription.",
+    )
+    _gauge("peak_rss_bytes", record.get("peak_rss_bytes"), "Peak resident memory of the process.")
+    _gauge("download_bytes", record.get("download_bytes"), "Bytes downloaded by the last job.")
+    _gauge("download_retries", record.get("download_retries"), "Download retries of the last job.")
+    _gauge("replacements", record.get("replacements"), "Glossary replacements of the last job.")
+    _gauge(
+        "cross_boundary_replacements",
+        record.get("cross_boundary_replacements"),
+        "Cross-boundary glossary replacements of the last job.",
+    )
+    _gauge(
+        "last_job_success",
+        1 if record.get("status") == "ok" else 0,
+        "1 if the last job succeeded.",
+    )
+    _gauge("last_job_timestamp_seconds", record.get("ts"), "End time of the last job.")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsSink:
+    """Exports job records as JSON lines and/or a Prometheus textfile.
+
+    The JSONL file gets one line per job (appended); the textfile, meant for
+    node_exporter's textfile collector, is replaced atomically with the last
+    job's gauges. Export errors are logged, never raised.
+    """
+
+    def __init__(self, jsonl_path: Optional[str] = None, prom_path: Optional[str] = None) -> None:
+        self.jsonl_path = jsonl_path
+        self.prom_path = prom_path
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.jsonl_path or self.prom_path)
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            if self.jsonl_path:
+                try:
+                    with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                except OSError as e:
+                    logging.warning("[metrics] Écriture impossible %s: %s", self.jsonl_path, e)
+            if self.prom_path:
+                tmp = f"{self.prom_path}.{uuid.uuid4().hex}.tmp"
+                try:
+                    with open(tmp, "w", encoding="utf-8") as f:
+                        f.write(prometheus_text(record))
+                    os.replace(tmp, self.prom_path)
+                except OSError as e:
+                    logging.warning("[metrics] Écriture impossible %s: %s", self.prom_path, e)
+                    try:
+                        os.remove(tmp)
+                    except OSError:
+                        pass
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+INDEX_FILENAME = ".yt-whisper-index.jsonl"
+
+# Output files are named <title>-<video_id>.<lang>.<ext>; YouTube ids are 11 chars
+_OUTPUT_NAME_RE = re.compile(r"-(?P<id>[A-Za-z0-9_-]{11})\.(?P<lang>[^.]+)\.(?P<ext>[^.]+)$")
+_VIDEO_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+
+
+def video_id_from_url(url: str) -> Optional[str]:
+    """Extract the YouTube video id from common URL shapes without any network call."""
+    try:
+        parsed = urlparse(url.strip())
+    except ValueError:
+        return None
+    host = (parsed.hostname or "").lower()
+    candidate: Optional[str] = None
+    if host.endswith("youtu.be"):
+        candidate = parsed.path.lstrip("/").split("/")[0]
+    elif host.endswith("youtube.com") or host.endswith("youtube-nocookie.com"):
+        if parsed.path == "/watch":
+            candidate = (parse_qs(parsed.query).get("v") or [None])[0]
+        else:
+            parts = [p for p in parsed.path.split("/") if p]
+            if len(parts) >= 2 and parts[0] in ("shorts", "live", "embed", "v"):
+                candidate = parts[1]
+    if candidate and _VIDEO_ID_RE.match(candidate):
+        return candidate
+    return None
+
+
+class OutputIndex:
+    """Produced outputs of one output directory, keyed by video id.
+
+    Backed by an append-only JSON-lines file in the directory, merged with a
+    scan of the existing ``<title>-<id>.<lang>.<ext>`` files so outputs written
+    before the index existed are found too. Lookups check that the file still
+    exists.
+    """
+
+    def __init__(self, output_dir: str) -> None:
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, INDEX_FILENAME)
+        # video_id -> [(lang, ext, path)]
+        self._entries: Dict[str, List[Tuple[str, str, str]]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _add(self, video_id: str, lang: str, ext: str, path: str) -> None:
+        entries = self._entries.setdefault(video_id, [])
+        if (lang, ext, path) not in entries:
+            entries.append((lang, ext, path))
+
+    def _load(self) -> None:
+        try:
+            names = os.listdir(self.output_dir)
+        except OSError:
+            names = []
+        for name in names:
+            m = _OUTPUT_NAME_RE.search(name)
+            if m:
+                path = os.path.join(self.output_dir, name)
+                self._add(m.group("id"), m.group("lang"), m.group("ext"), path)
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                        self._add(rec["id"], rec["lang"], rec["ext"], rec["path"])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning("[index] Lecture impossible de %s: %s", self.path, e)
+
+    def lookup(
+        self, video_id: str, output_format: str, lang_tag: Optional[str] = None
+    ) -> Optional[str]:
+        """Existing output path for ``video_id`` in ``output_format``, if any.
+
+        ``lang_tag`` None matches any language (e.g. ``--language auto``).
+        """
+        with self._lock:
+            entries = list(self._entries.get(video_id, ()))
+        for lang, ext, path in entries:
+            if ext == output_format and (lang_tag is None or lang == lang_tag):
+                if os.path.exists(path):
+                    return path
+        return None
+
+    def record(self, video_id: str, path: str, lang_tag: str, output_format: str) -> None:
+        with self._lock:
+            self._add(video_id, lang_tag, output_format, path)
+            line = json.dumps(
+                {"id": video_id, "lang": lang_tag, "ext": output_format, "path": path},
+                ensure_ascii=False,
+            )
+            try:
+                # One short line per write: appends from concurrent jobs do not interleave
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError as e:
+                logging.warning("[index] Écriture impossible dans %s: %s", self.path, e)
+
+
+_indexes: Dict[str, OutputIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_output_index(output_dir: str) -> OutputIndex:
+    """Process-wide OutputIndex for ``output_dir`` (loaded once)."""
+    key = os.path.abspath(output_dir)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = OutputIndex(output_dir)
+        return index
@@ -3,56 +3,48 @@ from __future__ import annotations
 import itertools
 import logging
 import os
-import platform
 import re
 import shutil
 import sys
 import threading
 import time
-from typing import Optional
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Union
 
-from .replace import apply_glossary_replacements, load_glossary
-from .srt import generate_srt_content
+import numpy as np
 
+from .audio import SAMPLE_RATE, decode_pcm
+from .audio_cache import get_audio_cache
+from .backends import DEFAULT_BACKEND, backend_device, load_model
+from .cascade import CascadeTranscriber
+from .download import DownloadError, download_audio, probe_info
+from .fingerprint import (
+    Fingerprint,
+    FingerprintIndex,
+    compute_fingerprint,
+    find_reusable_result,
+    fingerprint_index_for,
+)
+from .metrics import JobMetrics, MetricsSink
+from .output_index import get_output_index, video_id_from_url
+from .replace import (
+    ReplaceCounts,
+    ReplaceEvent,
+    StreamingReplacer,
+    apply_glossary_replacements,
+    load_compiled_glossary,
+)
+from .result_cache import ResultCache, read_entry, result_cache_params
+from .segments import SegmentStore
+from .session import DownloadSession
+from .streaming import SegmentStream
+from .workspace import JobWorkspace
+from .writers import MultiWriter, open_writers, parse_output_formats
 
-def transcribe_youtube(
-    url: str,
-    *,
-    model: str = "small",
-    output_format: str = "srt",
-    output_dir: str = "data",
-    vocab_file: Optional[str] = None,
-    language: Optional[str] = "en",
-    task: str = "transcribe",
-    audio_format: str = "m4a",
-    verbose: bool = False,
-    device: str = "cuda",
-    fp16: Optional[bool] = None,
-    temperature: float = 0.0,
-    condition_on_previous_text: bool = True,
-    replace_map: Optional[str] = "SWOOD_Glossary.json",
-    dry_run_replace: bool = False,
-    overwrite: bool = False,
-    skip_existing: bool = False,
-    cookies_file: Optional[str] = None,
-) -> str:
-    """Download audio from YouTube, run Whisper, and write output.
 
-    Returns the output file path on success. Raises SystemExit with
-    distinct codes on fatal precondition failures to keep CLI behavior.
-    """
-    # Heavy deps imported here to keep module import light for tests
+def resolve_device(device: str) -> str:
+    """Map ``auto`` to cuda/cpu and exit with code 5 if CUDA is requested but missing."""
     import torch  # type: ignore
-    import whisper  # type: ignore
-    import yt_dlp  # type: ignore
-
-    if language and language.lower() == "auto":
-        language = None
-
-    logging.basicConfig(
-        level=logging.INFO if verbose else logging.WARNING,
-        format="[%(levelname)s] %(message)s",
-    )
 
     # Device selection
     if device == "auto":
@@ -71,7 +63,10 @@ def transcribe_youtube(
             logging.info(f"GPU détecté: {gpu_name}")
         except Exception:
             pass
+    return run_device
+
 
+def check_ffmpeg() -> None:
     # ffmpeg precondition
     if shutil.which("ffmpeg") is None:
         print(
@@ -79,239 +74,1096 @@ def transcribe_youtube(
         )
         raise SystemExit(2)
 
-    # Prepare output dir
-    os.makedirs(output_dir, exist_ok=True)
 
-    # Download audio
-    print(f"Téléchargement de l'audio depuis : {url}")
-    temp_stem = os.path.join(output_dir, "temp_audio")
-    preferredcodec = audio_format
-    # Optional cookies support: use provided path or auto-detect data/cookies.txt
-    def _autodetect_cookies() -> Optional[str]:
-        candidates = []
-        if cookies_file:
-            candidates.append(cookies_file)
-        # Check environment variable first (secure option)
-        env_cookies = os.getenv("YT_COOKIES_FILE")
-        if env_cookies:
-            candidates.append(env_cookies)
-        # Default candidate in CWD
-        candidates.append(os.path.join(os.getcwd(), "data", "cookies.txt"))
-        # Candidate relative to output_dir
-        candidates.append(os.path.join(os.path.abspath(output_dir), "..", "data", "cookies.txt"))
-        for c in candidates:
-            try:
-                if c and os.path.isfile(c):
-                    return os.path.abspath(c)
-            except Exception:
-                pass
-        return None
+def selected_model_name(model: str) -> str:
+    # Map shorthand 'turbo' to 'large-v3-turbo' for convenience
+    return "large-v3-turbo" if model == "turbo" else model
 
-    cookiefile_path = _autodetect_cookies()
 
-    ydl_opts = {
-        "format": "bestaudio[ext=m4a]/bestaudio/best",
-        "postprocessors": [
-            {
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": preferredcodec,
-                "preferredquality": "192",
-            }
-        ],
-        "outtmpl": temp_stem,
-        "quiet": not verbose,
-        "noplaylist": True,
-    }
-    if cookiefile_path:
-        ydl_opts["cookiefile"] = cookiefile_path
-        logging.info("[cookies] Utilisation du cookies.txt: %s", cookiefile_path)
+def load_whisper_model(
+    model: str, device: str, *, warm_up: bool = False, backend: str = DEFAULT_BACKEND
+) -> Any:
+    selected_model = selected_model_name(model)
+    suffix = "" if backend == DEFAULT_BACKEND else f" (backend {backend})"
+    print(f"Chargement du modèle Whisper '{selected_model}'{suffix}...")
+    whisper_model = load_model(backend, selected_model, device)
+    # The warm-up drives openai-whisper's torch modules
+    if warm_up and backend != "faster-whisper":
+        warm_up_model(whisper_model)
+    return whisper_model
 
-    info_dict = None
-    for attempt in range(3):
+
+def warm_up_model(whisper_model: Any) -> None:
+    """Run the encoder and one decoder step on 30 s of silence.
+
+    On CUDA this pays for context creation, kernel selection and allocator
+    growth up front, so the first real window does not. Failures are logged
+    and ignored: warm-up is only an optimization.
+    """
+    try:
+        import torch  # type: ignore
+        import whisper  # type: ignore
+
+        t0 = time.monotonic()
+        silence = np.zeros(whisper.audio.N_SAMPLES, dtype=np.float32)
+        mel = whisper.log_mel_spectrogram(silence, n_mels=whisper_model.dims.n_mels)
+        with torch.no_grad():
+            whisper_model.detect_language(mel.to(whisper_model.device))
+        if whisper_model.device.type == "cuda":
+            torch.cuda.synchronize()
+        logging.info("Préchauffage du modèle: %.1fs", time.monotonic() - t0)
+    except Exception as e:  # noqa: BLE001
+        logging.info("Préchauffage du modèle ignoré: %s", e)
+
+
+def start_model_load(
+    model: str,
+    device: str,
+    *,
+    cpu_workers: int = 0,
+    chunk_seconds: float = 120.0,
+    metrics: Optional[JobMetrics] = None,
+    cascade_model: Optional[str] = None,
+    cascade_glossary: Optional[str] = None,
+    backend: str = DEFAULT_BACKEND,
+) -> Future:
+    """Load (and warm up) the transcriber in a background thread.
+
+    Returns a Future of ``load_transcriber``'s result, to be joined right
+    before transcription so the load overlaps the download.
+    """
+    future: Future = Future()
+    metrics = metrics if metrics is not None else JobMetrics()
+
+    def _load() -> None:
+        # False once discard_model_load cancelled a load that had not begun
+        if not future.set_running_or_notify_cancel():
+            return
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info_dict = ydl.extract_info(url, download=True)
-                break
-        except Exception as e:  # noqa: BLE001
-            logging.warning(f"Tentative {attempt+1}/3 échouée pour le téléchargement: {e}")
-            time.sleep(2 * (attempt + 1))
-    if info_dict is None:
-        print("Erreur lors du téléchargement après plusieurs tentatives.")
-        raise SystemExit(3)
+            with metrics.stage("model_load"):
+                future.set_result(
+                    load_transcriber(
+                        model,
+                        device,
+                        cpu_workers=cpu_workers,
+                        chunk_seconds=chunk_seconds,
+                        warm_up=True,
+                        cascade_model=cascade_model,
+                        cascade_glossary=cascade_glossary,
+                        backend=backend,
+                    )
+                )
+        except BaseException as e:  # noqa: BLE001
+            future.set_exception(e)
+
+    threading.Thread(target=_load, name="whisper-load", daemon=True).start()
+    return future
+
+
+def load_transcriber(
+    model: str,
+    device: str,
+    *,
+    cpu_workers: int = 0,
+    chunk_seconds: float = 120.0,
+    warm_up: bool = False,
+    cascade_model: Optional[str] = None,
+    cascade_glossary: Optional[str] = None,
+    backend: str = DEFAULT_BACKEND,
+) -> Any:
+    """Load the Whisper model, or a ChunkedTranscriber for ``cpu_workers > 1`` on CPU.
+
+    ``backend`` picks the inference engine (see ``backends.BACKENDS``), also
+    used by the chunked workers and both cascade models.
+    With ``cascade_model``, a CascadeTranscriber: ``model`` transcribes
+    everything and ``cascade_model`` (loaded on first need) redoes the
+    uncertain regions; ``cascade_glossary`` adds its anti keywords as
+    escalation triggers. All expose ``transcribe(audio, **kwargs)``; call
+    ``close_transcriber`` when done.
+    """
+    if cascade_model:
+        if cpu_workers > 1:
+            logging.warning("--cpu-workers ignoré avec --cascade-model")
+        return CascadeTranscriber(
+            load_whisper_model(model, device, warm_up=warm_up, backend=backend),
+            lambda: load_whisper_model(cascade_model, device, backend=backend),
+            glossary_path=cascade_glossary,
+        )
+    if device == "cpu" and cpu_workers > 1:
+        from .chunked import ChunkedTranscriber
+
+        transcriber = ChunkedTranscriber(
+            selected_model_name(model),
+            workers=cpu_workers,
+            chunk_seconds=chunk_seconds,
+            backend=backend,
+        )
+        if warm_up:
+            transcriber.warm_up()
+        return transcriber
+    if cpu_workers > 1:
+        logging.warning("--cpu-workers ignoré: réservé à --device cpu")
+    return load_whisper_model(model, device, warm_up=warm_up, backend=backend)
+
+
+def close_transcriber(whisper_model: Any) -> None:
+    close = getattr(whisper_model, "close", None)
+    if callable(close):
+        close()
+
+
+def discard_model_load(future: Future) -> None:
+    """Release a ``start_model_load`` that is no longer needed, without waiting for it.
+
+    A load not begun yet is cancelled; a running one is closed from a callback
+    once it finishes (chunked workers would otherwise outlive the job), so an
+    interrupted job does not wait for the whole model load. A failed load is
+    only logged.
+    """
+    if future.cancel():
+        return
+
+    def _close(done: Future) -> None:
+        try:
+            whisper_model = done.result()
+        except BaseException as e:  # noqa: BLE001
+            logging.info("Chargement du modèle abandonné: %s", e)
+            return
+        close_transcriber(whisper_model)
+
+    future.add_done_callback(_close)
+
+
+def load_initial_prompt(vocab_file: Optional[str]) -> Optional[str]:
+    """Build the Whisper ``initial_prompt`` from a vocabulary file (one term per line)."""
+    if not vocab_file:
+        return None
+    initial_prompt = None
+    try:
+        with open(vocab_file, encoding="utf-8") as f:
+            vocab_terms = []
+            for line in f:
+                s = line.strip()
+                if not s or s.startswith("#"):
+                    continue
+                vocab_terms.append(s)
+            if vocab_terms:
+                initial_prompt = ", ".join(vocab_terms)
+                # Harmonisation avec la documentation: terminer par un point si absent
+                if initial_prompt and initial_prompt[-1] not in ".!?…":
+                    initial_prompt += "."
+            else:
+                initial_prompt = None
+        if initial_prompt:
+            logging.info("Vocabulaire chargé depuis %s (%d termes)", vocab_file, len(vocab_terms))
+            preview = initial_prompt if len(initial_prompt) <= 300 else initial_prompt[:300] + "…"
+            logging.info("Prompt initial (aperçu): %s", preview)
+    except FileNotFoundError:
+        logging.warning(f"Le fichier de vocabulaire '{vocab_file}' n'a pas été trouvé.")
+    return initial_prompt
+
+
+def lang_tag_for(task: str, language: Optional[str]) -> Optional[str]:
+    """Language tag of the output name, or None when it depends on detection."""
+    if task == "translate":
+        return "en"
+    if language and language.lower() != "auto":
+        return str(language).lower()
+    return None
+
+
+def output_path_for(
+    info_dict: Dict[str, Any], output_dir: str, lang_tag: str, output_format: str
+) -> str:
+    # Output path with pattern: <title>-<video_id>.<lang>.<ext>
     video_title = info_dict.get("title", "video_sans_titre")
     video_id = info_dict.get("id", "unknown")
-    temp_audio_file = f"{temp_stem}.{preferredcodec}"
+    safe_title = re.sub(r"[\\/*?:\"<>|]", "", video_title).strip()
+    safe_title = safe_title or "transcription"
+    output_filename = f"{safe_title}-{video_id}.{lang_tag}.{output_format}"
+    return os.path.join(output_dir, output_filename)
 
-    # Vocabulary prompt
-    initial_prompt = None
-    if vocab_file:
-        try:
-            with open(vocab_file, encoding="utf-8") as f:
-                vocab_terms = []
-                for line in f:
-                    s = line.strip()
-                    if not s or s.startswith("#"):
-                        continue
-                    vocab_terms.append(s)
-                if vocab_terms:
-                    initial_prompt = ", ".join(vocab_terms)
-                    # Harmonisation avec la documentation: terminer par un point si absent
-                    if initial_prompt and initial_prompt[-1] not in ".!?…":
-                        initial_prompt += "."
-                else:
-                    initial_prompt = None
-            if initial_prompt:
-                logging.info(
-                    "Vocabulaire chargé depuis %s (%d termes)", vocab_file, len(vocab_terms)
-                )
-                preview = (
-                    initial_prompt if len(initial_prompt) <= 300 else initial_prompt[:300] + "…"
-                )
-                logging.info("Prompt initial (aperçu): %s", preview)
-        except FileNotFoundError:
-            logging.warning(f"Le fichier de vocabulaire '{vocab_file}' n'a pas été trouvé.")
 
-    # Transcription
+def output_paths_for(
+    info_dict: Dict[str, Any], output_dir: str, lang_tag: str, output_format: str
+) -> Dict[str, str]:
+    """``{format: path}`` for a comma-separated ``output_format`` such as ``srt,vtt``."""
+    return {
+        fmt: output_path_for(info_dict, output_dir, lang_tag, fmt)
+        for fmt in parse_output_formats(output_format)
+    }
+
+
+def needs_word_timestamps(output_format: str) -> bool:
+    return "json" in parse_output_formats(output_format)
+
+
+def _output_meta(info_dict: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: info_dict[k] for k in ("id", "title") if k in info_dict}
+
+
+def _check_existing_outputs(paths: Dict[str, str], overwrite: bool, skip_existing: bool) -> bool:
+    """Apply the existing-file policy; True when the job must be skipped.
+
+    With ``skip_existing``, a job is skipped only when every requested format
+    already exists. Otherwise existing files are overwritten (the default).
+    """
+    existing = [p for p in paths.values() if os.path.exists(p)]
+    if skip_existing and existing and len(existing) == len(paths):
+        for path in existing:
+            print(f"Fichier existant détecté, opération ignorée: {path}")
+        return True
+    for path in existing:
+        if overwrite:
+            logging.info("Fichier existant, écrasement demandé: %s", path)
+        else:
+            # Default behavior: overwrite existing file
+            print(f"[overwrite] Fichier existant, écrasement par défaut: {path}")
+    return False
+
+
+def _record_outputs(output_dir: str, video_id: str, paths: Dict[str, str], lang_tag: str) -> None:
+    index = get_output_index(output_dir)
+    for fmt, path in paths.items():
+        index.record(video_id, path, lang_tag, fmt)
+        print(f"Transcription terminée ! Fichier sauvegardé sous : {path}")
+
+
+def find_existing_output(
+    url: str,
+    *,
+    output_dir: str = "data",
+    output_format: str = "srt",
+    language: Optional[str] = "en",
+    task: str = "transcribe",
+    verbose: bool = False,
+    cookies_file: Optional[str] = None,
+    session: Optional[DownloadSession] = None,
+) -> Optional[str]:
+    """Return the output already produced for ``url``, before any download.
+
+    With several formats (``srt,vtt``), every one must exist; the path of the
+    first is returned.
+
+    First looks the video id parsed from the URL up in the output index (no
+    network). Otherwise probes the metadata only and checks the
+    ``<title>-<id>.<lang>.<ext>`` target; with ``--language auto`` only the index
+    can answer, since the language is known after transcription.
+    """
+    index = get_output_index(output_dir)
+    lang_tag = lang_tag_for(task, language)
+    formats = parse_output_formats(output_format)
+    video_id = video_id_from_url(url)
+    if video_id:
+        return _lookup_all(index, video_id, formats, lang_tag)
     try:
-        # Map shorthand 'turbo' to 'large-v3-turbo' for convenience
-        selected_model = "large-v3-turbo" if model == "turbo" else model
-        print(f"Chargement du modèle Whisper '{selected_model}'...")
-        wmodel = whisper.load_model(selected_model, device=run_device)
-
-        # Progress timer + spinner during transcription
-        stop_event = threading.Event()
-
-        def _format_elapsed(elapsed: float) -> str:
-            h = int(elapsed // 3600)
-            m = int((elapsed % 3600) // 60)
-            s = int(elapsed % 60)
-            if h:
-                return f"{h:02d}:{m:02d}:{s:02d}"
-            return f"{m:02d}:{s:02d}"
-
-        def _spinner() -> None:
-            frames = itertools.cycle("|/-\\")
-            start = time.monotonic()
-            while not stop_event.is_set():
-                elapsed = time.monotonic() - start
-                bar = next(frames)
-                msg = f"\rTranscription en cours — {_format_elapsed(elapsed)} {bar}  "
-                try:
-                    sys.stdout.write(msg)
-                    sys.stdout.flush()
-                except Exception:
-                    pass
-                time.sleep(0.1)
-            # clear line
+        info_dict = probe_info(
+            url,
+            verbose=verbose,
+            cookies_file=cookies_file,
+            output_dir=output_dir,
+            session=session,
+        )
+    except Exception as e:  # noqa: BLE001
+        logging.info("[skip] Sonde des métadonnées échouée pour %s: %s", url, e)
+        return None
+    if not info_dict or not info_dict.get("id"):
+        return None
+    if lang_tag is not None:
+        for fmt in formats:
+            path = output_path_for(info_dict, output_dir, lang_tag, fmt)
+            if index.lookup(info_dict["id"], fmt, lang_tag) is None and os.path.exists(path):
+                index.record(info_dict["id"], path, lang_tag, fmt)
+    return _lookup_all(index, info_dict["id"], formats, lang_tag)
+
+
+def _lookup_all(
+    index: Any, video_id: str, formats: List[str], lang_tag: Optional[str]
+) -> Optional[str]:
+    # Existing output of the first format, only if every format exists
+    found = [index.lookup(video_id, fmt, lang_tag) for fmt in formats]
+    return found[0] if all(found) else None
+
+
+def _format_elapsed(elapsed: float) -> str:
+    h = int(elapsed // 3600)
+    m = int((elapsed % 3600) // 60)
+    s = int(elapsed % 60)
+    if h:
+        return f"{h:02d}:{m:02d}:{s:02d}"
+    return f"{m:02d}:{s:02d}"
+
+
+def _start_spinner(status: Optional[Callable[[float], str]] = None) -> Callable[[], None]:
+    """Show a progress timer + spinner until the returned function is called.
+
+    ``status``, given the elapsed seconds, returns extra text for the line.
+    """
+    stop_event = threading.Event()
+
+    def _spinner() -> None:
+        frames = itertools.cycle("|/-\\")
+        start = time.monotonic()
+        while not stop_event.is_set():
+            elapsed = time.monotonic() - start
+            bar = next(frames)
+            extra = f" | {status(elapsed)}" if status is not None else ""
+            msg = f"\rTranscription en cours — {_format_elapsed(elapsed)}{extra} {bar}  "
             try:
-                sys.stdout.write("\r" + " " * 60 + "\r")
+                sys.stdout.write(msg)
                 sys.stdout.flush()
             except Exception:
                 pass
+            time.sleep(0.1)
+        # clear line
+        try:
+            sys.stdout.write("\r" + " " * 80 + "\r")
+            sys.stdout.flush()
+        except Exception:
+            pass
 
-        t0 = time.monotonic()
-        spinner_thread = threading.Thread(target=_spinner, daemon=True)
-        spinner_thread.start()
-
-        logging.info(
-            "Appel Whisper.transcribe: model=%s, device=%s, language=%s, task=%s, fp16=%s, temp=%.2f, cond_prev=%s",
-            selected_model,
-            run_device,
-            language if language is not None else "auto",
-            task,
-            (run_device == "cuda"),
-            temperature,
-            condition_on_previous_text,
-        )
+    spinner_thread = threading.Thread(target=_spinner, daemon=True)
+    spinner_thread.start()
 
-        result = wmodel.transcribe(
-            temp_audio_file,
-            initial_prompt=initial_prompt,
-            fp16=(fp16 if fp16 is not None else (run_device == "cuda")),
+    def _stop() -> None:
+        stop_event.set()
+        spinner_thread.join(timeout=1)
+
+    return _stop
+
+
+def transcribe_downloaded(
+    info_dict: Dict[str, Any],
+    audio_path: Union[str, np.ndarray],
+    *,
+    whisper_model: Any,
+    model: str = "small",
+    device: str = "cuda",
+    output_format: str = "srt",
+    output_dir: str = "data",
+    vocab_file: Optional[str] = None,
+    language: Optional[str] = "en",
+    task: str = "transcribe",
+    fp16: Optional[bool] = None,
+    temperature: float = 0.0,
+    condition_on_previous_text: bool = True,
+    replace_map: Optional[str] = "SWOOD_Glossary.json",
+    dry_run_replace: bool = False,
+    overwrite: bool = False,
+    skip_existing: bool = False,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    result_cache: Optional[ResultCache] = None,
+    stream: bool = False,
+    metrics: Optional[JobMetrics] = None,
+    fingerprints: Optional[FingerprintIndex] = None,
+    cascade_model: Optional[str] = None,
+    backend: str = DEFAULT_BACKEND,
+) -> str:
+    """Transcribe already-downloaded audio with a loaded model and write the output.
+
+    ``device`` must already be resolved (``cuda`` or ``cpu``). ``audio_path`` is
+    a file, decoded here, or PCM already returned by ``decode_pcm``. Returns the
+    output file path. The caller owns ``audio_path`` and its cleanup. ``on_result``, if
+    given, receives the final (post-glossary) Whisper result before writing.
+    With ``result_cache``, the raw result is stored for later re-rendering.
+    With ``stream``, segments are corrected and written as each window is
+    decoded (see ``_transcribe_streaming``). ``metrics`` receives the decode,
+    transcribe, replace and write stage timings. With ``fingerprints`` (and
+    ``result_cache``), audio already transcribed under another video id, in
+    whole or as a cut of a longer video, reuses that result re-timed instead
+    of running Whisper; transcribed audio is added to the index.
+    ``cascade_model`` names the strong model of a CascadeTranscriber passed as
+    ``whisper_model``: it is part of the result cache key, and the share of
+    audio it re-transcribed is recorded in ``metrics``. ``backend`` names the
+    engine ``whisper_model`` was loaded with; it is part of the cache key too.
+    """
+    metrics = metrics if metrics is not None else JobMetrics()
+    if language and language.lower() == "auto":
+        language = None
+
+    # Vocabulary prompt
+    initial_prompt = load_initial_prompt(vocab_file)
+
+    logging.info(
+        "Appel Whisper.transcribe: backend=%s, model=%s, device=%s, language=%s, task=%s, "
+        "fp16=%s, temp=%.2f, cond_prev=%s",
+        backend,
+        selected_model_name(model),
+        device,
+        language if language is not None else "auto",
+        task,
+        (device == "cuda"),
+        temperature,
+        condition_on_previous_text,
+    )
+
+    # Word timings are only computed when an output (JSON) carries them
+    word_timestamps = needs_word_timestamps(output_format)
+    transcribe_kwargs: Dict[str, Any] = dict(
+        initial_prompt=initial_prompt,
+        fp16=(fp16 if fp16 is not None else (device == "cuda")),
+        language=language,
+        task=task,
+        temperature=temperature,
+        condition_on_previous_text=condition_on_previous_text,
+    )
+    if word_timestamps:
+        transcribe_kwargs["word_timestamps"] = True
+    cache_params = (
+        result_cache_params(
+            model=selected_model_name(model),
             language=language,
             task=task,
             temperature=temperature,
             condition_on_previous_text=condition_on_previous_text,
+            initial_prompt=initial_prompt,
+            word_timestamps=word_timestamps,
+            cascade_model=selected_model_name(cascade_model) if cascade_model else None,
+            backend=backend,
         )
-        t1 = time.monotonic()
-        stop_event.set()
-        spinner_thread.join(timeout=1)
-        print(f"Durée de transcription: {_format_elapsed(t1 - t0)}")
+        if result_cache is not None
+        else None
+    )
 
-        # Output path with pattern: <title>-<video_id>.<lang>.<ext>
-        safe_title = re.sub(r"[\\/*?:\"<>|]", "", video_title).strip()
-        safe_title = safe_title or "transcription"
-        if task == "translate":
-            lang_tag = "en"
-        else:
-            if language:
-                lang_tag = str(language).lower()
-            else:
-                lang_tag = str(result.get("language", "unk")).lower()
-        output_filename = f"{safe_title}-{video_id}.{lang_tag}.{output_format}"
-        output_path = os.path.join(output_dir, output_filename)
-
-        # Existing file behavior: overwrite by default unless --skip-existing is set
-        if os.path.exists(output_path):
-            if skip_existing:
-                print(f"Fichier existant détecté, opération ignorée: {output_path}")
-                return output_path
-            if overwrite:
-                logging.info("Fichier existant, écrasement demandé: %s", output_path)
-            else:
-                # Default behavior: overwrite existing file
-                print(f"[overwrite] Fichier existant, écrasement par défaut: {output_path}")
+    # Decode once, straight to 16 kHz float32 PCM in memory
+    with metrics.stage("decode"):
+        audio = decode_pcm(audio_path) if isinstance(audio_path, str) else audio_path
+    metrics.set("audio_seconds", round(len(audio) / SAMPLE_RATE, 3))
 
-        # Optional post-replacements via glossary
-        if replace_map:
-            try:
-                glossary = load_glossary(replace_map)
-                new_segments, events = apply_glossary_replacements(result["segments"], glossary)
-                total = len(events)
-                cross = sum(1 for e in events if e.kind == "cross_boundary")
-                if dry_run_replace:
-                    logging.info("[replace] DRY RUN: %d suggestions", total)
-                    # Always show summary, even without --verbose
-                    print(f"[replace] Suggestions: {total} (cross-boundary: {cross})")
-                else:
-                    result["segments"] = new_segments
-                    result["text"] = " ".join(
-                        seg.get("text", "").strip() for seg in new_segments
-                    ).strip()
-                    # Log and print summary
-                    if events:
-                        logging.info(
-                            "[replace] %d remplacements (dont cross-boundary: %d)", total, cross
-                        )
-                        print(f"[replace] Replacements applied: {total} (cross-boundary: {cross})")
-            except Exception as e:  # noqa: BLE001
-                logging.warning(
-                    f"[replace] Erreur lors du chargement/application du glossaire: {e}"
+    fingerprint: Optional[Fingerprint] = None
+    video_id = info_dict.get("id")
+    if fingerprints is not None and result_cache is not None and cache_params is not None:
+        with metrics.stage("fingerprint"):
+            fingerprint = compute_fingerprint(audio)
+            reuse = find_reusable_result(
+                fingerprint, fingerprints, result_cache, cache_params, exclude=video_id
+            )
+        if reuse is not None:
+            match, result = reuse
+            print(
+                f"[fingerprint] Même audio que {match.video_id} (à {match.offset:.1f}s): "
+                "transcription réutilisée"
+            )
+            metrics.set("fingerprint_match", match.video_id)
+            result_cache.save(info_dict, cache_params, result)
+            if video_id:
+                fingerprints.add(video_id, fingerprint)
+            return render_result(
+                result,
+                info_dict,
+                output_format=output_format,
+                output_dir=output_dir,
+                language=language,
+                task=task,
+                replace_map=replace_map,
+                dry_run_replace=dry_run_replace,
+                overwrite=overwrite,
+                skip_existing=skip_existing,
+                on_result=on_result,
+                metrics=metrics,
+            )
+
+    if stream:
+        output_path = _transcribe_streaming(
+            info_dict,
+            audio,
+            whisper_model=whisper_model,
+            transcribe_kwargs=transcribe_kwargs,
+            output_format=output_format,
+            output_dir=output_dir,
+            task=task,
+            replace_map=replace_map,
+            dry_run_replace=dry_run_replace,
+            overwrite=overwrite,
+            skip_existing=skip_existing,
+            on_result=on_result,
+            result_cache=result_cache,
+            cache_params=cache_params,
+            metrics=metrics,
+        )
+        if fingerprint is not None and video_id:
+            fingerprints.add(video_id, fingerprint)
+        return output_path
+
+    t0 = time.monotonic()
+    stop_spinner = _start_spinner()
+    try:
+        with metrics.stage("transcribe"):
+            result = whisper_model.transcribe(audio, **transcribe_kwargs)
+    finally:
+        stop_spinner()
+    t1 = time.monotonic()
+    print(f"Durée de transcription: {_format_elapsed(t1 - t0)}")
+    cascade = result.get("cascade")
+    if cascade:
+        print(
+            f"[cascade] {cascade['regions']} région(s) retranscrite(s) par le grand modèle "
+            f"({100 * cascade['escalated_share']:.1f}% de l'audio)"
+        )
+        metrics.set("cascade_regions", cascade["regions"])
+        metrics.set("cascade_escalated_seconds", cascade["escalated_seconds"])
+
+    if result_cache is not None and cache_params is not None:
+        result_cache.save(info_dict, cache_params, result)
+        if fingerprint is not None and video_id:
+            fingerprints.add(video_id, fingerprint)
+
+    return render_result(
+        result,
+        info_dict,
+        output_format=output_format,
+        output_dir=output_dir,
+        language=language,
+        task=task,
+        replace_map=replace_map,
+        dry_run_replace=dry_run_replace,
+        overwrite=overwrite,
+        skip_existing=skip_existing,
+        on_result=on_result,
+        metrics=metrics,
+    )
+
+
+def _transcribe_streaming(
+    info_dict: Dict[str, Any],
+    audio: Any,
+    *,
+    whisper_model: Any,
+    transcribe_kwargs: Dict[str, Any],
+    output_format: str,
+    output_dir: str,
+    task: str,
+    replace_map: Optional[str],
+    dry_run_replace: bool,
+    overwrite: bool,
+    skip_existing: bool,
+    on_result: Optional[Callable[[Dict[str, Any]], None]],
+    result_cache: Optional[ResultCache],
+    cache_params: Optional[Dict[str, Any]],
+    metrics: JobMetrics,
+) -> str:
+    """Streaming variant of the transcribe + render steps.
+
+    Segments go through a StreamingReplacer and a writer as each 30-second
+    window is decoded, so output appears during transcription and the full
+    corrected result is only materialized when ``on_result`` needs it. Each
+    file is written as ``<output>.part`` and renamed when complete.
+    """
+    video_id = info_dict.get("id", "unknown")
+    replacer: Optional[StreamingReplacer] = None
+    if replace_map:
+        try:
+            replacer = StreamingReplacer(
+                load_compiled_glossary(replace_map), counts_only=not dry_run_replace
+            )
+        except Exception as e:  # noqa: BLE001
+            logging.warning(f"[replace] Erreur lors du chargement/application du glossaire: {e}")
+
+    segments_stream = SegmentStream(whisper_model, audio, **transcribe_kwargs)
+
+    def _status(elapsed: float) -> str:
+        done, total = segments_stream.seconds_done, segments_stream.duration
+        if not total:
+            return "détection..."
+        rate = f" (x{done / elapsed:.1f} temps réel)" if elapsed > 0 and done else ""
+        return f"{done:.0f}s/{total:.0f}s audio{rate}"
+
+    writer: Optional[MultiWriter] = None
+    paths: Dict[str, str] = {}
+    lang_tag = ""
+    skipped = False
+    final_segments = SegmentStore()
+    # Dry run: events, for the suggestion log; otherwise only counts
+    events: List[ReplaceEvent] = []
+    counts = ReplaceCounts()
+
+    def _emit(batch: List[Dict[str, Any]]) -> None:
+        nonlocal writer, paths, lang_tag, skipped
+        raw = SegmentStore.from_segments(batch)
+        if replacer is not None:
+            released, new_events = replacer.feed(raw) if batch else replacer.flush()
+            if dry_run_replace:
+                events.extend(new_events)
+            else:
+                counts.update(new_events)
+                raw = released
+        if writer is None and not skipped:
+            # The output name needs the language: known before the first segment
+            lang_tag = lang_tag_for(task, segments_stream.language) or "unk"
+            paths = output_paths_for(info_dict, output_dir, lang_tag, output_format)
+            skipped = _check_existing_outputs(paths, overwrite, skip_existing)
+            if not skipped:
+                writer = open_writers(
+                    paths, meta=dict(_output_meta(info_dict), language=segments_stream.language)
                 )
+        if writer is not None:
+            writer.write(raw)
+        if on_result is not None:
+            final_segments.extend(raw)
+
+    t0 = time.monotonic()
+    stop_spinner = _start_spinner(_status)
+    try:
+        # Replacement and writing overlap decoding: all timed as "transcribe"
+        with metrics.stage("transcribe"):
+            for batch in segments_stream.batches():
+                _emit(batch)
+            _emit([])
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    finally:
+        stop_spinner()
+    elapsed = time.monotonic() - t0
+    audio_s = segments_stream.duration
+    rtf = f", x{audio_s / elapsed:.1f} temps réel" if elapsed > 0 and audio_s else ""
+    print(f"Durée de transcription: {_format_elapsed(elapsed)} ({audio_s:.0f}s audio{rtf})")
 
-        if output_format == "txt":
-            content = result["text"]
-        else:  # srt
-            content = generate_srt_content(result)
+    result = segments_stream.result or {}
+    if result_cache is not None and cache_params is not None:
+        result_cache.save(info_dict, cache_params, result)
 
-        # Windows-friendly SRT BOM
-        encoding = (
-            "utf-8-sig" if (output_format == "srt" and platform.system() == "Windows") else "utf-8"
+    if replacer is not None:
+        _report_replacements(events if dry_run_replace else counts, metrics)
+
+    if on_result is not None:
+        on_result(
+            {
+                "text": final_segments.text(),
+                "segments": final_segments.to_segments(),
+                "language": result.get("language", segments_stream.language),
+            }
         )
-        with open(output_path, "w", encoding=encoding) as f:
-            f.write(content)
 
-        print(f"Transcription terminée ! Fichier sauvegardé sous : {output_path}")
+    output_path = next(iter(paths.values()), "")
+    if skipped or writer is None:
+        return output_path
+    writer.close()
+    _record_outputs(output_dir, video_id, paths, lang_tag)
+    return output_path
+
+
+def _report_replacements(
+    events: Union[List[ReplaceEvent], ReplaceCounts], metrics: JobMetrics
+) -> None:
+    """Log, print and record the glossary summary.
+
+    ``events`` is the event list of a dry run (each suggestion is logged) or
+    the ReplaceCounts of applied replacements.
+    """
+    dry_run = not isinstance(events, ReplaceCounts)
+    counts = ReplaceCounts.of(events) if dry_run else events  # type: ignore[arg-type]
+    total, cross = counts.total, counts.cross_boundary
+    metrics.set("replacements", 0 if dry_run else total)
+    metrics.set("cross_boundary_replacements", 0 if dry_run else cross)
+    metrics.set("replace_suggestions", total)
+    if dry_run:
+        logging.info("[replace] DRY RUN: %d suggestions", total)
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            # before/after are rendered on demand: only when they are logged
+            for e in events:  # type: ignore[union-attr]
+                logging.info("[replace] %s: %r -> %r", e.correct_term, e.before, e.after)
+        # Always show summary, even without --verbose
+        print(f"[replace] Suggestions: {total} (cross-boundary: {cross})")
+    elif total:
+        logging.info("[replace] %d remplacements (dont cross-boundary: %d)", total, cross)
+        print(f"[replace] Replacements applied: {total} (cross-boundary: {cross})")
+
+
+def render_result(
+    result: Dict[str, Any],
+    info_dict: Dict[str, Any],
+    *,
+    output_format: str = "srt",
+    output_dir: str = "data",
+    language: Optional[str] = "en",
+    task: str = "transcribe",
+    replace_map: Optional[str] = "SWOOD_Glossary.json",
+    dry_run_replace: bool = False,
+    overwrite: bool = False,
+    skip_existing: bool = False,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    metrics: Optional[JobMetrics] = None,
+) -> str:
+    """Apply the glossary to a Whisper result and write the output files.
+
+    Works on a fresh result or one loaded from the result cache. Every format
+    of ``output_format`` (comma-separated) is written from the same
+    post-glossary segments in one pass. Segments are converted once to a
+    SegmentStore, which the glossary and the writers work on; Whisper dicts
+    are rebuilt only for ``on_result``. Returns the path of the first format.
+    """
+    metrics = metrics if metrics is not None else JobMetrics()
+    video_id = info_dict.get("id", "unknown")
+    lang_tag = lang_tag_for(task, language) or str(result.get("language", "unk")).lower()
+    paths = output_paths_for(info_dict, output_dir, lang_tag, output_format)
+    output_path = next(iter(paths.values()))
+
+    # Existing file behavior: overwrite by default unless --skip-existing is set
+    if _check_existing_outputs(paths, overwrite, skip_existing):
         return output_path
 
+    store = SegmentStore.from_segments(result["segments"])
+    replaced = False
+
+    # Optional post-replacements via glossary
+    if replace_map:
+        try:
+            with metrics.stage("replace"):
+                glossary = load_compiled_glossary(replace_map)
+                new_store, events = apply_glossary_replacements(
+                    store, glossary, counts_only=not dry_run_replace
+                )
+            _report_replacements(events, metrics)
+            if not dry_run_replace:
+                store = new_store
+                replaced = True
+        except Exception as e:  # noqa: BLE001
+            logging.warning(f"[replace] Erreur lors du chargement/application du glossaire: {e}")
+
+    if on_result is not None:
+        if replaced:
+            result["segments"] = store.to_segments()
+            result["text"] = store.text()
+        on_result(result)
+
+    with metrics.stage("write"):
+        writer = open_writers(
+            paths, meta=dict(_output_meta(info_dict), language=result.get("language"))
+        )
+        try:
+            writer.write(store)
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+
+    _record_outputs(output_dir, video_id, paths, lang_tag)
+    return output_path
+
+
+def rerender_cached(
+    entry_path: str,
+    *,
+    output_format: str = "srt",
+    output_dir: str = "data",
+    replace_map: Optional[str] = "SWOOD_Glossary.json",
+    dry_run_replace: bool = False,
+) -> str:
+    """Re-render one result-cache entry (glossary + writer), without Whisper."""
+    entry = read_entry(entry_path)
+    os.makedirs(output_dir, exist_ok=True)
+    return render_result(
+        entry["result"],
+        entry["info"],
+        output_format=output_format,
+        output_dir=output_dir,
+        language=entry["params"].get("language"),
+        task=entry["params"].get("task", "transcribe"),
+        replace_map=replace_map,
+        dry_run_replace=dry_run_replace,
+        overwrite=True,
+    )
+
+
+def remove_temp_audio(audio_path: str) -> None:
+    # Cleanup
+    try:
+        if os.path.exists(audio_path):
+            os.remove(audio_path)
+            print(f"Fichier audio temporaire '{audio_path}' supprimé.")
     except Exception as e:  # noqa: BLE001
-        print(f"Une erreur est survenue pendant la transcription : {e}")
-        raise
-    finally:
-        # Cleanup
+        logging.warning(f"Impossible de supprimer le fichier temporaire: {e}")
+
+
+# transcribe_downloaded options that also select and render a cached result
+CACHED_RESULT_OPTIONS = (
+    "output_format",
+    "vocab_file",
+    "language",
+    "task",
+    "temperature",
+    "condition_on_previous_text",
+    "replace_map",
+    "dry_run_replace",
+    "overwrite",
+    "skip_existing",
+)
+
+
+def render_cached_result(
+    url: str,
+    result_cache: ResultCache,
+    *,
+    model: str = "small",
+    output_format: str = "srt",
+    output_dir: str = "data",
+    vocab_file: Optional[str] = None,
+    language: Optional[str] = "en",
+    task: str = "transcribe",
+    temperature: float = 0.0,
+    condition_on_previous_text: bool = True,
+    replace_map: Optional[str] = "SWOOD_Glossary.json",
+    dry_run_replace: bool = False,
+    overwrite: bool = False,
+    skip_existing: bool = False,
+    cascade_model: Optional[str] = None,
+    backend: str = DEFAULT_BACKEND,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    metrics: Optional[JobMetrics] = None,
+) -> Optional[str]:
+    """Write the outputs of ``url`` from ``result_cache``, before any download.
+
+    The cache key is built from the same parameters as ``transcribe_downloaded``.
+    Returns the output path, or None when the video has no cached result for
+    them (or its id cannot be read from the URL).
+    """
+    metrics = metrics if metrics is not None else JobMetrics()
+    video_id = video_id_from_url(url)
+    if not video_id:
+        return None
+    params = result_cache_params(
+        model=selected_model_name(model),
+        language=None if language and language.lower() == "auto" else language,
+        task=task,
+        temperature=temperature,
+        condition_on_previous_text=condition_on_previous_text,
+        initial_prompt=load_initial_prompt(vocab_file),
+        word_timestamps=needs_word_timestamps(output_format),
+        cascade_model=selected_model_name(cascade_model) if cascade_model else None,
+        backend=backend,
+    )
+    with metrics.stage("result_cache"):
+        entry = result_cache.load(video_id, params)
+    if entry is None:
+        return None
+    print(f"[result-cache] Résultat Whisper réutilisé pour {video_id}")
+    metrics.set("result_cache_hit", True)
+    os.makedirs(output_dir, exist_ok=True)
+    return render_result(
+        entry["result"],
+        entry["info"],
+        output_format=output_format,
+        output_dir=output_dir,
+        language=params["language"],
+        task=task,
+        replace_map=replace_map,
+        dry_run_replace=dry_run_replace,
+        overwrite=overwrite,
+        skip_existing=skip_existing,
+        on_result=on_result,
+        metrics=metrics,
+    )
+
+
+def transcribe_youtube(
+    url: str,
+    *,
+    model: str = "small",
+    output_format: str = "srt",
+    output_dir: str = "data",
+    vocab_file: Optional[str] = None,
+    language: Optional[str] = "en",
+    task: str = "transcribe",
+    audio_format: str = "native",
+    verbose: bool = False,
+    device: str = "cuda",
+    fp16: Optional[bool] = None,
+    temperature: float = 0.0,
+    condition_on_previous_text: bool = True,
+    replace_map: Optional[str] = "SWOOD_Glossary.json",
+    dry_run_replace: bool = False,
+    overwrite: bool = False,
+    skip_existing: bool = False,
+    cookies_file: Optional[str] = None,
+    whisper_model: Any = None,
+    audio_cache_dir: Optional[str] = None,
+    audio_cache_max_gb: float = 10.0,
+    result_cache_dir: Optional[str] = None,
+    stream: bool = False,
+    cpu_workers: int = 0,
+    chunk_seconds: float = 120.0,
+    metrics_jsonl: Optional[str] = None,
+    metrics_prom: Optional[str] = None,
+    session: Optional[DownloadSession] = None,
+    dedupe_audio: bool = False,
+    cascade_model: Optional[str] = None,
+    backend: str = DEFAULT_BACKEND,
+) -> str:
+    """Download audio from YouTube, run Whisper, and write output.
+
+    Returns the output file path on success. Raises SystemExit with
+    distinct codes on fatal precondition failures to keep CLI behavior.
+    Pass an already loaded ``whisper_model`` to skip the model load,
+    ``audio_cache_dir`` to reuse audio downloaded by earlier runs and
+    ``result_cache_dir`` to reuse raw Whisper results (same video, model and
+    decoding parameters) with only the glossary and writer re-run. With
+    ``stream``, the output file is written while Whisper decodes. On CPU,
+    ``cpu_workers > 1`` splits the audio into ``chunk_seconds`` windows
+    transcribed in parallel processes. ``metrics_jsonl``/``metrics_prom``
+    export the job's stage timings and counters (see MetricsSink). A shared
+    ``session`` (DownloadSession) reuses its yt-dlp instances and cookie jar.
+    ``dedupe_audio`` (requires ``result_cache_dir``) reuses the result of a
+    video whose audio contains this one (see FingerprintIndex).
+    ``cascade_model`` transcribes with ``model`` first and re-transcribes only
+    its uncertain regions with ``cascade_model`` (see CascadeTranscriber).
+    ``backend`` selects the inference engine (see ``backends.BACKENDS``).
+    """
+    logging.basicConfig(
+        level=logging.INFO if verbose else logging.WARNING,
+        format="[%(levelname)s] %(message)s",
+    )
+    if cascade_model and stream:
+        # Streamed segments would be written before the strong model revises them
+        logging.warning("--stream ignoré avec --cascade-model")
+        stream = False
+    metrics = JobMetrics(
+        model=selected_model_name(model), backend=backend, video_id=video_id_from_url(url)
+    )
+    status = "error"
+    try:
+        # Skip before any download or model work when the output already exists
+        if skip_existing:
+            with metrics.stage("skip_check"):
+                existing = find_existing_output(
+                    url,
+                    output_dir=output_dir,
+                    output_format=output_format,
+                    language=language,
+                    task=task,
+                    verbose=verbose,
+                    cookies_file=cookies_file,
+                    session=session,
+                )
+            if existing:
+                print(f"Fichier existant détecté, opération ignorée: {existing}")
+                status = "skipped"
+                return existing
+
+        result_cache = ResultCache(result_cache_dir) if result_cache_dir else None
+        video_id = video_id_from_url(url)
+        if result_cache is not None:
+            output_path = render_cached_result(
+                url,
+                result_cache,
+                model=model,
+                output_format=output_format,
+                output_dir=output_dir,
+                vocab_file=vocab_file,
+                language=language,
+                task=task,
+                temperature=temperature,
+                condition_on_previous_text=condition_on_previous_text,
+                replace_map=replace_map,
+                dry_run_replace=dry_run_replace,
+                overwrite=overwrite,
+                skip_existing=skip_existing,
+                cascade_model=cascade_model,
+                backend=backend,
+                metrics=metrics,
+            )
+            if output_path is not None:
+                status = "ok"
+                return output_path
+
+        run_device = backend_device(backend, resolve_device(device))
+        check_ffmpeg()
+
+        # Model load, CUDA init and warm-up run while the audio downloads
+        model_future: Optional[Future] = None
+        if whisper_model is None:
+            model_future = start_model_load(
+                model,
+                run_device,
+                cpu_workers=cpu_workers,
+                chunk_seconds=chunk_seconds,
+                metrics=metrics,
+                cascade_model=cascade_model,
+                cascade_glossary=replace_map,
+                backend=backend,
+            )
+
+        # Prepare output dir
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Download audio into a private workspace: concurrent runs may share output_dir.
+        # Keyed by video id, it keeps a partial download for the next run to resume
+        print(f"Téléchargement de l'audio depuis : {url}")
+        workspace = JobWorkspace(output_dir, key=video_id)
+        temp_stem = workspace.path("audio")
+        temp_audio_file = f"{temp_stem}.{audio_format}"
         try:
-            if os.path.exists(temp_audio_file):
-                os.remove(temp_audio_file)
-                print(f"Fichier audio temporaire '{temp_audio_file}' supprimé.")
+            with metrics.stage("download"):
+                info_dict, temp_audio_file = download_audio(
+                    url,
+                    temp_stem,
+                    audio_format=audio_format,
+                    verbose=verbose,
+                    cookies_file=cookies_file,
+                    output_dir=output_dir,
+                    audio_cache=(
+                        get_audio_cache(audio_cache_dir, audio_cache_max_gb)
+                        if audio_cache_dir
+                        else None
+                    ),
+                    metrics=metrics,
+                    session=session,
+                )
+        except BaseException as e:
+            workspace.release()
+            if model_future is not None:
+                discard_model_load(model_future)
+            if isinstance(e, DownloadError):
+                print("Erreur lors du téléchargement après plusieurs tentatives.")
+                raise SystemExit(3)
+            raise
+
+        # Transcription
+        try:
+            if model_future is not None:
+                with metrics.stage("model_wait"):
+                    whisper_model = model_future.result()
+            output_path = transcribe_downloaded(
+                info_dict,
+                temp_audio_file,
+                whisper_model=whisper_model,
+                model=model,
+                device=run_device,
+                output_format=output_format,
+                output_dir=output_dir,
+                vocab_file=vocab_file,
+                language=language,
+                task=task,
+                fp16=fp16,
+                temperature=temperature,
+                condition_on_previous_text=condition_on_previous_text,
+                replace_map=replace_map,
+                dry_run_replace=dry_run_replace,
+                overwrite=overwrite,
+                skip_existing=skip_existing,
+                result_cache=result_cache,
+                stream=stream,
+                metrics=metrics,
+                fingerprints=(
+                    fingerprint_index_for(result_cache_dir)
+                    if dedupe_audio and result_cache_dir
+                    else None
+                ),
+                cascade_model=cascade_model,
+                backend=backend,
+            )
+            status = "ok"
+            return output_path
         except Exception as e:  # noqa: BLE001
-            logging.warning(f"Impossible de supprimer le fichier temporaire: {e}")
+            print(f"Une erreur est survenue pendant la transcription : {e}")
+            raise
+        finally:
+            if model_future is not None and whisper_model is not None:
+                close_transcriber(whisper_model)
+            remove_temp_audio(temp_audio_file)
+            workspace.cleanup()
+    finally:
+        sink = MetricsSink(metrics_jsonl, metrics_prom)
+        if sink:
+            sink.emit(metrics.record(status))
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .output_index import _OUTPUT_NAME_RE
+from .replace import (
+    DEFAULT_CONTEXT_WINDOW,
+    CompiledGlossary,
+    apply_glossary_replacements,
+    load_compiled_glossary,
+)
+from .segments import SegmentStore
+from .srt import generate_srt_content, parse_srt
+
+STAMPS_FILENAME = ".yt-whisper-glossary-stamps.json"
+RECORRECT_EXTENSIONS = (".srt", ".txt")
+
+_BOM = "\ufeff"
+
+# Per-worker glossary, loaded once by the pool initializer
+_worker_glossary: Optional[CompiledGlossary] = None
+_worker_context_window: Optional[int] = DEFAULT_CONTEXT_WINDOW
+
+
+@dataclass
+class RecorrectResult:
+    path: str
+    status: str  # "changed", "unchanged" or "error"
+    replacements: int = 0
+    error: str = ""
+
+
+def _file_stamp(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _write_atomic(path: str, content: str) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        # newline="": line endings are already those of the original file
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+        # The rewritten file keeps the original's permissions, not the umask's
+        shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def recorrect_file(
+    path: str,
+    glossary: CompiledGlossary,
+    *,
+    context_window: Optional[int] = DEFAULT_CONTEXT_WINDOW,
+    dry_run: bool = False,
+) -> RecorrectResult:
+    """Apply ``glossary`` to an existing SRT or TXT output, rewriting it only if it changes.
+
+    SRT files are parsed back into segments (``parse_srt``), so terms split over
+    cues are corrected like in a live run, and regenerated with
+    ``generate_srt_content``; a TXT file is one segment. The BOM, CRLF line
+    endings and permission bits of the original are kept. The write is atomic
+    (temporary file + ``os.replace``).
+    """
+    try:
+        with open(path, encoding="utf-8", newline="") as f:
+            raw = f.read()
+        bom = raw.startswith(_BOM)
+        content = raw[len(_BOM) :] if bom else raw
+        crlf = "\r\n" in content
+        content = content.replace("\r\n", "\n")
+
+        if path.lower().endswith(".srt"):
+            store = parse_srt(content)
+        else:
+            store = SegmentStore()
+            store.append(0.0, 0.0, content)
+        new_store, counts = apply_glossary_replacements(
+            store, glossary, context_window=context_window, counts_only=True
+        )
+        if new_store.texts == store.texts:
+            return RecorrectResult(path, "unchanged")
+        if dry_run:
+            return RecorrectResult(path, "changed", counts.total)
+
+        if path.lower().endswith(".srt"):
+            new_content = generate_srt_content({"segments": new_store})
+        else:
+            new_content = new_store.texts[0]
+        if crlf:
+            new_content = new_content.replace("\n", "\r\n")
+        _write_atomic(path, (_BOM if bom else "") + new_content)
+        return RecorrectResult(path, "changed", counts.total)
+    except (OSError, ValueError, UnicodeDecodeError) as e:
+        return RecorrectResult(path, "error", error=str(e))
+
+
+def _init_worker(glossary_path: str, context_window: Optional[int]) -> None:
+    global _worker_glossary, _worker_context_window
+    _worker_glossary = load_compiled_glossary(glossary_path)
+    _worker_context_window = context_window
+
+
+def _recorrect_in_worker(path: str, dry_run: bool) -> RecorrectResult:
+    assert _worker_glossary is not None
+    return recorrect_file(
+        path, _worker_glossary, context_window=_worker_context_window, dry_run=dry_run
+    )
+
+
+def iter_outputs(root: str) -> Iterator[str]:
+    """SRT/TXT transcripts under ``root``, skipping hidden entries (job workspaces, indexes).
+
+    Only output names (``<title>-<video id>.<lang>.<ext>``) are matched: a
+    ``cookies.txt`` or a vocabulary file kept in the same directory is never
+    rewritten.
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in sorted(filenames):
+            if (
+                not name.startswith(".")
+                and name.lower().endswith(RECORRECT_EXTENSIONS)
+                and _OUTPUT_NAME_RE.search(name)
+            ):
+                yield os.path.join(dirpath, name)
+
+
+def stamp_key(glossary: CompiledGlossary, context_window: Optional[int]) -> str:
+    """What a correction depends on: the glossary's SHA-256 and the context window."""
+    window = "all" if context_window is None else str(context_window)
+    return f"{glossary.sha256}:w={window}"
+
+
+class GlossaryStamps:
+    """Glossary (``stamp_key``) last applied to each file of a corpus.
+
+    Stored as ``STAMPS_FILENAME`` in the corpus root: relative path ->
+    ``[stamp_key, mtime_ns, size]``. A stamp only holds while the file keeps the
+    size and mtime recorded after correction, so a file rewritten since (new
+    transcription) is corrected again.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self.path = os.path.join(root, STAMPS_FILENAME)
+        self._stamps: Dict[str, List[Any]] = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._stamps = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logging.warning("[recorrect] Tampons illisibles (%s): %s", self.path, e)
+
+    def _key(self, path: str) -> str:
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    def is_current(self, path: str, key: str) -> bool:
+        stamp = self._stamps.get(self._key(path))
+        if not stamp or stamp[0] != key:
+            return False
+        try:
+            return tuple(stamp[1:]) == _file_stamp(path)
+        except OSError:
+            return False
+
+    def mark(self, path: str, key: str) -> None:
+        try:
+            self._stamps[self._key(path)] = [key, *_file_stamp(path)]
+        except OSError:  # removed meanwhile
+            self._stamps.pop(self._key(path), None)
+
+    def save(self) -> None:
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._stamps, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+
+def recorrect_corpus(
+    root: str,
+    glossary_path: str,
+    *,
+    workers: Optional[int] = None,
+    context_window: Optional[int] = DEFAULT_CONTEXT_WINDOW,
+    dry_run: bool = False,
+    force: bool = False,
+) -> Dict[str, int]:
+    """Re-apply a glossary to every SRT/TXT output under ``root`` in a process pool.
+
+    Files already stamped with this glossary's SHA-256 and ``context_window``
+    (see ``stamp_key``) are skipped unless ``force``; each worker loads the
+    compiled glossary once. Stamps are saved at the end, even when interrupted.
+    ``dry_run`` counts the files that would change without writing anything.
+    Returns counts per status plus ``skipped`` and ``replacements``.
+    """
+    glossary = load_compiled_glossary(glossary_path)
+    key = stamp_key(glossary, context_window)
+    stamps = GlossaryStamps(root)
+    todo = []
+    summary = {"changed": 0, "unchanged": 0, "error": 0, "skipped": 0, "replacements": 0}
+    for path in iter_outputs(root):
+        if not force and stamps.is_current(path, key):
+            summary["skipped"] += 1
+        else:
+            todo.append(path)
+    workers = max(1, workers or os.cpu_count() or 1)
+    logging.info("[recorrect] %d fichier(s) à traiter sur %d processus", len(todo), workers)
+    t0 = time.monotonic()
+
+    def _collect(results: Iterator[RecorrectResult]) -> None:
+        for res in results:
+            summary[res.status] += 1
+            summary["replacements"] += res.replacements
+            if res.status == "error":
+                logging.warning("[recorrect] %s: %s", res.path, res.error)
+            elif not dry_run:
+                stamps.mark(res.path, key)
+
+    try:
+        if workers == 1 or len(todo) < 2:
+            _collect(
+                recorrect_file(p, glossary, context_window=context_window, dry_run=dry_run)
+                for p in todo
+            )
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(os.path.abspath(glossary_path), context_window),
+            ) as pool:
+                chunksize = max(1, min(64, len(todo) // (workers * 4)))
+                _collect(
+                    pool.map(_recorrect_in_worker, todo, [dry_run] * len(todo), chunksize=chunksize)
+                )
+    finally:
+        if not dry_run:
+            stamps.save()
+    logging.info("[recorrect] Terminé en %.1fs", time.monotonic() - t0)
+    return summary
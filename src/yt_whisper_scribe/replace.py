@@ -1,69 +1,535 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import logging
+import os
 import re
-from dataclasses import dataclass
+import threading
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
+
+from .segments import SegmentStore
 
 
-@dataclass
 class ReplaceEvent:
-    kind: str  # "segment" or "cross_boundary"
-    segment_index: int
-    next_segment_index: Optional[int]
-    variant: str
-    correct_term: str
-    before: str
-    after: str
+    """One replacement (or dry-run suggestion) of the glossary.
+
+    Events are compact: kind, segment indices (``next_segment_index`` is the
+    last segment of a cross-boundary match), character offsets of the match
+    (``start`` in the first segment, ``end`` in the last one) and the variant
+    id. ``variant``, ``correct_term``, ``before`` and ``after`` are rendered on
+    demand from a log shared by all events of a pass, which references the
+    input texts instead of copying them.
+    """
+
+    __slots__ = (
+        "kind",
+        "segment_index",
+        "next_segment_index",
+        "start",
+        "end",
+        "payload",
+        "_log",
+        "_ref",
+    )
+
+    def __init__(
+        self,
+        kind: str,  # "segment" or "cross_boundary"
+        segment_index: int,
+        next_segment_index: Optional[int],
+        start: int,
+        end: int,
+        payload: int,
+        log: _ReplaceLog,
+        ref: int,
+    ) -> None:
+        self.kind = kind
+        self.segment_index = segment_index
+        self.next_segment_index = next_segment_index
+        self.start = start
+        self.end = end
+        self.payload = payload
+        self._log = log
+        # Segment index (segment events) or cross match index within the log
+        self._ref = ref
+
+    @property
+    def variant(self) -> str:
+        return self._log.table[self.payload].pattern
+
+    @property
+    def correct_term(self) -> str:
+        return self._log.table[self.payload].correct_term
+
+    @property
+    def before(self) -> str:
+        return self._log.render(self)[0]
+
+    @property
+    def after(self) -> str:
+        return self._log.render(self)[1]
+
+    def _key(self) -> Tuple[Any, ...]:
+        return (
+            self.kind,
+            self.segment_index,
+            self.next_segment_index,
+            self.start,
+            self.end,
+            self.variant,
+            self.correct_term,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ReplaceEvent):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __repr__(self) -> str:
+        return (
+            f"ReplaceEvent(kind={self.kind!r}, segment_index={self.segment_index}, "
+            f"next_segment_index={self.next_segment_index}, correct_term={self.correct_term!r})"
+        )
+
 
+@dataclass
+class ReplaceCounts:
+    """Aggregated replacement counts, kept instead of events in ``counts_only`` mode."""
+
+    total: int = 0
+    cross_boundary: int = 0
+    by_term: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, kind: str, correct_term: str) -> None:
+        self.total += 1
+        if kind == "cross_boundary":
+            self.cross_boundary += 1
+        self.by_term[correct_term] = self.by_term.get(correct_term, 0) + 1
+
+    def update(self, other: ReplaceCounts) -> None:
+        self.total += other.total
+        self.cross_boundary += other.cross_boundary
+        for term, n in other.by_term.items():
+            self.by_term[term] = self.by_term.get(term, 0) + n
+
+    @classmethod
+    def of(cls, events: List[ReplaceEvent]) -> ReplaceCounts:
+        counts = cls()
+        for e in events:
+            counts.add(e.kind, e.correct_term)
+        return counts
+
+
+# Tokens are runs of word characters or single punctuation marks; whitespace only
+# separates them. Matching on tokens gives the same word-boundary semantics as the
+# former per-variant ``\b...\b`` regexes without one regex pass per variant.
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+# Trie key holding the payload of a variant ending at this node (never a token)
+_TERMINAL = ""
 
-def _variant_regex(variant: str) -> re.Pattern[str]:
-    # Build a case-insensitive, word-boundary regex; normalize spaces to \s+
+
+def _variant_pattern(variant: str) -> str:
+    # Case-insensitive, word-boundary pattern with spaces normalized to \s+.
+    # Kept as the ``variant`` label of ReplaceEvent for backward compatibility.
     esc = re.escape(variant.strip())
     esc = esc.replace("\\ ", r"\s+")
-    pattern = rf"\b{esc}\b"
-    return re.compile(pattern, flags=re.IGNORECASE)
-
-
-def _apply_within_segment(text: str, pat: re.Pattern[str], replacement: str) -> Tuple[str, int]:
-    def repl(m: re.Match[str]) -> str:
-        return replacement
-
-    new_text, n = pat.subn(repl, text)
-    return new_text, n
-
-
-def _apply_cross_boundary(
-    prev_text: str, next_text: str, pat: re.Pattern[str], replacement: str
-) -> Tuple[str, str, int]:
-    # Examine boundary region
-    tail = prev_text[-40:]
-    head = next_text[:40]
-    bridge = tail + " " + head
-    m = pat.search(bridge)
-    if not m:
-        return prev_text, next_text, 0
-    s, e = m.span()
-    sep_pos = len(tail)
-    # Ensure the match crosses the boundary
-    if not (s < sep_pos and e > sep_pos):
-        return prev_text, next_text, 0
-    # Compute portions in prev and next
-    prev_rel_s = max(0, s - (sep_pos - len(tail)))  # within tail
-    prev_rel_e = min(len(tail), e - (sep_pos - len(tail)))
-    # Map tail slice to absolute indices in prev_text
-    abs_prev_s = max(0, len(prev_text) - len(tail) + prev_rel_s)
-    abs_prev_e = max(0, len(prev_text) - len(tail) + prev_rel_e)
-    # Portion in head/next
-    next_rel_s = max(0, s - (sep_pos + 1))
-    next_rel_e = max(0, e - (sep_pos + 1))
-    abs_next_s = next_rel_s
-    abs_next_e = next_rel_e
-    # Apply: place full replacement in prev, remove overlapped part in next
-    new_prev = prev_text[:abs_prev_s] + replacement + prev_text[abs_prev_e:]
-    new_next = next_text[:abs_next_s] + next_text[abs_next_e:]
-    return new_prev, new_next, 1
+    return rf"\b{esc}\b"
+
+
+def _pattern_text(pattern: str) -> str:
+    """The variant text back from ``_variant_pattern``."""
+    return re.sub(r"\\(.)", r"\1", pattern[2:-2].replace(r"\s+", " "))
+
+
+def _token_keys(text: str) -> List[str]:
+    """Trie keys for ``text``: lowercased tokens, prefixed by a space when
+    separated from the previous token by whitespace."""
+    keys: List[str] = []
+    prev_end = None
+    for m in _TOKEN_RE.finditer(text):
+        tok = m.group().lower()
+        keys.append(" " + tok if prev_end is not None and m.start() > prev_end else tok)
+        prev_end = m.end()
+    return keys
+
+
+@dataclass(frozen=True)
+class _VariantInfo:
+    entry_index: int
+    correct_term: str
+    pattern: str
+
+
+class VariantMatcher:
+    """Token trie over glossary variants.
+
+    ``scan`` walks the text once and returns non-overlapping matches using a
+    leftmost-longest rule: the earliest starting match wins, and among matches
+    starting at the same token the one covering the most tokens wins (e.g.
+    "as wood design" beats "as wood"). Cost is linear in the text length times
+    the longest variant (in tokens), independent of the number of variants.
+    """
+
+    def __init__(self) -> None:
+        self._root: Dict[str, Any] = {}
+        self.max_tokens = 0
+
+    def add(self, variant: str, payload: int) -> bool:
+        keys = _token_keys(variant)
+        if not keys:
+            return False
+        node = self._root
+        for key in keys:
+            node = node.setdefault(key, {})
+        # First registration wins, as the former sequential passes did
+        node.setdefault(_TERMINAL, payload)
+        self.max_tokens = max(self.max_tokens, len(keys))
+        return True
+
+    def scan(self, text: str) -> List[Tuple[int, int, int]]:
+        """Return ``(start, end, payload)`` character spans, in text order.
+
+        Tokens are read lazily into a window of ``max_tokens``: memory stays
+        flat however long the text (a whole transcript) is.
+        """
+        tokens = _TOKEN_RE.finditer(text)
+        window: Deque[Tuple[int, int, str]] = deque()
+        depth = max(self.max_tokens, 1)
+        matches: List[Tuple[int, int, int]] = []
+        while True:
+            for m in tokens:
+                window.append((m.start(), m.end(), m.group().lower()))
+                if len(window) >= depth:
+                    break
+            if not window:
+                return matches
+            node = self._root.get(window[0][2])
+            best: Optional[Tuple[int, int]] = None
+            j = 0
+            n = len(window)
+            while node is not None:
+                payload = node.get(_TERMINAL)
+                if payload is not None:
+                    best = (j, payload)
+                j += 1
+                if j >= n:
+                    break
+                tok = window[j][2]
+                node = node.get(tok if window[j][0] == window[j - 1][1] else " " + tok)
+            if best is None:
+                window.popleft()
+                continue
+            matches.append((window[0][0], window[best[0]][1], best[1]))
+            for _ in range(best[0] + 1):
+                window.popleft()
+
+
+@dataclass
+class CompiledGlossary:
+    """Glossary prepared once for matching.
+
+    Holds the variant trie, the variant table (payload -> term) and the
+    lowercased keyword sets of each entry. Build it with ``compile_glossary``
+    or ``load_compiled_glossary`` and reuse it across transcripts.
+    """
+
+    sha256: str
+    matcher: VariantMatcher
+    variants: List[_VariantInfo]
+    confidence_keywords: List[FrozenSet[str]]
+    anti_keywords: List[FrozenSet[str]]
+    # Derived, not serialized: trie over all keywords (payload = keyword id),
+    # the keyword ids of each entry, and the anti keywords that are words of
+    # the entry's own variants ("this" for "this would")
+    keyword_matcher: VariantMatcher = field(init=False, repr=False)
+    confidence_ids: List[FrozenSet[int]] = field(init=False, repr=False)
+    anti_ids: List[FrozenSet[int]] = field(init=False, repr=False)
+    variant_anti_ids: List[FrozenSet[int]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.keyword_matcher = VariantMatcher()
+        ids: Dict[str, int] = {}
+
+        def _ids(words: FrozenSet[str]) -> FrozenSet[int]:
+            out = set()
+            for w in words:
+                if w not in ids and self.keyword_matcher.add(w, len(ids)):
+                    ids[w] = len(ids)
+                if w in ids:
+                    out.add(ids[w])
+            return frozenset(out)
+
+        self.confidence_ids = [_ids(k) for k in self.confidence_keywords]
+        self.anti_ids = [_ids(k) for k in self.anti_keywords]
+        in_variants: List[set] = [set() for _ in self.anti_ids]
+        for info in self.variants:
+            text = _pattern_text(info.pattern)
+            in_variants[info.entry_index].update(p for _, _, p in self.keyword_matcher.scan(text))
+        self.variant_anti_ids = [
+            frozenset(words & anti) for words, anti in zip(in_variants, self.anti_ids)
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format": _COMPILED_FORMAT,
+            "sha256": self.sha256,
+            "max_tokens": self.matcher.max_tokens,
+            "trie": self.matcher._root,
+            "variants": [[v.entry_index, v.correct_term, v.pattern] for v in self.variants],
+            "confidence_keywords": [sorted(k) for k in self.confidence_keywords],
+            "anti_keywords": [sorted(k) for k in self.anti_keywords],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> CompiledGlossary:
+        matcher = VariantMatcher()
+        matcher._root = data["trie"]
+        matcher.max_tokens = int(data["max_tokens"])
+        return cls(
+            sha256=data["sha256"],
+            matcher=matcher,
+            variants=[_VariantInfo(int(i), c, p) for i, c, p in data["variants"]],
+            confidence_keywords=[frozenset(k) for k in data["confidence_keywords"]],
+            anti_keywords=[frozenset(k) for k in data["anti_keywords"]],
+        )
+
+
+# Bump when the on-disk layout of CompiledGlossary.to_dict changes
+_COMPILED_FORMAT = 1
+
+
+def _keyword_set(words: Optional[List[str]]) -> FrozenSet[str]:
+    return frozenset(w.strip().lower() for w in (words or []) if w and w.strip())
+
+
+def compile_glossary(glossary: Dict[str, Any], sha256: str = "") -> CompiledGlossary:
+    """Normalize variants and build the matcher for a parsed glossary dict."""
+    entries: List[Dict[str, Any]] = glossary.get("glossary", [])
+    matcher = VariantMatcher()
+    table: List[_VariantInfo] = []
+    for entry_index, entry in enumerate(entries):
+        correct = entry.get("correct_term", "")
+        if not correct:
+            continue
+        for v in entry.get("detected_variants", []) or []:
+            if matcher.add(v, len(table)):
+                table.append(_VariantInfo(entry_index, correct, _variant_pattern(v)))
+    return CompiledGlossary(
+        sha256=sha256,
+        matcher=matcher,
+        variants=table,
+        confidence_keywords=[_keyword_set(e.get("confidence_keywords")) for e in entries],
+        anti_keywords=[_keyword_set(e.get("anti_keywords")) for e in entries],
+    )
+
+
+def _render(
+    text: str, matches: List[Tuple[int, int, int]], table: List[_VariantInfo], applied
+) -> str:
+    parts: List[str] = []
+    pos = 0
+    for s, e, p in matches:
+        if p in applied:
+            parts.append(text[pos:s])
+            parts.append(table[p].correct_term)
+            pos = e
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+@dataclass
+class _CrossMatch:
+    first: int  # segment holding the start of the match
+    last: int  # segment holding the end of the match
+    start: int  # offset in segment ``first``
+    end: int  # offset in segment ``last``
+    payload: int
+
+
+class _ReplaceLog:
+    """What ReplaceEvent needs to render ``before``/``after`` lazily: the raw
+    segment texts of the pass (shared, not copied), the within-segment matches
+    of the segments that have some, and the cross-boundary matches in order.
+    Texts are re-derived exactly as ``_replace_in_store`` built them."""
+
+    __slots__ = ("texts", "table", "within", "cross")
+
+    def __init__(
+        self,
+        texts: List[str],
+        table: List[_VariantInfo],
+        within: Dict[int, List[Tuple[int, int, int]]],
+        cross: List[_CrossMatch],
+    ) -> None:
+        self.texts = texts
+        self.table = table
+        self.within = within
+        self.cross = cross
+
+    def _pass1(self, idx: int, below: Optional[int] = None) -> str:
+        # Segment text after its within-segment replacements (of payloads < below)
+        matches = self.within.get(idx)
+        if not matches:
+            return self.texts[idx]
+        applied = {p for _, _, p in matches if below is None or p < below}
+        return _render(self.texts[idx], matches, self.table, applied)
+
+    def render(self, event: ReplaceEvent) -> Tuple[str, str]:
+        if event.kind == "segment":
+            # Variants apply one after the other, in glossary order
+            idx, p = event._ref, event.payload
+            return self._pass1(idx, p), self._pass1(idx, p + 1)
+        k = event._ref
+        cm = self.cross[k]
+        first = self._pass1(cm.first)
+        if k > 0 and self.cross[k - 1].last == cm.first:
+            first = first[self.cross[k - 1].end :]
+        start = cm.start + len(first) - len(self.texts[cm.first])
+        middle = range(cm.first + 1, cm.last)
+        last = self._pass1(cm.last)
+        before = [first, *(self._pass1(i) for i in middle), last]
+        after = [first[:start] + self.table[cm.payload].correct_term, *("" for _ in middle)]
+        after.append(last[cm.end :])
+        return " | ".join(before), " | ".join(after)
+
+
+# Separator between segments in the continuous buffer: whitespace, so a term split
+# over segments matches like a term split over words
+_SEGMENT_SEP = " "
+
+
+# Segments on each side of a match whose keywords decide whether it applies
+DEFAULT_CONTEXT_WINDOW = 1
+
+
+class _ContextGate:
+    """Accept or reject matches from the ``confidence_keywords`` and
+    ``anti_keywords`` of their entry found around them.
+
+    A match is rejected only when more distinct anti keywords than confidence
+    keywords of its entry occur in the segments ``[first - window, last +
+    window]``: without evidence either way, it is applied. An anti keyword
+    inside the matched text itself ("this" in "this would") counts against
+    it; a confidence keyword inside it does not count for it. An anti keyword
+    that is a word of one of the entry's variants ("this", "as") only guards
+    those variants: it counts inside the match, never around it ("this s
+    wood" is corrected, "this would" is not).
+    A match already spelled like its term (case aside) is always applied.
+    Keyword occurrences are indexed per segment
+    (segment -> keyword ids), only for segments inside some window and at most
+    once each; the window counts are updated incrementally as matches arrive in
+    transcript order, so each decision costs O(keywords of the entry) whatever
+    the transcript size.
+    ``left_context`` holds raw texts preceding ``texts`` (already released by
+    StreamingReplacer), counted but never matched.
+    """
+
+    def __init__(
+        self,
+        compiled: CompiledGlossary,
+        texts: List[str],
+        window: int,
+        left_context: Sequence[str] = (),
+    ) -> None:
+        self.compiled = compiled
+        self.window = window
+        self._texts = texts
+        self._left_context = left_context
+        self._index: Dict[int, List[int]] = {}
+        self._counts: Dict[int, int] = {}
+        # Current window: segments [_lo, _hi)
+        self._lo = self._hi = -len(left_context)
+        self.rejected = 0
+
+    def _keywords(self, seg: int) -> List[int]:
+        hits = self._index.get(seg)
+        if hits is None:
+            if seg < 0:
+                text = self._left_context[seg] if -seg <= len(self._left_context) else ""
+            else:
+                text = self._texts[seg] if seg < len(self._texts) else ""
+            hits = [p for _, _, p in self.compiled.keyword_matcher.scan(text)] if text else []
+            self._index[seg] = hits
+        return hits
+
+    def _shift(self, seg: int, sign: int) -> None:
+        for k in self._keywords(seg):
+            self._counts[k] = self._counts.get(k, 0) + sign
+
+    def accept(self, first: int, last: int, payload: int, matched: str) -> bool:
+        info = self.compiled.variants[payload]
+        conf = self.compiled.confidence_ids[info.entry_index]
+        anti = self.compiled.anti_ids[info.entry_index]
+        if not anti or " ".join(matched.split()).lower() == info.correct_term.lower():
+            return True
+        # Matches come in transcript order: both window bounds only move forward
+        lo = max(first - self.window, -len(self._left_context))
+        hi = last + self.window + 1
+        if lo >= self._hi:
+            # Disjoint from the previous window: skip the segments in between
+            self._counts.clear()
+            self._lo = self._hi = lo
+        while self._hi < hi:
+            self._shift(self._hi, 1)
+            self._hi += 1
+        while self._lo < lo:
+            self._shift(self._lo, -1)
+            self._lo += 1
+        own: Dict[int, int] = {}
+        for _, _, k in self.compiled.keyword_matcher.scan(matched):
+            own[k] = own.get(k, 0) + 1
+        counts = self._counts
+
+        in_variants = self.compiled.variant_anti_ids[info.entry_index]
+        conf_hits = sum(1 for k in conf if counts.get(k, 0) > own.get(k, 0))
+        anti_hits = sum(
+            1 for k in anti if own.get(k, 0) or (k not in in_variants and counts.get(k, 0) > 0)
+        )
+        if anti_hits <= conf_hits:
+            return True
+        self.rejected += 1
+        logging.debug("[replace] Ignoré (contexte): %r -> %s", matched, info.correct_term)
+        return False
+
+
+def _scan_transcript(
+    texts: List[str], matcher: VariantMatcher, gate: Optional[_ContextGate] = None
+) -> Tuple[List[List[Tuple[int, int, int]]], List[_CrossMatch]]:
+    """Scan all segments as one text buffer and map matches back to segments.
+
+    Returns within-segment matches (local offsets) per segment, and matches
+    spanning two or more segments. ``offsets[i]`` is where segment ``i`` starts in
+    the buffer; matches come out in buffer order, so one forward walk over the
+    index maps them all. Matches refused by ``gate`` are dropped.
+    """
+    buffer = _SEGMENT_SEP.join(texts)
+    offsets: List[int] = []
+    pos = 0
+    for t in texts:
+        offsets.append(pos)
+        pos += len(t) + len(_SEGMENT_SEP)
+
+    within: List[List[Tuple[int, int, int]]] = [[] for _ in texts]
+    cross: List[_CrossMatch] = []
+    seg = 0
+    n = len(texts)
+    for s, e, p in matcher.scan(buffer):
+        while seg + 1 < n and offsets[seg + 1] <= s:
+            seg += 1
+        last = seg
+        while last + 1 < n and offsets[last + 1] < e:
+            last += 1
+        if gate is not None and not gate.accept(seg, last, p, buffer[s:e]):
+            continue
+        if last == seg:
+            within[seg].append((s - offsets[seg], e - offsets[seg], p))
+        else:
+            cross.append(_CrossMatch(seg, last, s - offsets[seg], e - offsets[last], p))
+    return within, cross
 
 
 def load_glossary(path: str | Path) -> Dict[str, Any]:
@@ -71,78 +537,257 @@ def load_glossary(path: str | Path) -> Dict[str, Any]:
         return json.load(f)
 
 
-def apply_glossary_replacements(
-    segments: List[Dict[str, Any]],
-    glossary: Dict[str, Any],
-) -> Tuple[List[Dict[str, Any]], List[ReplaceEvent]]:
-    entries: List[Dict[str, Any]] = glossary.get("glossary", [])
+# In-process cache: absolute glossary path -> ((mtime_ns, size), compiled)
+_compiled_cache: Dict[str, Tuple[Tuple[int, int], CompiledGlossary]] = {}
+_compiled_cache_lock = threading.Lock()
+
+
+def compiled_cache_path(path: str | Path) -> Path:
+    """On-disk artifact next to the glossary: ``X.json`` -> ``X.compiled.json``."""
+    p = Path(path)
+    return p.with_name(p.stem + ".compiled.json")
+
+
+def _read_compiled_artifact(cache_path: Path, digest: str) -> Optional[CompiledGlossary]:
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") != _COMPILED_FORMAT or data.get("sha256") != digest:
+            return None
+        return CompiledGlossary.from_dict(data)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_compiled_artifact(cache_path: Path, compiled: CompiledGlossary) -> None:
+    tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(compiled.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, cache_path)
+    except OSError as e:
+        # Read-only share: the in-memory cache still applies
+        logging.info("[replace] Cache glossaire non écrit (%s): %s", cache_path, e)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def load_compiled_glossary(path: str | Path, *, disk_cache: bool = True) -> CompiledGlossary:
+    """Load a glossary JSON as a CompiledGlossary, compiling at most once per content.
+
+    The result is cached in memory (revalidated by mtime/size, then by content
+    hash) and, when ``disk_cache`` is set, in ``compiled_cache_path(path)``
+    keyed by the SHA-256 of the glossary bytes.
+    """
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _compiled_cache_lock:
+        cached = _compiled_cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    with open(key, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    compiled: Optional[CompiledGlossary] = None
+    if cached is not None and cached[1].sha256 == digest:
+        compiled = cached[1]
+    cache_path = compiled_cache_path(key)
+    if compiled is None and disk_cache:
+        compiled = _read_compiled_artifact(cache_path, digest)
+    if compiled is None:
+        compiled = compile_glossary(json.loads(raw.decode("utf-8")), sha256=digest)
+        logging.info("[replace] Glossaire compilé: %s (%d variantes)", path, len(compiled.variants))
+        if disk_cache:
+            _write_compiled_artifact(cache_path, compiled)
+    with _compiled_cache_lock:
+        _compiled_cache[key] = (stamp, compiled)
+    return compiled
+
+
+def _replace_in_store(
+    store: SegmentStore,
+    compiled: CompiledGlossary,
+    context_window: Optional[int] = DEFAULT_CONTEXT_WINDOW,
+    left_context: Sequence[str] = (),
+    counts: Optional[ReplaceCounts] = None,
+) -> Tuple[SegmentStore, List[ReplaceEvent]]:
+    """Replace in a copy of ``store``; events are only built when ``counts`` is None."""
+    matcher, table = compiled.matcher, compiled.variants
     events: List[ReplaceEvent] = []
 
-    # Prepare regexes per entry
-    compiled: List[Tuple[str, List[re.Pattern[str]]]] = []
-    for entry in entries:
-        correct = entry.get("correct_term", "")
-        variants = entry.get("detected_variants", []) or []
-        pats: List[re.Pattern[str]] = []
-        for v in variants:
-            try:
-                pats.append(_variant_regex(v))
-            except re.error:
+    # Work on a copy; only ``out.texts`` is modified
+    out = store.copy()
+    texts = store.texts
+    new_texts = out.texts
+    gate = (
+        _ContextGate(compiled, texts, context_window, left_context)
+        if context_window is not None
+        else None
+    )
+    within, cross = _scan_transcript(texts, matcher, gate)
+    if gate is not None and gate.rejected:
+        logging.info(
+            "[replace] %d correspondance(s) ignorée(s) (mots-clés de contexte)", gate.rejected
+        )
+    log = None
+    if counts is None:
+        log = _ReplaceLog(texts, table, {i: m for i, m in enumerate(within) if m}, cross)
+
+    # Pass 1: within-segment replacements, one event per variant hit in glossary
+    # order, as the former per-variant passes
+    for idx, matches in enumerate(within):
+        if not matches:
+            continue
+        new_texts[idx] = _render(texts[idx], matches, table, {m[2] for m in matches})
+        firsts: Dict[int, Tuple[int, int, int]] = {}
+        for m in matches:
+            firsts.setdefault(m[2], m)
+        for p in sorted(firsts):
+            if log is None:
+                counts.add("segment", table[p].correct_term)  # type: ignore[union-attr]
                 continue
-        if correct and pats:
-            compiled.append((correct, pats))
-
-    # Work on a copy
-    new_segments = [
-        {"start": seg["start"], "end": seg["end"], "text": (seg.get("text") or "")}
-        for seg in segments
-    ]
-
-    # Pass 1: within-segment replacements
-    for idx, seg in enumerate(new_segments):
-        text = seg["text"]
-        for correct, pats in compiled:
-            for pat in pats:
-                new_text, n = _apply_within_segment(text, pat, correct)
-                if n > 0:
-                    events.append(
-                        ReplaceEvent(
-                            kind="segment",
-                            segment_index=idx,
-                            next_segment_index=None,
-                            variant=pat.pattern,
-                            correct_term=correct,
-                            before=text,
-                            after=new_text,
-                        )
-                    )
-                    text = new_text
-        seg["text"] = text
-
-    # Pass 2: cross-boundary replacements (adjacent segments only)
-    for i in range(len(new_segments) - 1):
-        left = new_segments[i]["text"]
-        right = new_segments[i + 1]["text"]
-        changed = False
-        for correct, pats in compiled:
-            for pat in pats:
-                new_left, new_right, n = _apply_cross_boundary(left, right, pat, correct)
-                if n > 0:
-                    events.append(
-                        ReplaceEvent(
-                            kind="cross_boundary",
-                            segment_index=i,
-                            next_segment_index=i + 1,
-                            variant=pat.pattern,
-                            correct_term=correct,
-                            before=left + " | " + right,
-                            after=new_left + " | " + new_right,
-                        )
-                    )
-                    left, right = new_left, new_right
-                    changed = True
-        if changed:
-            new_segments[i]["text"] = left
-            new_segments[i + 1]["text"] = right
-
-    return new_segments, events
+            s, e, _ = firsts[p]
+            events.append(ReplaceEvent("segment", idx, None, s, e, p, log, idx))
+
+    # Pass 2: cross-boundary replacements, spanning any number of segments. A
+    # cross match is the last match of its first segment and the first of its last
+    # one, so only its start offset moves with the pass 1 edits.
+    for k, cm in enumerate(cross):
+        start = cm.start + len(new_texts[cm.first]) - len(texts[cm.first])
+        # Place full replacement in the first segment, remove overlapped parts after
+        new_texts[cm.first] = new_texts[cm.first][:start] + table[cm.payload].correct_term
+        for i in range(cm.first + 1, cm.last):
+            new_texts[i] = ""
+        new_texts[cm.last] = new_texts[cm.last][cm.end :]
+        if log is None:
+            counts.add("cross_boundary", table[cm.payload].correct_term)  # type: ignore[union-attr]
+            continue
+        events.append(
+            ReplaceEvent("cross_boundary", cm.first, cm.last, cm.start, cm.end, cm.payload, log, k)
+        )
+
+    return out, events
+
+
+def apply_glossary_replacements(
+    segments: Union[List[Dict[str, Any]], SegmentStore],
+    glossary: Union[Dict[str, Any], CompiledGlossary],
+    *,
+    context_window: Optional[int] = DEFAULT_CONTEXT_WINDOW,
+    counts_only: bool = False,
+) -> Tuple[Any, Any]:
+    """Apply the glossary to a transcript; returns ``(new_segments, events)``.
+
+    ``segments`` is a list of Whisper segment dicts, or a SegmentStore; the
+    result has the same type. Dicts come back as ``{"start", "end", "text"}``
+    (plus ``words`` when present). Matches are gated by the entry keywords
+    within ``context_window`` segments (see ``_ContextGate``); ``None``
+    replaces every match. With ``counts_only``, a ReplaceCounts is returned
+    instead of the event list.
+    """
+    compiled = glossary if isinstance(glossary, CompiledGlossary) else compile_glossary(glossary)
+    counts = ReplaceCounts() if counts_only else None
+    store = segments if isinstance(segments, SegmentStore) else SegmentStore.from_segments(segments)
+    out, events = _replace_in_store(store, compiled, context_window, counts=counts)
+    new_segments = out if isinstance(segments, SegmentStore) else out.to_segments()
+    return new_segments, (counts if counts is not None else events)
+
+
+class StreamingReplacer:
+    """Apply a glossary to segments arriving in order, e.g. while Whisper decodes.
+
+    ``feed`` returns the segments that can no longer change, with their events;
+    ``flush`` returns the rest once the transcript is complete. The output is the
+    same as ``apply_glossary_replacements`` on the whole transcript: a segment is
+    released only when enough tokens follow it for any variant starting in it to
+    be decided, and never in the middle of a cross-boundary match, even one the
+    context gate rejects for now. Segments are
+    released as a SegmentStore when fed one, as dicts otherwise.
+
+    For keyword gating, ``context_window`` segments are held after the cut and
+    the raw texts of the last ``context_window`` released ones are kept as
+    left context. With ``counts_only``, each call returns a ReplaceCounts of
+    the released segments instead of their events.
+    """
+
+    def __init__(
+        self,
+        glossary: Union[Dict[str, Any], CompiledGlossary],
+        *,
+        context_window: Optional[int] = DEFAULT_CONTEXT_WINDOW,
+        counts_only: bool = False,
+    ) -> None:
+        self.compiled = (
+            glossary if isinstance(glossary, CompiledGlossary) else compile_glossary(glossary)
+        )
+        self.context_window = context_window
+        self.counts_only = counts_only
+        self._context: List[str] = []
+        self._pending = SegmentStore()
+        self._as_store = False
+        # Transcript index of _pending[0]
+        self._base = 0
+
+    def feed(self, segments: Union[List[Dict[str, Any]], SegmentStore]) -> Tuple[Any, Any]:
+        self._as_store = isinstance(segments, SegmentStore)
+        if self._as_store:
+            self._pending.extend(segments)  # type: ignore[arg-type]
+        else:
+            self._pending.extend(SegmentStore.from_segments(segments))
+        return self._release(final=False)
+
+    def flush(self) -> Tuple[Any, Any]:
+        return self._release(final=True)
+
+    def _release(self, final: bool) -> Tuple[Any, Any]:
+        pending = self._pending
+        if not pending:
+            empty = SegmentStore() if self._as_store else []
+            return empty, (ReplaceCounts() if self.counts_only else [])
+        new_store, events = _replace_in_store(
+            pending, self.compiled, self.context_window, self._context
+        )
+        cut = len(pending)
+        window = self.context_window or 0
+        if not final:
+            # Spans of every candidate, gated or not: a match rejected for lack
+            # of right context may be accepted once it arrives, so no cut may
+            # split it either
+            _, candidates = _scan_transcript(pending.texts, self.compiled.matcher)
+            spanned = set()
+            for cm in candidates:
+                spanned.update(range(cm.first + 1, cm.last + 1))
+            # Hold the shortest suffix long enough for the longest variant to
+            # complete: a variant has at most max_tokens tokens
+            need = max(self.compiled.matcher.max_tokens - 1, 0)
+            held = 0
+            cut = 0
+            for c in range(len(pending), 0, -1):
+                if c < len(pending):
+                    held += len(_TOKEN_RE.findall(pending.texts[c]))
+                if held >= need and len(pending) - c >= window and c not in spanned:
+                    cut = c
+                    break
+        released = new_store.slice(0, cut)
+        released_events = []
+        for e in events:
+            last = e.next_segment_index if e.next_segment_index is not None else e.segment_index
+            if last < cut:
+                e.segment_index += self._base
+                if e.next_segment_index is not None:
+                    e.next_segment_index += self._base
+                released_events.append(e)
+        # Held segments stay raw: they are re-matched with the next ones
+        if window:
+            self._context = (self._context + pending.texts[max(0, cut - window) : cut])[-window:]
+        self._pending = pending.slice(cut, len(pending))
+        self._base += cut
+        out = released if self._as_store else released.to_segments()
+        if self.counts_only:
+            # Events of the pending window are short-lived: aggregate the released ones
+            return out, ReplaceCounts.of(released_events)
+        return out, released_events
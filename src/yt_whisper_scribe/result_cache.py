@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import uuid
+from typing import Any, Dict, Iterator, List, Optional
+
+# Per-segment fields worth keeping: timings, text and the decoder's quality signals.
+# Whisper's token ids are dropped; they are large and never used after decoding.
+SEGMENT_KEYS = (
+    "id",
+    "start",
+    "end",
+    "text",
+    "temperature",
+    "avg_logprob",
+    "compression_ratio",
+    "no_speech_prob",
+    "words",
+)
+_INFO_KEYS = ("id", "title", "duration", "webpage_url")
+
+
+def result_cache_params(
+    *,
+    model: str,
+    language: Optional[str],
+    task: str,
+    temperature: float,
+    condition_on_previous_text: bool,
+    initial_prompt: Optional[str],
+    word_timestamps: bool = False,
+    cascade_model: Optional[str] = None,
+    backend: str = "whisper",
+) -> Dict[str, Any]:
+    """Parameters that determine the raw Whisper output of a video."""
+    params = {
+        "model": model,
+        "language": language,
+        "task": task,
+        "temperature": temperature,
+        "condition_on_previous_text": condition_on_previous_text,
+        "prompt_sha256": hashlib.sha256((initial_prompt or "").encode("utf-8")).hexdigest(),
+    }
+    # Only present when set, so entries cached without word timings keep their key
+    if word_timestamps:
+        params["word_timestamps"] = True
+    if cascade_model:
+        params["cascade_model"] = cascade_model
+    if backend != "whisper":
+        params["backend"] = backend
+    return params
+
+
+def _params_digest(params: Dict[str, Any]) -> str:
+    raw = json.dumps(params, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:32]
+
+
+def compact_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "text": result.get("text", ""),
+        "language": result.get("language"),
+        "segments": [
+            {k: seg[k] for k in SEGMENT_KEYS if k in seg} for seg in result.get("segments", [])
+        ],
+    }
+
+
+class ResultCache:
+    """Raw Whisper results on disk, one compact JSON file per (video, parameters).
+
+    Layout: ``<root>/<video_id>/<digest>.json`` where the digest covers the
+    model, language, task, temperature, condition_on_previous_text and prompt
+    hash. Each file holds ``{"info", "params", "result"}`` so it can be
+    re-rendered (glossary, output format) without the audio or the model.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def path(self, video_id: str, params: Dict[str, Any]) -> str:
+        return os.path.join(self.root, video_id, f"{_params_digest(params)}.json")
+
+    def load(self, video_id: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the cached entry, or None (missing or unreadable)."""
+        path = self.path(video_id, params)
+        try:
+            entry = read_entry(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning("[result-cache] Entrée illisible %s: %s", path, e)
+            return None
+        logging.info("[result-cache] hit %s (%s)", video_id, params["model"])
+        return entry
+
+    def save(
+        self, info_dict: Dict[str, Any], params: Dict[str, Any], result: Dict[str, Any]
+    ) -> Optional[str]:
+        video_id = info_dict.get("id")
+        if not video_id:
+            return None
+        path = self.path(video_id, params)
+        entry = {
+            "info": {k: info_dict[k] for k in _INFO_KEYS if k in info_dict},
+            "params": params,
+            "result": compact_result(result),
+        }
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError as e:
+            logging.warning("[result-cache] Écriture impossible %s: %s", path, e)
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return None
+        return path
+
+    def entries(self, video_ids: Optional[List[str]] = None) -> Iterator[str]:
+        """Paths of cached entries, optionally restricted to some video ids."""
+        try:
+            dirs = sorted(video_ids) if video_ids else sorted(os.listdir(self.root))
+        except OSError:
+            return
+        for video_id in dirs:
+            vdir = os.path.join(self.root, video_id)
+            try:
+                names = sorted(os.listdir(vdir))
+            except OSError:
+                continue
+            for name in names:
+                if name.endswith(".json"):
+                    yield os.path.join(vdir, name)
+
+
+def read_entry(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
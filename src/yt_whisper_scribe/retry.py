@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+# Errors a retry cannot fix: the video itself is unavailable
+PERMANENT_ERROR_MARKERS = (
+    "video unavailable",
+    "private video",
+    "has been removed",
+    "members-only",
+    "not available in your country",
+    "unsupported url",
+)
+
+
+def is_permanent_error(error: BaseException) -> bool:
+    message = str(error).lower()
+    return any(marker in message for marker in PERMANENT_ERROR_MARKERS)
+
+
+def backoff_delay(attempt: int, *, base: float = 2.0, cap: float = 60.0) -> float:
+    """Delay before retry ``attempt + 1``: exponential, capped, with jitter.
+
+    Half of the delay is fixed and half random ("equal jitter"), so parallel
+    jobs failing together do not retry in lockstep.
+    """
+    delay = min(cap, base * (2**attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def host_key(url: str) -> str:
+    """Host a URL is downloaded from; YouTube's aliases share one key."""
+    try:
+        host = (urlparse(url.strip()).hostname or "").lower()
+    except ValueError:
+        return ""
+    for prefix in ("www.", "m.", "music."):
+        if host.startswith(prefix):
+            host = host[len(prefix) :]
+    if host in ("youtu.be", "youtube-nocookie.com"):
+        return "youtube.com"
+    return host
+
+
+@dataclass
+class _HostState:
+    failures: int = 0
+    cooldown: float = 0.0
+    open_until: Optional[float] = None
+    # Thread running the trial attempt of an open circuit
+    trial: Optional[int] = None
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker shared by the download jobs of a process.
+
+    After ``threshold`` consecutive failed attempts against a host, the circuit
+    opens: jobs wait ``cooldown`` seconds instead of hitting a host that is
+    likely rate-limiting us. Then a single trial attempt goes through; success
+    closes the circuit, failure reopens it with twice the cooldown (up to
+    ``max_cooldown``). A trial that ends without an outcome must be handed
+    back with ``release_trial``.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: int = 5,
+        cooldown: float = 60.0,
+        max_cooldown: float = 900.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._clock = clock
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def wait_time(self, host: str) -> float:
+        """Seconds to wait before calling ``host``; 0 means go (possibly as the trial)."""
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or state.open_until is None:
+                return 0.0
+            remaining = state.open_until - self._clock()
+            if remaining > 0:
+                return remaining
+            if state.trial is not None:
+                # Another job runs the trial attempt: poll for its outcome
+                return 1.0
+            state.trial = threading.get_ident()
+            return 0.0
+
+    def release_trial(self, host: str) -> None:
+        """Give up the calling thread's trial, if any, without an outcome.
+
+        The next ``wait_time`` caller becomes the trial; otherwise the other
+        jobs would poll for an outcome that never comes.
+        """
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is not None and state.trial == threading.get_ident():
+                state.trial = None
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            if self._hosts.pop(host, None) is not None:
+                logging.info("[circuit] %s: circuit refermé", host)
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            state = self._hosts.setdefault(host, _HostState())
+            state.failures += 1
+            if state.trial is None and (
+                state.open_until is not None or state.failures < self.threshold
+            ):
+                return
+            state.cooldown = (
+                min(self.max_cooldown, state.cooldown * 2) if state.cooldown else self.cooldown
+            )
+            state.open_until = self._clock() + state.cooldown
+            state.trial = None
+            logging.warning(
+                "[circuit] %s: %d échecs consécutifs, pause de %.0fs",
+                host,
+                state.failures,
+                state.cooldown,
+            )
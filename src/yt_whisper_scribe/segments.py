@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+# (start, end, text, words)
+SegmentRow = Tuple[float, float, str, Optional[List[Dict[str, Any]]]]
+
+
+class SegmentStore:
+    """Columnar transcript: parallel ``array('d')`` start/end times and a text list.
+
+    Whisper segments are dicts carrying tokens, log-probabilities and more;
+    a multi-hour transcript is hundreds of thousands of them. The store keeps
+    only what the glossary and the writers use: 16 bytes of timings per
+    segment, the text, and the word timings of the segments that have them
+    (every segment when word timestamps are requested, e.g. for the json
+    output; those lists stay Whisper's dicts and dominate the memory then).
+    Conversion from/to Whisper dicts happens at the edges (``from_segments`` /
+    ``to_segments``).
+    """
+
+    __slots__ = ("starts", "ends", "texts", "words")
+
+    def __init__(self) -> None:
+        self.starts = array("d")
+        self.ends = array("d")
+        self.texts: List[str] = []
+        # Segment index -> word timings (only segments that have any)
+        self.words: Dict[int, List[Dict[str, Any]]] = {}
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Mapping[str, Any]]) -> SegmentStore:
+        store = cls()
+        for seg in segments:
+            store.append(seg["start"], seg["end"], seg.get("text") or "", seg.get("words"))
+        return store
+
+    def append(
+        self,
+        start: float,
+        end: float,
+        text: str,
+        words: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        if words:
+            self.words[len(self.texts)] = words
+        self.starts.append(start)
+        self.ends.append(end)
+        self.texts.append(text)
+
+    def extend(self, other: SegmentStore) -> None:
+        base = len(self.texts)
+        self.starts.extend(other.starts)
+        self.ends.extend(other.ends)
+        self.texts.extend(other.texts)
+        for i, words in other.words.items():
+            self.words[base + i] = words
+
+    def copy(self) -> SegmentStore:
+        return self.slice(0, len(self.texts))
+
+    def slice(self, lo: int, hi: int) -> SegmentStore:
+        out = SegmentStore()
+        out.starts = self.starts[lo:hi]
+        out.ends = self.ends[lo:hi]
+        out.texts = self.texts[lo:hi]
+        out.words = {i - lo: w for i, w in self.words.items() if lo <= i < hi}
+        return out
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def rows(self) -> Iterator[SegmentRow]:
+        words = self.words
+        for i, (start, end, text) in enumerate(zip(self.starts, self.ends, self.texts)):
+            yield start, end, text, words.get(i)
+
+    def text(self) -> str:
+        """Full transcript text, segments stripped and joined by spaces."""
+        return " ".join(t.strip() for t in self.texts).strip()
+
+    def to_segments(self) -> List[Dict[str, Any]]:
+        """Whisper-like ``{"start", "end", "text"[, "words"]}`` dicts."""
+        out = []
+        for start, end, text, words in self.rows():
+            seg: Dict[str, Any] = {"start": start, "end": end, "text": text}
+            if words is not None:
+                seg["words"] = words
+            out.append(seg)
+        return out
@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .audio import decode_pcm
+from .audio_cache import get_audio_cache
+from .backends import DEFAULT_BACKEND, backend_device
+from .download import DownloadError, download_audio
+from .output_index import video_id_from_url
+from .pipeline import (
+    CACHED_RESULT_OPTIONS,
+    check_ffmpeg,
+    find_existing_output,
+    load_whisper_model,
+    remove_temp_audio,
+    render_cached_result,
+    resolve_device,
+    selected_model_name,
+    transcribe_downloaded,
+)
+from .result_cache import ResultCache
+from .session import DownloadSession
+from .workspace import JobWorkspace
+from .writers import output_formats, read_output_segments
+
+# Job fields a client may set; anything else is rejected
+JOB_OPTIONS = (
+    "output_format",
+    "vocab_file",
+    "language",
+    "task",
+    "fp16",
+    "temperature",
+    "condition_on_previous_text",
+    "replace_map",
+    "dry_run_replace",
+    "overwrite",
+    "skip_existing",
+    "stream",
+)
+
+
+class JobError(ValueError):
+    """Raised for an invalid job request (reported to the client as HTTP 400)."""
+
+
+class ModelPool:
+    """Whisper models kept resident, loaded once and shared across jobs.
+
+    Each model has its own lock: one transcription per model at a time, while
+    downloads of other jobs proceed concurrently. With ``allowed``, any other
+    model is refused (JobError) instead of being loaded on a client's request.
+    """
+
+    def __init__(
+        self,
+        device: str,
+        backend: str = DEFAULT_BACKEND,
+        allowed: Optional[Iterable[str]] = None,
+    ) -> None:
+        self.device = device
+        self.backend = backend
+        self.allowed = (
+            None if allowed is None else frozenset(selected_model_name(m) for m in allowed)
+        )
+        self._models: Dict[str, Tuple[Any, threading.Lock]] = {}
+        self._lock = threading.Lock()
+
+    def check(self, model: str) -> str:
+        """Resolved name of ``model``; JobError if it is not served."""
+        name = selected_model_name(model)
+        if self.allowed is not None and name not in self.allowed:
+            raise JobError(
+                f"modèle non disponible: {model} (servis: {', '.join(sorted(self.allowed))})"
+            )
+        return name
+
+    def get(self, model: str) -> Tuple[Any, threading.Lock]:
+        name = self.check(model)
+        with self._lock:
+            if name not in self._models:
+                self._models[name] = (
+                    load_whisper_model(name, self.device, warm_up=True, backend=self.backend),
+                    threading.Lock(),
+                )
+            return self._models[name]
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._models)
+
+
+class TranscriptionService:
+    """Runs transcription jobs against a ModelPool with server-side defaults.
+
+    The glossary needs no explicit reload: ``load_compiled_glossary`` revalidates
+    the file on every job and recompiles only when its content changed.
+    """
+
+    def __init__(
+        self,
+        *,
+        models: List[str],
+        device: str = "cuda",
+        backend: str = DEFAULT_BACKEND,
+        output_dir: str = "data",
+        audio_format: str = "native",
+        cookies_file: Optional[str] = None,
+        verbose: bool = False,
+        audio_cache_dir: Optional[str] = None,
+        audio_cache_max_gb: float = 10.0,
+        result_cache_dir: Optional[str] = None,
+        download_concurrency: int = 2,
+        **defaults: Any,
+    ) -> None:
+        check_ffmpeg()
+        os.makedirs(output_dir, exist_ok=True)
+        self.default_model = models[0] if models else "small"
+        # Only the models loaded at startup are served: a client cannot make
+        # the server load (and keep) an arbitrary model
+        self.pool = ModelPool(
+            backend_device(backend, resolve_device(device)),
+            backend,
+            allowed=models or [self.default_model],
+        )
+        self.output_dir = output_dir
+        self.audio_format = audio_format
+        self.cookies_file = cookies_file
+        self.verbose = verbose
+        self.audio_cache = (
+            get_audio_cache(audio_cache_dir, audio_cache_max_gb) if audio_cache_dir else None
+        )
+        self.result_cache = ResultCache(result_cache_dir) if result_cache_dir else None
+        # One yt-dlp session for the server's lifetime: cookies loaded once,
+        # connections reused across jobs
+        self.session = DownloadSession(
+            cookies_file=cookies_file,
+            output_dir=output_dir,
+            verbose=verbose,
+            max_concurrent=download_concurrency,
+        )
+        self.defaults = defaults
+        for name in models:
+            self.pool.get(name)
+
+    def run(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one job: ``{"url": ..., "model"?: ..., "return_segments"?: bool, ...}``."""
+        url = job.get("url")
+        if not url or not isinstance(url, str):
+            raise JobError("champ 'url' manquant")
+        unknown = set(job) - {"url", "model", "return_segments"} - set(JOB_OPTIONS)
+        if unknown:
+            raise JobError(f"options inconnues: {', '.join(sorted(unknown))}")
+        options = dict(self.defaults)
+        options.update({k: job[k] for k in JOB_OPTIONS if k in job})
+        if "output_format" in options:
+            try:
+                options["output_format"] = output_formats(str(options["output_format"]))
+            except ValueError as e:
+                raise JobError(str(e)) from e
+        model = job.get("model") or self.default_model
+        if not isinstance(model, str):
+            raise JobError("champ 'model' invalide")
+        # Refuse a model not loaded at startup before any download
+        self.pool.check(model)
+        captured: Dict[str, Any] = {}
+        output_path = None
+        if options.get("skip_existing"):
+            # Before any download: a skipped job costs no audio nor model time
+            output_format = options.get("output_format", "srt")
+            output_path = find_existing_output(
+                url,
+                output_dir=self.output_dir,
+                output_format=output_format,
+                language=options.get("language", "en"),
+                task=options.get("task", "transcribe"),
+                verbose=self.verbose,
+                cookies_file=self.cookies_file,
+                session=self.session,
+            )
+            if output_path is not None and job.get("return_segments"):
+                captured["segments"] = read_output_segments(output_path, output_format)
+        if output_path is None and self.result_cache is not None:
+            output_path = render_cached_result(
+                url,
+                self.result_cache,
+                model=model,
+                output_dir=self.output_dir,
+                backend=self.pool.backend,
+                on_result=captured.update,
+                **{k: options[k] for k in CACHED_RESULT_OPTIONS if k in options},
+            )
+        video_id = video_id_from_url(url)
+        if output_path is None:
+            output_path, video_id = self._transcribe(url, model, options, captured)
+
+        response: Dict[str, Any] = {
+            "output_path": os.path.abspath(output_path),
+            "video_id": video_id,
+            "model": selected_model_name(model),
+        }
+        if job.get("return_segments"):
+            response["segments"] = [
+                {"start": seg["start"], "end": seg["end"], "text": seg.get("text", "")}
+                for seg in captured.get("segments", [])
+            ]
+        return response
+
+    def _transcribe(
+        self, url: str, model: str, options: Dict[str, Any], captured: Dict[str, Any]
+    ) -> Tuple[str, Optional[str]]:
+        """Download and transcribe ``url``; returns (output path, video id)."""
+        whisper_model, model_lock = self.pool.get(model)
+
+        # Private workspace per job: concurrent jobs share output_dir. Keyed by
+        # video id, a failed download is resumed by the next job for that video
+        workspace = JobWorkspace(self.output_dir, key=video_id_from_url(url))
+        try:
+            info_dict, audio_path = download_audio(
+                url,
+                workspace.path("audio"),
+                audio_format=self.audio_format,
+                verbose=self.verbose,
+                cookies_file=self.cookies_file,
+                output_dir=self.output_dir,
+                audio_cache=self.audio_cache,
+                session=self.session,
+            )
+        except BaseException:
+            workspace.release()
+            raise
+        try:
+            # Decoded outside the model lock: it overlaps other jobs' transcription
+            audio = decode_pcm(audio_path)
+            with model_lock:
+                output_path = transcribe_downloaded(
+                    info_dict,
+                    audio,
+                    whisper_model=whisper_model,
+                    model=model,
+                    device=self.pool.device,
+                    backend=self.pool.backend,
+                    output_dir=self.output_dir,
+                    on_result=captured.update,
+                    result_cache=self.result_cache,
+                    **options,
+                )
+        finally:
+            remove_temp_audio(audio_path)
+            workspace.cleanup()
+        return output_path, info_dict.get("id")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "yt-whisper-scribe"
+    service: TranscriptionService  # set on the server instance
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path != "/health":
+            self._send_json(404, {"error": "not found"})
+            return
+        self._send_json(200, {"status": "ok", "models": self.server.service.pool.names()})
+
+    def do_POST(self) -> None:  # noqa: N802
+        if self.path != "/transcribe":
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                job = json.loads(self.rfile.read(length).decode("utf-8") or "{}")
+            except ValueError as e:
+                raise JobError(f"corps JSON invalide: {e}") from e
+            if not isinstance(job, dict):
+                raise JobError("le corps doit être un objet JSON")
+            self._send_json(200, self.server.service.run(job))
+        except JobError as e:
+            self._send_json(400, {"error": str(e)})
+        except DownloadError as e:
+            self._send_json(502, {"error": str(e)})
+        except Exception as e:  # noqa: BLE001
+            logging.exception("[server] Échec du job")
+            self._send_json(500, {"error": str(e)})
+
+    def address_string(self) -> str:
+        # Unix sockets have no (host, port) client address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        logging.info("[server] %s - %s", self.address_string(), format % args)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(
+    service: TranscriptionService,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[str] = None,
+) -> None:
+    """Serve ``POST /transcribe`` and ``GET /health`` until interrupted.
+
+    Listens on ``socket_path`` (Unix socket) when given, else on ``host:port``.
+    """
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        httpd: socketserver.BaseServer = _UnixHTTPServer(socket_path, _Handler)
+        where = f"unix:{socket_path}"
+    else:
+        httpd = ThreadingHTTPServer((host, port), _Handler)
+        where = f"http://{host}:{port}"
+    httpd.service = service  # type: ignore[attr-defined]
+    print(f"[server] En écoute sur {where} (modèles: {', '.join(service.pool.names())})")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        service.session.close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from .download import autodetect_cookies, build_ydl_opts
+from .retry import CircuitBreaker
+
+
+class DownloadSession:
+    """yt-dlp state shared by any number of download jobs.
+
+    A ``YoutubeDL`` is costly to build (cookie file parsing, extractor setup,
+    HTTP handlers) and each new one opens fresh connections. The session keeps
+    idle instances per option set and hands them out again, so their
+    connection pools and extractor state are reused, and loads the cookie jar
+    once: every instance shares it. At most ``max_concurrent`` instances are in
+    use at a time (downloads and metadata probes together); further callers
+    wait. YoutubeDL is not thread-safe, so an instance serves one caller at a
+    time. Cookies are saved back to the cookie file once, by ``close``. The
+    session's ``breaker`` (CircuitBreaker) is shared by its download jobs.
+    """
+
+    def __init__(
+        self,
+        *,
+        cookies_file: Optional[str] = None,
+        output_dir: str = "data",
+        verbose: bool = False,
+        max_concurrent: int = 2,
+    ) -> None:
+        self.verbose = verbose
+        self.max_concurrent = max(1, max_concurrent)
+        self.cookiefile = autodetect_cookies(cookies_file, output_dir)
+        if self.cookiefile:
+            logging.info("[cookies] Utilisation du cookies.txt: %s", self.cookiefile)
+        self.breaker = CircuitBreaker()
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._lock = threading.Lock()
+        self._jar_lock = threading.Lock()
+        # Option-set key -> idle instances
+        self._idle: Dict[str, List[Any]] = {}
+        self._cookiejar: Any = None
+        self._closed = False
+
+    def _new_instance(self, opts: Dict[str, Any]) -> Any:
+        import yt_dlp  # type: ignore
+
+        with self._jar_lock:
+            if self._cookiejar is None and self.cookiefile:
+                # The first instance parses the cookie file (and saves it on close)
+                ydl = yt_dlp.YoutubeDL(dict(opts, cookiefile=self.cookiefile))
+                self._cookiejar = ydl.cookiejar
+            else:
+                ydl = yt_dlp.YoutubeDL(opts)
+                if self._cookiejar is not None:
+                    ydl.cookiejar = self._cookiejar
+        return ydl
+
+    @contextmanager
+    def _checkout(self, key: str, opts: Dict[str, Any]) -> Iterator[Any]:
+        if self._closed:
+            raise RuntimeError("session de téléchargement fermée")
+        with self._slots:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                ydl = idle.pop() if idle else None
+            if ydl is None:
+                ydl = self._new_instance(opts)
+            try:
+                yield ydl
+            finally:
+                with self._lock:
+                    closed = self._closed
+                    if not closed:
+                        self._idle.setdefault(key, []).append(ydl)
+                if closed:
+                    ydl.__exit__(None, None, None)
+
+    @contextmanager
+    def downloader(self, temp_stem: str, *, audio_format: str = "m4a") -> Iterator[Any]:
+        """A YoutubeDL configured like ``build_ydl_opts`` whose output template is ``temp_stem``."""
+        opts = build_ydl_opts(temp_stem, audio_format=audio_format, verbose=self.verbose)
+        with self._checkout(f"download:{audio_format}", opts) as ydl:
+            # Only the output template changes from one job to the next
+            outtmpl = ydl.params.get("outtmpl")
+            if isinstance(outtmpl, dict):
+                outtmpl["default"] = opts["outtmpl"]
+            else:
+                ydl.params["outtmpl"] = opts["outtmpl"]
+            yield ydl
+
+    def extract_info(self, url: str) -> Dict[str, Any]:
+        """Video metadata only (``extract_info(download=False)``)."""
+        opts = {"quiet": not self.verbose, "noplaylist": True, "skip_download": True}
+        with self._checkout("probe", opts) as ydl:
+            return ydl.extract_info(url, download=False)
+
+    def close(self) -> None:
+        """Close every instance; the cookie jar is saved once, by its first instance."""
+        with self._lock:
+            self._closed = True
+            instances = [ydl for idle in self._idle.values() for ydl in idle]
+            self._idle.clear()
+        # Instances still checked out are closed when returned
+        for ydl in instances:
+            try:
+                ydl.__exit__(None, None, None)
+            except Exception as e:  # noqa: BLE001
+                logging.warning("[session] Fermeture YoutubeDL: %s", e)
+
+    def __enter__(self) -> DownloadSession:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+from .segments import SegmentStore
 
-def format_timestamp(seconds: float) -> str:
+
+def format_timestamp(seconds: float, decimal_marker: str = ",") -> str:
     """Convert seconds to SRT timestamp format (HH:MM:SS,mmm).
 
+    WebVTT uses ``decimal_marker="."`` (HH:MM:SS.mmm).
+
     Raises AssertionError if ``seconds`` is negative.
     """
     assert seconds >= 0, "Le temps négatif n'est pas autorisé."
@@ -18,7 +22,17 @@ def format_timestamp(seconds: float) -> str:
     secs = milliseconds // 1_000
     milliseconds %= 1_000
 
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{decimal_marker}{milliseconds:03d}"
+
+
+def format_srt_cue(index: int, start: float, end: float, text: str) -> str:
+    """Format one numbered SRT block (ends with a newline, no blank line)."""
+    return f"{index}\n{format_timestamp(start)} --> {format_timestamp(end)}\n{text.strip()}\n"
+
+
+def format_srt_block(index: int, segment: dict) -> str:
+    """``format_srt_cue`` for a Whisper segment dict."""
+    return format_srt_cue(index, segment["start"], segment["end"], segment["text"])
 
 
 def generate_srt_content(result: dict) -> str:
@@ -26,11 +40,56 @@ def generate_srt_content(result: dict) -> str:
 
     Expected structure:
     {"segments": [{"start": float, "end": float, "text": str}, ...]}
+
+    ``segments`` may also be a SegmentStore.
     """
+    segments = result["segments"]
+    if isinstance(segments, SegmentStore):
+        return "\n".join(
+            format_srt_cue(i, start, end, text)
+            for i, (start, end, text) in enumerate(
+                zip(segments.starts, segments.ends, segments.texts), start=1
+            )
+        )
     srt_content: list[str] = []
-    for i, segment in enumerate(result["segments"], start=1):
-        start_time = format_timestamp(segment["start"])  # type: ignore[arg-type]
-        end_time = format_timestamp(segment["end"])  # type: ignore[arg-type]
-        text = segment["text"].strip()
-        srt_content.append(f"{i}\n{start_time} --> {end_time}\n{text}\n")
+    for i, segment in enumerate(segments, start=1):
+        srt_content.append(format_srt_block(i, segment))
     return "\n".join(srt_content)
+
+
+def parse_timestamp(value: str) -> float:
+    """Inverse of ``format_timestamp``: ``HH:MM:SS,mmm`` (or ``.mmm``) to seconds."""
+    hms, _, ms = value.strip().replace(".", ",").partition(",")
+    hours, minutes, secs = (int(x) for x in hms.split(":"))
+    return (hours * 3_600_000 + minutes * 60_000 + secs * 1_000 + int(ms or 0)) / 1000.0
+
+
+def parse_srt(content: str) -> SegmentStore:
+    """Parse SRT ``content`` back into segments (inverse of ``generate_srt_content``).
+
+    Tolerates a BOM, CRLF line endings and extra blank lines between blocks;
+    multi-line cue texts are kept with their newlines. Raises ValueError on a
+    block without a ``start --> end`` line.
+    """
+    store = SegmentStore()
+    lines = content.lstrip("\ufeff").replace("\r\n", "\n").split("\n")
+    n = len(lines)
+    i = 0
+    while i < n:
+        if not lines[i].strip():
+            i += 1
+            continue
+        # Cue number (optional in the wild), then the timing line
+        if "-->" not in lines[i]:
+            i += 1
+        if i >= n or "-->" not in lines[i]:
+            raise ValueError(f"bloc SRT invalide ligne {i + 1}")
+        start, _, end = lines[i].partition("-->")
+        i += 1
+        text: list[str] = []
+        while i < n and lines[i].strip():
+            text.append(lines[i])
+            i += 1
+        end = (end.split() or [""])[0]
+        store.append(parse_timestamp(start), parse_timestamp(end), "\n".join(text))
+    return store
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import importlib
+import queue
+import sys
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+# Whisper's progress bar counts mel frames: 100 per second of audio
+_FRAMES_PER_SECOND = 100
+
+_tap_local = threading.local()
+_install_lock = threading.Lock()
+_installed = False
+
+
+class _Tap:
+    """Stand-in for the progress bar of ``whisper.transcribe``.
+
+    openai-whisper decodes 30-second windows and updates its progress bar right
+    after appending the window's segments to its local ``all_segments`` list.
+    The tap reads that list from the caller frame on each update and forwards
+    the new segments, so they are available as each window is decoded.
+    """
+
+    def __init__(self, stream: SegmentStream, caller: Dict[str, Any], total: int) -> None:
+        self._stream = stream
+        self._caller = caller
+        self._total = total
+        self._emitted = 0
+        self._frames = 0
+        # Detection (if any) is done before the progress bar is created
+        stream._queue.put(("language", caller.get("language")))
+
+    def __enter__(self) -> _Tap:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    def update(self, n: int = 1) -> None:
+        self._frames += n
+        segments = self._caller.get("all_segments")
+        if segments is None:
+            # Locals snapshot taken before the list existed: refresh from the frame
+            self._caller = sys._getframe(1).f_locals
+            segments = self._caller.get("all_segments")
+        new: List[Dict[str, Any]] = []
+        if segments is not None:
+            new = segments[self._emitted :]
+            self._emitted = len(segments)
+        self._stream._queue.put(
+            ("segments", new, self._frames / _FRAMES_PER_SECOND, self._total / _FRAMES_PER_SECOND)
+        )
+
+    def close(self) -> None:
+        return None
+
+
+class _TqdmShim:
+    """Replaces the ``tqdm`` module seen by ``whisper.transcribe``.
+
+    Threads running a SegmentStream get a tap; any other caller gets the real
+    tqdm, so concurrent non-streaming transcriptions are unaffected.
+    """
+
+    def __init__(self, real: Any) -> None:
+        self._real = real
+
+    def tqdm(self, *args: Any, total: int = 0, **kwargs: Any) -> Any:
+        stream = getattr(_tap_local, "stream", None)
+        if stream is None:
+            return self._real.tqdm(*args, total=total, **kwargs)
+        return _Tap(stream, sys._getframe(1).f_locals, total)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._real, name)
+
+
+def _install_shim() -> None:
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        module = importlib.import_module("whisper.transcribe")
+        module.tqdm = _TqdmShim(module.tqdm)
+        _installed = True
+
+
+class SegmentStream:
+    """Iterate Whisper segments as each 30-second window is decoded.
+
+    ``transcribe`` runs in a worker thread; iterating yields segment dicts in
+    order. ``language`` is set once detection is done (before the first
+    segment), ``seconds_done``/``duration`` track audio progress, and ``result``
+    holds the full Whisper result after iteration. If the hook cannot see the
+    segments (other whisper versions), they are all yielded at the end. A
+    model with its own ``segments(audio, **kwargs)`` iterator (see
+    ``backends``) is iterated directly, without the hook.
+    """
+
+    def __init__(self, whisper_model: Any, audio: Any, **transcribe_kwargs: Any) -> None:
+        self.language: Optional[str] = transcribe_kwargs.get("language")
+        self.seconds_done = 0.0
+        self.duration = 0.0
+        self.result: Optional[Dict[str, Any]] = None
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(whisper_model, audio, transcribe_kwargs),
+            name="whisper-stream",
+            daemon=True,
+        )
+        if not callable(getattr(whisper_model, "segments", None)):
+            _install_shim()
+        self._thread.start()
+
+    def _run(self, whisper_model: Any, audio: Any, kwargs: Dict[str, Any]) -> None:
+        _tap_local.stream = self
+        try:
+            # verbose=None: no per-segment printing and no progress bar
+            kwargs.setdefault("verbose", None)
+            if callable(getattr(whisper_model, "segments", None)):
+                self._queue.put(("done", self._iterate(whisper_model, audio, kwargs)))
+            else:
+                self._queue.put(("done", whisper_model.transcribe(audio, **kwargs)))
+        except BaseException as e:  # noqa: BLE001
+            self._queue.put(("error", e))
+        finally:
+            _tap_local.stream = None
+
+    def _iterate(self, whisper_model: Any, audio: Any, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        iterator, info = whisper_model.segments(audio, **kwargs)
+        self._queue.put(("language", info["language"]))
+        segments: List[Dict[str, Any]] = []
+        for seg in iterator:
+            segments.append(seg)
+            self._queue.put(("segments", [seg], seg["end"], info["duration"]))
+        return {
+            "text": "".join(seg["text"] for seg in segments),
+            "segments": segments,
+            "language": info["language"],
+        }
+
+    def batches(self) -> Iterator[List[Dict[str, Any]]]:
+        """Yield the segments of each decoded window as one list."""
+        emitted = 0
+        while True:
+            msg = self._queue.get()
+            kind = msg[0]
+            if kind == "language":
+                self.language = self.language or msg[1]
+            elif kind == "segments":
+                _, new, self.seconds_done, self.duration = msg
+                if new:
+                    emitted += len(new)
+                    yield new
+            elif kind == "error":
+                self._thread.join()
+                raise msg[1]
+            else:  # done
+                self.result = msg[1]
+                self.language = self.language or self.result.get("language")
+                self.seconds_done = max(self.seconds_done, self.duration)
+                rest = self.result.get("segments", [])[emitted:]
+                if rest:
+                    yield rest
+                self._thread.join()
+                return
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for batch in self.batches():
+            yield from batch
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+import shutil
+import tempfile
+from typing import Optional
+
+LOCK_FILENAME = ".lock"
+
+
+def _try_lock(path: str) -> Optional[int]:
+    """Non-blocking exclusive lock on ``path``; the fd to keep open, or None if held.
+
+    The OS drops the lock when its holder dies, so a crashed job never leaves
+    a stale lock behind.
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if os.name == "nt":
+            import msvcrt
+
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+class JobWorkspace:
+    """Private scratch directory of one job, ``<root>/.job-XXXXXXXX``.
+
+    Everything a job writes besides its output (downloaded audio, partial
+    files) goes here, so concurrent jobs sharing an output directory never
+    collide. ``cleanup`` removes the directory and its content.
+
+    With a ``key`` (the video id), the directory is ``<root>/.job-<key>`` and
+    survives ``release``: a later job for the same key, in this process or
+    after a restart, finds the partial download there and resumes it. The
+    directory is locked while in use; if another job holds it, a fresh private
+    directory is used instead.
+    """
+
+    def __init__(self, root: str, key: Optional[str] = None) -> None:
+        os.makedirs(root, exist_ok=True)
+        self._lock_fd: Optional[int] = None
+        if key:
+            path = os.path.join(root, ".job-" + re.sub(r"[^A-Za-z0-9_-]", "_", key))
+            os.makedirs(path, exist_ok=True)
+            self._lock_fd = _try_lock(os.path.join(path, LOCK_FILENAME))
+            if self._lock_fd is not None:
+                self.dir = path
+                return
+            logging.info("Espace de travail %s déjà utilisé, dossier privé utilisé", path)
+        self.dir = tempfile.mkdtemp(prefix=".job-", dir=root)
+
+    @property
+    def resumable(self) -> bool:
+        return self._lock_fd is not None
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.dir, name)
+
+    def _unlock(self) -> None:
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def release(self) -> None:
+        """Keep a keyed directory (and its partial files) for a later job; otherwise ``cleanup``."""
+        if self._lock_fd is None:
+            self.cleanup()
+            return
+        self._unlock()
+
+    def cleanup(self) -> None:
+        if os.name == "nt":
+            # Windows cannot remove a file that is still open
+            self._unlock()
+        try:
+            shutil.rmtree(self.dir)
+        except OSError as e:
+            logging.warning("Impossible de supprimer l'espace de travail %s: %s", self.dir, e)
+        finally:
+            self._unlock()
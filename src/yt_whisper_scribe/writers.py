@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import platform
+from typing import Any, Dict, Iterable, List, Optional, Type, Union
+
+from .segments import SegmentRow, SegmentStore
+from .srt import format_srt_cue, format_timestamp, parse_srt
+
+Segments = Union[Iterable[Dict[str, Any]], SegmentStore]
+
+
+def _rows(segments: Segments) -> Iterable[SegmentRow]:
+    if isinstance(segments, SegmentStore):
+        return segments.rows()
+    return ((seg["start"], seg["end"], seg.get("text") or "", seg.get("words")) for seg in segments)
+
+
+class SegmentWriter:
+    """Write segments to ``path`` as they arrive.
+
+    Content goes to ``<path>.part``, flushed after each ``write``, and is
+    renamed to ``path`` by ``close``: a finished file never appears half
+    written, and an interrupted run leaves its partial output in the ``.part``
+    file. Subclasses implement ``_format`` (one segment given as its columns,
+    so a SegmentStore is written without building dicts) and optionally
+    ``_header`` and ``_footer``; ``meta`` holds job information (``language``,
+    ``id``, ``title``) for formats that embed it.
+    """
+
+    def __init__(
+        self, path: str, encoding: str = "utf-8", meta: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self.path = path
+        self.part_path = path + ".part"
+        self.meta = meta or {}
+        self.count = 0
+        self._file = open(self.part_path, "w", encoding=encoding)
+        self._file.write(self._header())
+
+    def _header(self) -> str:
+        return ""
+
+    def _footer(self) -> str:
+        return ""
+
+    def _format(
+        self, start: float, end: float, text: str, words: Optional[List[Dict[str, Any]]]
+    ) -> str:
+        raise NotImplementedError
+
+    def write_row(
+        self,
+        start: float,
+        end: float,
+        text: str,
+        words: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        self._file.write(self._format(start, end, text, words))
+        self.count += 1
+
+    def write_segment(self, segment: Dict[str, Any]) -> None:
+        self.write_row(
+            segment["start"], segment["end"], segment.get("text") or "", segment.get("words")
+        )
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def write(self, segments: Segments) -> None:
+        for row in _rows(segments):
+            self.write_row(*row)
+        self.flush()
+
+    def close(self) -> str:
+        self._file.write(self._footer())
+        self._file.close()
+        os.replace(self.part_path, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        self._file.close()
+        logging.warning("Sortie partielle conservée: %s", self.part_path)
+
+
+class SrtWriter(SegmentWriter):
+    """Same content as ``generate_srt_content``, one block at a time."""
+
+    def _format(self, start, end, text, words) -> str:
+        block = format_srt_cue(self.count + 1, start, end, text)
+        return block if self.count == 0 else "\n" + block
+
+
+class TxtWriter(SegmentWriter):
+    """Segment texts joined by single spaces, like the ``txt`` output."""
+
+    _started = False
+
+    def _format(self, start, end, text, words) -> str:
+        text = text.strip()
+        if not text:
+            return ""
+        if not self._started:
+            self._started = True
+            return text
+        return " " + text
+
+
+class VttWriter(SegmentWriter):
+    """WebVTT cues (HH:MM:SS.mmm timestamps, no cue numbers)."""
+
+    def _header(self) -> str:
+        return "WEBVTT\n\n"
+
+    def _format(self, start, end, text, words) -> str:
+        start_ts = format_timestamp(start, decimal_marker=".")
+        end_ts = format_timestamp(end, decimal_marker=".")
+        return f"{start_ts} --> {end_ts}\n{text.strip()}\n\n"
+
+
+class TsvWriter(SegmentWriter):
+    """``start``, ``end`` (integer milliseconds) and ``text`` columns, like Whisper's tsv."""
+
+    def _header(self) -> str:
+        return "start\tend\ttext\n"
+
+    def _format(self, start, end, text, words) -> str:
+        return f"{round(start * 1000)}\t{round(end * 1000)}\t{' '.join(text.split())}\n"
+
+
+class JsonWriter(SegmentWriter):
+    """``{"id", "title", "language", "segments": [...]}`` with word timings when available.
+
+    Segment texts are post-glossary; ``words`` are Whisper's words as decoded.
+    """
+
+    def _header(self) -> str:
+        head = {k: self.meta[k] for k in ("id", "title", "language") if k in self.meta}
+        opening = json.dumps(head, ensure_ascii=False)[:-1]
+        return (opening + ", " if head else "{") + '"segments": ['
+
+    def _footer(self) -> str:
+        return "\n]}\n" if self.count else "]}\n"
+
+    def _format(self, start, end, text, words) -> str:
+        out: Dict[str, Any] = {"id": self.count, "start": start, "end": end, "text": text.strip()}
+        if words:
+            out["words"] = [
+                {k: w[k] for k in ("word", "start", "end", "probability") if k in w} for w in words
+            ]
+        return ("\n" if self.count == 0 else ",\n") + json.dumps(out, ensure_ascii=False)
+
+
+WRITERS: Dict[str, Type[SegmentWriter]] = {
+    "srt": SrtWriter,
+    "txt": TxtWriter,
+    "vtt": VttWriter,
+    "tsv": TsvWriter,
+    "json": JsonWriter,
+}
+
+
+def parse_output_formats(value: str) -> List[str]:
+    """``"srt,vtt"`` -> ``["srt", "vtt"]``; raises ValueError on an unknown format."""
+    formats: List[str] = []
+    for fmt in value.split(","):
+        fmt = fmt.strip().lower()
+        if not fmt:
+            continue
+        if fmt not in WRITERS:
+            raise ValueError(f"format de sortie inconnu: {fmt} (disponibles: {', '.join(WRITERS)})")
+        if fmt not in formats:
+            formats.append(fmt)
+    if not formats:
+        raise ValueError("aucun format de sortie")
+    return formats
+
+
+def output_formats(value: str) -> str:
+    """Normalized ``--output_format`` value (usable as an argparse ``type``)."""
+    return ",".join(parse_output_formats(value))
+
+
+# Formats read back by read_segments, most faithful first
+_TIMED_FORMATS = ("json", "srt", "vtt", "tsv")
+
+
+def read_segments(path: str) -> List[Dict[str, Any]]:
+    """``{"start", "end", "text"}`` segments back from an output written by WRITERS.
+
+    The format is taken from the extension; a ``txt`` output has no timings
+    and comes back as one segment at 0.
+    """
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext == "json":
+        return [
+            {"start": seg["start"], "end": seg["end"], "text": seg.get("text", "")}
+            for seg in json.loads(content).get("segments", [])
+        ]
+    if ext == "tsv":
+        rows = [line.split("\t", 2) for line in content.splitlines()[1:] if line.strip()]
+        return [
+            {"start": int(start) / 1000, "end": int(end) / 1000, "text": text}
+            for start, end, text in rows
+        ]
+    if ext in ("srt", "vtt"):
+        if ext == "vtt":
+            content = content.lstrip("\ufeff").replace("\r\n", "\n").partition("\n\n")[2]
+        return [
+            {"start": start, "end": end, "text": text}
+            for start, end, text, _ in parse_srt(content).rows()
+        ]
+    return [{"start": 0.0, "end": 0.0, "text": content}]
+
+
+def read_output_segments(path: str, output_format: str) -> List[Dict[str, Any]]:
+    """Segments of the output ``path`` (one format of ``output_format``), read from
+    its most faithful sibling among the formats written with it."""
+    formats = parse_output_formats(output_format)
+    stem = os.path.splitext(path)[0]
+    for fmt in _TIMED_FORMATS:
+        if fmt in formats and os.path.exists(f"{stem}.{fmt}"):
+            return read_segments(f"{stem}.{fmt}")
+    return read_segments(path)
+
+
+class MultiWriter:
+    """Fan segments out to one writer per format in a single pass over the data."""
+
+    def __init__(self, writers: List[SegmentWriter]) -> None:
+        self.writers = writers
+
+    def write(self, segments: Segments) -> None:
+        for row in _rows(segments):
+            for writer in self.writers:
+                writer.write_row(*row)
+        for writer in self.writers:
+            writer.flush()
+
+    def close(self) -> List[str]:
+        return [writer.close() for writer in self.writers]
+
+    def abort(self) -> None:
+        for writer in self.writers:
+            writer.abort()
+
+
+def open_writers(paths: Dict[str, str], meta: Optional[Dict[str, Any]] = None) -> MultiWriter:
+    """Open one writer per ``{format: path}``; SRT gets a BOM on Windows."""
+    writers: List[SegmentWriter] = []
+    try:
+        for fmt, path in paths.items():
+            encoding = "utf-8-sig" if (fmt == "srt" and platform.system() == "Windows") else "utf-8"
+            writers.append(WRITERS[fmt](path, encoding=encoding, meta=meta))
+    except BaseException:
+        MultiWriter(writers).abort()
+        raise
+    return MultiWriter(writers)
@@ -0,0 +1,45 @@
+import os
+import stat
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe.audio import decode_pcm
+
+# Stands in for ffmpeg: writes three f32le samples, or fails like a bad input
+_FAKE_FFMPEG = f"""#!{sys.executable}
+import sys
+import numpy as np
+if "broken.m4a" in sys.argv:
+    sys.stderr.write("Invalid data found when processing input\\n")
+    sys.exit(1)
+sys.stdout.buffer.write(np.array([0.0, 0.5, -0.25], dtype=np.float32).tobytes())
+"""
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    script = tmp_path / "ffmpeg"
+    script.write_text(_FAKE_FFMPEG, encoding="utf-8")
+    script.chmod(script.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+
+
+def test_decode_pcm_returns_writable_samples(fake_ffmpeg):
+    samples = decode_pcm("demo.m4a")
+    assert samples.dtype == np.float32
+    assert samples.tolist() == [0.0, 0.5, -0.25]
+    assert samples.flags.writeable
+
+
+def test_decode_pcm_reports_ffmpeg_errors(fake_ffmpeg):
+    with pytest.raises(RuntimeError, match="Invalid data"):
+        decode_pcm("broken.m4a")
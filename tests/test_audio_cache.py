@@ -0,0 +1,37 @@
+import os
+import sys
+from pathlib import Path
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe.audio_cache import AudioCache
+
+
+def test_audio_cache_hit_miss_and_lru_eviction(tmp_path):
+    cache = AudioCache(str(tmp_path / "cache"), max_bytes=2500)
+    work = tmp_path / "work"
+    work.mkdir()
+
+    assert cache.fetch("aaaaaaaaaaa", "m4a", str(work / "a.m4a")) is None
+    for vid in ("aaaaaaaaaaa", "bbbbbbbbbbb"):
+        src = work / f"{vid}.m4a"
+        src.write_bytes(b"x" * 1000)
+        cache.store({"id": vid, "title": f"T {vid}", "formats": ["dropped"]}, "m4a", str(src))
+        src.unlink()
+
+    info, path = cache.fetch("aaaaaaaaaaa", "m4a", str(work / "a.m4a"))
+    assert info == {"id": "aaaaaaaaaaa", "title": "T aaaaaaaaaaa"}
+    assert os.path.getsize(path) == 1000
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # "a" was just used: inserting "c" evicts "b", the least recently used
+    os.utime(tmp_path / "cache" / "bbbbbbbbbbb.m4a", (1, 1))
+    src = work / "c.m4a"
+    src.write_bytes(b"x" * 1000)
+    cache.store({"id": "ccccccccccc"}, "m4a", str(src))
+    assert cache.fetch("bbbbbbbbbbb", "m4a", str(work / "b.m4a")) is None
+    assert cache.fetch("aaaaaaaaaaa", "m4a", str(work / "a2.m4a")) is not None
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import sys
+import types
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe.backends import FasterWhisperModel, backend_device, load_model
+from yt_whisper_scribe.result_cache import result_cache_params
+from yt_whisper_scribe.streaming import SegmentStream
+
+
+def _fake_segment(i, start, end, text, words=None):
+    return SimpleNamespace(
+        id=i + 1,
+        seek=0,
+        start=start,
+        end=end,
+        text=text,
+        tokens=(50364, 1, 2),
+        temperature=0.0,
+        avg_logprob=-0.2,
+        compression_ratio=1.3,
+        no_speech_prob=0.01,
+        words=words,
+    )
+
+
+@pytest.fixture
+def faster_whisper(monkeypatch):
+    calls = {}
+
+    class WhisperModel:
+        def __init__(self, model, **kwargs):
+            calls["init"] = (model, kwargs)
+
+        def transcribe(self, audio, **options):
+            calls["options"] = options
+            word = SimpleNamespace(word=" Open", start=0.0, end=0.4, probability=0.9)
+            segments = iter(
+                [
+                    _fake_segment(0, 0.0, 2.0, " Open SWOOD.", [word]),
+                    _fake_segment(1, 2.0, 4.5, " Save the report."),
+                ]
+            )
+            return segments, SimpleNamespace(language="en", duration=4.5)
+
+    module = types.ModuleType("faster_whisper")
+    module.WhisperModel = WhisperModel
+    monkeypatch.setitem(sys.modules, "faster_whisper", module)
+    return calls
+
+
+def test_faster_whisper_returns_openai_whisper_result(faster_whisper):
+    model = load_model("faster-whisper", "small", "cpu", threads=4)
+    assert faster_whisper["init"] == (
+        "small",
+        {"device": "cpu", "compute_type": "int8", "cpu_threads": 4},
+    )
+    result = model.transcribe(
+        np.zeros(16000, np.float32),
+        language="en",
+        fp16=False,
+        verbose=None,
+        temperature=0.0,
+        logprob_threshold=-1.0,
+    )
+    # openai-whisper-only options dropped or renamed; greedy like openai-whisper
+    assert faster_whisper["options"] == {
+        "language": "en",
+        "temperature": 0.0,
+        "log_prob_threshold": -1.0,
+        "beam_size": 1,
+    }
+    assert result["language"] == "en"
+    assert result["text"] == " Open SWOOD. Save the report."
+    first, second = result["segments"]
+    assert first["id"] == 0 and second["id"] == 1
+    assert set(first) == {
+        "id", "seek", "start", "end", "text", "tokens", "temperature",
+        "avg_logprob", "compression_ratio", "no_speech_prob", "words",
+    }  # fmt: skip
+    assert first["words"] == [{"word": " Open", "start": 0.0, "end": 0.4, "probability": 0.9}]
+    assert "words" not in second
+
+
+def test_segment_stream_iterates_backend_segments(faster_whisper):
+    stream = SegmentStream(FasterWhisperModel("small"), np.zeros(16000, np.float32))
+    batches = list(stream.batches())
+    assert [[s["text"] for s in batch] for batch in batches] == [
+        [" Open SWOOD."],
+        [" Save the report."],
+    ]
+    assert stream.language == "en"
+    assert stream.seconds_done == stream.duration == 4.5
+    assert len(stream.result["segments"]) == 2
+
+
+def test_backend_device_and_cache_key():
+    assert backend_device("whisper-int8", "cuda") == "cpu"
+    assert backend_device("faster-whisper", "cuda") == "cuda"
+    common = dict(
+        model="small",
+        language="en",
+        task="transcribe",
+        temperature=0.0,
+        condition_on_previous_text=True,
+        initial_prompt=None,
+    )
+    # Entries cached before backends existed keep their key
+    assert "backend" not in result_cache_params(**common)
+    assert result_cache_params(**common, backend="whisper-int8")["backend"] == "whisper-int8"
+    with pytest.raises(ValueError):
+        load_model("onnx", "small", "cpu")
@@ -0,0 +1,102 @@
+import io
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe import batch
+from yt_whisper_scribe.batch import read_urls
+
+
+def test_read_urls_skips_blanks_and_comments(tmp_path):
+    path = tmp_path / "urls.txt"
+    path.write_text("# chaîne A\nhttps://youtu.be/a\n\n  https://youtu.be/b  \n", encoding="utf-8")
+
+    assert read_urls(str(path)) == ["https://youtu.be/a", "https://youtu.be/b"]
+    assert read_urls(io.StringIO("https://youtu.be/c\n#x\n")) == ["https://youtu.be/c"]
+
+
+class _FakeTranscriber:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _fake_batch(tmp_path, monkeypatch, *, failing=()):
+    """transcribe_batch with a fake model loader, download and transcription."""
+    state = {"loads": [], "in_flight": 0, "max_in_flight": 0, "used": []}
+    lock = threading.Lock()
+
+    def start_model_load(*args, **kwargs):
+        future = Future()
+        future.set_result(_FakeTranscriber())
+        state["loads"].append(future.result())
+        return future
+
+    def download_audio(url, output_template, **kwargs):
+        with lock:
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            time.sleep(0.02)
+            if url in failing:
+                raise RuntimeError("HTTP 403")
+            audio_path = output_template + ".m4a"
+            Path(audio_path).write_bytes(b"audio")
+            return {"id": url[-1], "title": "Demo"}, audio_path
+        finally:
+            with lock:
+                state["in_flight"] -= 1
+
+    def transcribe_downloaded(info_dict, audio, *, whisper_model, output_dir, **kwargs):
+        state["used"].append(whisper_model)
+        return str(Path(output_dir) / f"Demo-{info_dict['id']}.en.srt")
+
+    monkeypatch.setattr(batch, "resolve_device", lambda device: "cpu")
+    monkeypatch.setattr(batch, "check_ffmpeg", lambda: None)
+    monkeypatch.setattr(batch, "start_model_load", start_model_load)
+    monkeypatch.setattr(batch, "download_audio", download_audio)
+    monkeypatch.setattr(batch, "transcribe_downloaded", transcribe_downloaded)
+    return state
+
+
+def test_transcribe_batch_loads_model_once_and_bounds_prefetch(tmp_path, monkeypatch):
+    state = _fake_batch(tmp_path, monkeypatch)
+    urls = [f"https://youtu.be/{c}" for c in "abcdef"]
+
+    items = batch.transcribe_batch(urls, output_dir=str(tmp_path), prefetch=2, download_workers=4)
+    assert [item.error for item in items] == [None] * len(urls)
+    assert len(state["loads"]) == 1
+    assert state["used"] == state["loads"] * len(urls)
+    assert state["loads"][0].closed
+    assert 1 <= state["max_in_flight"] <= 2
+
+
+def test_transcribe_batch_isolates_failed_items(tmp_path, monkeypatch):
+    state = _fake_batch(tmp_path, monkeypatch, failing={"https://youtu.be/b"})
+    urls = ["https://youtu.be/a", "https://youtu.be/b", "https://youtu.be/c"]
+
+    items = batch.transcribe_batch(urls, output_dir=str(tmp_path))
+    assert [item.url for item in items] == urls
+    assert items[1].error == "HTTP 403" and items[1].output_path is None
+    assert items[0].output_path.endswith("Demo-a.en.srt")
+    assert items[2].output_path.endswith("Demo-c.en.srt")
+    assert len(state["used"]) == 2
+
+
+def test_transcribe_batch_closes_unused_model(tmp_path, monkeypatch):
+    state = _fake_batch(tmp_path, monkeypatch, failing={"https://youtu.be/a"})
+
+    items = batch.transcribe_batch(["https://youtu.be/a"], output_dir=str(tmp_path))
+    assert items[0].error == "HTTP 403"
+    assert state["used"] == []
+    assert len(state["loads"]) == 1 and state["loads"][0].closed
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+_spec = importlib.util.spec_from_file_location(
+    "bench_hotpaths", PROJECT_ROOT / "benchmarks" / "bench_hotpaths.py"
+)
+bench = importlib.util.module_from_spec(_spec)
+sys.modules["bench_hotpaths"] = bench
+_spec.loader.exec_module(bench)
+
+
+def test_synthetic_inputs_are_deterministic_and_hit_the_glossary():
+    glossary = bench.synthetic_glossary(50)
+    a = bench.synthetic_segments(300, glossary)
+    assert a == bench.synthetic_segments(300, glossary)
+    new_segments, events = bench.apply_glossary_replacements(a, glossary)
+    assert len(new_segments) == 300
+    assert any(e.kind == "segment" for e in events)
+    assert any(e.kind == "cross_boundary" for e in events)
+
+
+def test_compare_flags_throughput_regressions(capsys):
+    def report(**ops):
+        return {
+            "meta": {},
+            "results": {
+                k: {"ops_per_s": v, "peak_mem_bytes": 1, "seconds": 1} for k, v in ops.items()
+            },
+        }
+
+    baseline = report(fast=1000.0, steady=1000.0, gone=1.0)
+    candidate = report(fast=850.0, steady=950.0, new=1.0)
+    assert bench.compare(baseline, candidate, threshold=0.1) == ["fast"]
+    assert "REGRESSION" in capsys.readouterr().out
+
+
+_backends_spec = importlib.util.spec_from_file_location(
+    "bench_backends", PROJECT_ROOT / "benchmarks" / "bench_backends.py"
+)
+bench_backends = importlib.util.module_from_spec(_backends_spec)
+sys.modules["bench_backends"] = bench_backends
+_backends_spec.loader.exec_module(bench_backends)
+
+
+def test_word_error_rate_ignores_case_punctuation_and_srt_timings():
+    srt = (
+        "1\n00:00:00,000 --> 00:00:02,000\nOpen the SWOOD panel.\n\n"
+        "2\n00:00:02,000 --> 00:00:03,000\nThen save!\n"
+    )
+    reference = bench_backends.normalize_words(srt)
+    assert reference == ["open", "the", "swood", "panel", "then", "save"]
+    hypothesis = bench_backends.normalize_words("open a swood panel then save it")
+    # one substitution, one insertion
+    assert bench_backends.word_error_rate(reference, hypothesis) == 2 / 6
+    assert bench_backends.word_error_rate(reference, reference) == 0.0
+
+
+def test_summarize_reports_speedup_and_wer_against_first_backend(capsys):
+    results = {
+        "whisper": {
+            "load_seconds": 2.0,
+            "transcribe_seconds": 60.0,
+            "realtime_factor": 5.0,
+            "text": "open the panel",
+        },
+        "faster-whisper": {
+            "load_seconds": 1.0,
+            "transcribe_seconds": 15.0,
+            "realtime_factor": 20.0,
+            "text": "open the panels",
+        },
+    }
+    bench_backends.summarize(results)
+    assert results["whisper"]["wer"] == 0.0
+    assert results["faster-whisper"]["speedup"] == 4.0
+    assert results["faster-whisper"]["wer"] == round(1 / 3, 4)
+    assert "faster-whisper" in capsys.readouterr().out
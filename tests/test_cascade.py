@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe.cascade import (
+    CascadeThresholds,
+    CascadeTranscriber,
+    flag_segments,
+    plan_regions,
+)
+from yt_whisper_scribe.replace import compile_glossary
+
+SR = 16000
+
+
+def _seg(start, end, text, logprob=-0.2, **extra):
+    return dict(start=start, end=end, text=text, avg_logprob=logprob, **extra)
+
+
+FAST = [
+    _seg(0.0, 4.0, " intro"),
+    _seg(4.0, 8.0, " mumble", logprob=-1.4),
+    _seg(8.0, 9.0, " ok"),
+    _seg(9.0, 12.0, " loop loop loop", compression_ratio=3.1),
+    _seg(12.0, 20.0, " clear ending"),
+]
+
+
+class _Fake:
+    def __init__(self, segments_for):
+        self.segments_for = segments_for
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append((len(audio) / SR, kwargs))
+        return {"language": "en", "text": "", "segments": self.segments_for(len(audio) / SR)}
+
+
+def test_flag_and_plan_regions():
+    assert flag_segments(FAST, CascadeThresholds()) == [1, 3]
+    # 1 s between the flagged segments: one region, the confident one inside included
+    assert plan_regions(FAST, [1, 3], merge_gap=2.0) == [(4.0, 12.0)]
+    assert plan_regions(FAST, [1, 3], merge_gap=0.5) == [(4.0, 8.0), (9.0, 12.0)]
+
+
+def test_anti_keywords_flag_segments():
+    glossary = compile_glossary(
+        {
+            "glossary": [
+                {
+                    "correct_term": "SWOOD",
+                    "detected_variants": ["s wood"],
+                    "anti_keywords": ["furniture"],
+                }
+            ]
+        }
+    )
+    segments = [
+        _seg(0, 1, " nice furniture"),
+        _seg(1, 2, " s wood design"),
+        _seg(2, 3, " s wood furniture"),
+    ]
+    # Only a variant next to its own entry's anti keyword is in doubt
+    assert flag_segments(segments, CascadeThresholds(), glossary) == [2]
+
+
+def test_shipped_glossary_does_not_flag_ordinary_text():
+    glossary = compile_glossary(
+        json.loads((PROJECT_ROOT / "SWOOD_Glossary.json").read_text(encoding="utf-8"))
+    )
+    ordinary = [
+        "As you can see, this is the model for the video.",
+        "He saves the file with the data for later.",
+        "Open the SWOOD software and select the panel.",
+        "Welcome to this s wood tutorial.",
+        "This would be a nice plywood shelf.",
+    ]
+    segments = [_seg(i, i + 1, " " + text) for i, text in enumerate(ordinary)]
+    # Only the "this would" next to its own anti keyword is escalated
+    assert flag_segments(segments, CascadeThresholds(), glossary) == [4]
+
+
+def test_cascade_splices_strong_segments_over_weak_regions():
+    fast = _Fake(lambda seconds: [dict(s) for s in FAST])
+    # The strong model sees the 4..12 s region padded by 0.5 s: clip times start at 3.5 s
+    strong = _Fake(lambda seconds: [_seg(0.5, 4.5, " clear words"), _seg(4.5, 8.5, " no loop")])
+    loads = []
+    cascade = CascadeTranscriber(fast, lambda: loads.append(1) or strong)
+
+    result = cascade.transcribe(np.zeros(20 * SR, np.float32), initial_prompt="SWOOD")
+    assert [(s["start"], s["end"], s["text"]) for s in result["segments"]] == [
+        (0.0, 4.0, " intro"),
+        (4.0, 8.0, " clear words"),
+        (8.0, 12.0, " no loop"),
+        (12.0, 20.0, " clear ending"),
+    ]
+    assert result["text"] == " intro clear words no loop clear ending"
+    assert [s["id"] for s in result["segments"]] == [0, 1, 2, 3]
+    assert result["cascade"] == {
+        "regions": 1,
+        "escalated_seconds": 8.0,
+        "escalated_share": 0.4,
+    }
+    seconds, kwargs = strong.calls[0]
+    assert seconds == 9.0
+    assert kwargs["language"] == "en" and kwargs["initial_prompt"] == "SWOOD  intro"
+
+
+def test_cascade_does_not_load_strong_model_when_fast_is_confident():
+    fast = _Fake(lambda seconds: [_seg(0.0, 5.0, " fine")])
+    loads = []
+    cascade = CascadeTranscriber(fast, lambda: loads.append(1))
+    result = cascade.transcribe(np.zeros(5 * SR, np.float32))
+    assert result["segments"][0]["text"] == " fine"
+    assert result["cascade"]["regions"] == 0
+    assert loads == []
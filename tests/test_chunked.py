@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe.chunked import SAMPLE_RATE, plan_chunks, stitch_segments
+
+
+def test_plan_chunks_cuts_at_quiet_points_and_covers_audio():
+    rng = np.random.default_rng(0)
+    audio = rng.uniform(-0.5, 0.5, 300 * SAMPLE_RATE).astype(np.float32)
+    # Silences near the nominal 100 s and 200 s cuts
+    for t in (102, 197):
+        audio[t * SAMPLE_RATE : t * SAMPLE_RATE + SAMPLE_RATE // 2] = 0.0
+
+    windows = plan_chunks(audio, chunk_seconds=100, overlap_seconds=2, search_seconds=5)
+
+    owned = [(a, b) for _, _, a, b in windows]
+    assert owned[0][0] == 0 and owned[-1][1] == len(audio)
+    assert all(b == a2 for (_, b), (a2, _) in zip(owned, owned[1:]))
+    cuts = [b / SAMPLE_RATE for _, b in owned[:-1]]
+    assert 102 <= cuts[0] <= 102.5
+    assert 197 <= cuts[1] <= 197.5
+    lo, hi, a, b = windows[1]
+    assert (a - lo, hi - b) == (2 * SAMPLE_RATE, 2 * SAMPLE_RATE)
+
+
+def test_stitch_segments_offsets_and_dedupes_overlap():
+    parts = [
+        # Window 0 owns [0, 60); decoded up to 65 s
+        (
+            0.0,
+            0.0,
+            60.0,
+            [
+                {"start": 0.0, "end": 30.0, "text": " a"},
+                {"start": 55.0, "end": 63.0, "text": " b"},
+                {"start": 61.0, "end": 65.0, "text": " c"},
+            ],
+        ),
+        # Window 1 starts at 55 s and owns [60, 90)
+        (
+            55.0,
+            60.0,
+            90.0,
+            [
+                {"start": 0.0, "end": 8.0, "text": " b"},
+                {"start": 6.0, "end": 10.0, "text": " c"},
+                {"start": 10.0, "end": 35.0, "text": " d"},
+            ],
+        ),
+    ]
+    merged = stitch_segments(parts)
+    assert [s["text"] for s in merged] == [" a", " b", " c", " d"]
+    assert [s["id"] for s in merged] == [0, 1, 2, 3]
+    assert (merged[2]["start"], merged[2]["end"]) == (61.0, 65.0)
+    assert merged[3]["start"] == 65.0
+
+
+def test_stitch_segments_matches_text_when_windows_split_the_seam_differently():
+    parts = [
+        (
+            0.0,
+            0.0,
+            60.0,
+            [
+                {"start": 50.0, "end": 57.0, "text": " open the"},
+                # Centered before the cut but runs past it
+                {"start": 57.0, "end": 61.0, "text": " SWOOD panel."},
+            ],
+        ),
+        (
+            55.0,
+            60.0,
+            90.0,
+            [
+                # Same words, split elsewhere: its second half repeats window 0
+                {"start": 0.0, "end": 3.0, "text": " the"},
+                {"start": 3.0, "end": 8.0, "text": " SWOOD panel, then"},
+                {"start": 8.0, "end": 12.0, "text": " save."},
+            ],
+        ),
+    ]
+    merged = stitch_segments(parts)
+    assert "".join(s["text"] for s in merged) == " open the SWOOD panel. then save."
+    assert [(s["start"], s["end"]) for s in merged][2:] == [(61.0, 63.0), (63.0, 67.0)]
+
+
+def test_stitch_segments_keeps_words_centered_after_the_seam():
+    parts = [
+        # Window 0 ends its last segment right before the cut
+        (0.0, 0.0, 60.0, [{"start": 55.0, "end": 59.0, "text": " cut the"}]),
+        # Window 1 has one segment across the cut, with other words
+        (
+            55.0,
+            60.0,
+            90.0,
+            [
+                {
+                    "start": 2.0,
+                    "end": 7.0,
+                    "text": " cuts a board",
+                    "words": [
+                        {"word": " cuts", "start": 2.0, "end": 3.5},
+                        {"word": " a", "start": 4.2, "end": 4.5},
+                        {"word": " board", "start": 4.5, "end": 7.0},
+                    ],
+                },
+            ],
+        ),
+    ]
+    merged = stitch_segments(parts)
+    assert [s["text"] for s in merged] == [" cut the", " a board"]
+    assert merged[1]["start"] == 59.2
+    assert [w["word"] for w in merged[1]["words"]] == [" a", " board"]
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe.fingerprint import (
+    compute_fingerprint,
+    fingerprint_index_for,
+    shift_result,
+)
+from yt_whisper_scribe.pipeline import transcribe_downloaded
+from yt_whisper_scribe.result_cache import ResultCache
+
+SR = 16000
+
+
+def _audio(seconds: float, seed: int) -> np.ndarray:
+    """Speech-like test signal: short bursts of random tones over light noise."""
+    rng = np.random.default_rng(seed)
+    out = np.zeros(int(seconds * SR), np.float32)
+    pos = 0
+    while pos < len(out):
+        n = min(int(rng.uniform(0.08, 0.3) * SR), len(out) - pos)
+        t = np.arange(n) / SR
+        burst = sum(
+            rng.uniform(0.2, 1.0) * np.sin(2 * np.pi * rng.uniform(150, 3000) * t) for _ in range(3)
+        )
+        out[pos : pos + n] = burst * np.hanning(n)
+        pos += n
+    return out + 0.02 * rng.standard_normal(len(out)).astype(np.float32)
+
+
+def test_cut_of_indexed_audio_matches_at_its_offset(tmp_path):
+    index = fingerprint_index_for(str(tmp_path))
+    stream = _audio(240, seed=1)
+    index.add("stream", compute_fingerprint(stream))
+    index.add("other", compute_fingerprint(_audio(120, seed=2)))
+
+    # A 40 s cut, not frame-aligned, quieter and with extra noise
+    rng = np.random.default_rng(3)
+    cut = stream[int(97.31 * SR) : int(137.31 * SR)] * 0.5
+    cut = cut + 0.03 * rng.standard_normal(len(cut)).astype(np.float32)
+    matches = index.matches(compute_fingerprint(cut))
+    assert [m.video_id for m in matches] == ["stream"]
+    assert abs(matches[0].offset - 97.31) < 0.1
+
+    assert index.matches(compute_fingerprint(_audio(40, seed=4))) == []
+    assert index.matches(compute_fingerprint(stream), exclude="stream") == []
+
+
+def test_shift_result_keeps_and_retimes_the_covered_segments():
+    result = {
+        "language": "en",
+        "segments": [
+            {"id": 0, "start": 0.0, "end": 9.0, "text": " before"},
+            {"id": 1, "start": 9.0, "end": 12.0, "text": " edge"},
+            {
+                "id": 2,
+                "start": 12.0,
+                "end": 15.0,
+                "text": " inside",
+                "words": [{"word": " inside", "start": 12.5, "end": 13.0}],
+            },
+            {"id": 3, "start": 19.0, "end": 25.0, "text": " after"},
+        ],
+    }
+    shifted = shift_result(result, 10.0, 10.0)
+    assert shifted["text"] == " edge inside"
+    assert [(s["id"], s["start"], s["end"]) for s in shifted["segments"]] == [
+        (0, 0.0, 2.0),
+        (1, 2.0, 5.0),
+    ]
+    assert shifted["segments"][1]["words"] == [{"word": " inside", "start": 2.5, "end": 3.0}]
+
+
+class _Model:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def transcribe(self, audio, **kwargs):
+        self.calls += 1
+        n = len(audio) / SR
+        return {
+            "text": "",
+            "language": "en",
+            "segments": [
+                {"id": i, "start": float(s), "end": float(s + 10), "text": f" part {s}"}
+                for i, s in enumerate(range(0, int(n), 10))
+            ],
+        }
+
+
+def test_reupload_reuses_the_cached_result(tmp_path):
+    cache = ResultCache(str(tmp_path / "results"))
+    index = fingerprint_index_for(cache.root)
+    model = _Model()
+    stream = _audio(120, seed=5)
+    (tmp_path / "out").mkdir()
+    options = dict(
+        whisper_model=model,
+        device="cpu",
+        output_dir=str(tmp_path / "out"),
+        output_format="txt",
+        replace_map=None,
+        result_cache=cache,
+        fingerprints=index,
+    )
+    transcribe_downloaded({"id": "streamAAAAA", "title": "s"}, stream, **options)
+    assert model.calls == 1
+
+    captured = {}
+    transcribe_downloaded(
+        {"id": "shortBBBBBB", "title": "short"},
+        stream[30 * SR : 60 * SR],
+        on_result=captured.update,
+        **options,
+    )
+    assert model.calls == 1
+    assert [s["text"] for s in captured["segments"]] == [" part 30", " part 40", " part 50"]
+    assert captured["segments"][0]["start"] == 0.0
+    assert (tmp_path / "results" / "shortBBBBBB").is_dir()
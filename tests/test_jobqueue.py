@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe import jobqueue
+from yt_whisper_scribe.jobqueue import JobQueue, run_worker
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(jobqueue.time, "time", clock)
+    return clock
+
+
+def test_enqueue_ignores_duplicates_and_rejects_unknown_options(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    assert queue.enqueue(["u1", "u2"], {"model": "tiny"}) == 2
+    assert queue.enqueue(["u1", "u3"], {"model": "tiny"}) == 1
+    assert queue.enqueue(["u1"], {"model": "small"}) == 1
+    assert queue.counts()["queued"] == 4
+    with pytest.raises(ValueError):
+        queue.enqueue(["u4"], {"output_dir": "/tmp"})
+
+
+def test_expired_lease_is_reclaimed_until_attempts_run_out(tmp_path, clock):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"), lease_seconds=60)
+    queue.enqueue(["u1"], max_attempts=2)
+
+    job = queue.claim("dead")
+    assert job.attempts == 1
+    assert queue.claim("other") is None
+    clock.now += 30
+    assert queue.renew(job.id, "dead")
+    clock.now += 61  # the worker died: no renewal
+
+    again = queue.claim("other")
+    assert (again.id, again.attempts) == (job.id, 2)
+    assert not queue.renew(job.id, "dead")
+    clock.now += 61
+    assert queue.claim("third") is None
+    assert queue.counts()["failed"] == 1
+    assert "bail expiré" in queue.jobs("failed")[0]["error"]
+
+
+def test_failed_attempt_is_retried_after_backoff(tmp_path, clock):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    queue.enqueue(["u1"], max_attempts=2)
+    job = queue.claim("w")
+    assert queue.fail(job, "w", "boom") == "queued"
+    assert queue.claim("w") is None  # not before the backoff delay
+    clock.now += 30
+    job = queue.claim("w")
+    assert queue.fail(job, "w", "boom") == "failed"
+    assert queue.requeue_failed() == 1
+    assert queue.claim("w").attempts == 1
+
+
+def test_worker_runs_jobs_and_records_results(tmp_path, monkeypatch):
+    loads = []
+    monkeypatch.setattr(jobqueue, "resolve_device", lambda device: "cpu")
+    monkeypatch.setattr(
+        jobqueue, "load_transcriber", lambda model, device, **kw: loads.append(model) or model
+    )
+
+    def _transcribe(url, *, model, whisper_model, session, **options):
+        assert whisper_model == model and options["output_dir"] == str(tmp_path)
+        if url == "bad":
+            raise SystemExit(3)
+        return str(tmp_path / f"{url}.srt")
+
+    monkeypatch.setattr(jobqueue, "transcribe_youtube", _transcribe)
+    db = str(tmp_path / "jobs.sqlite")
+    queue = JobQueue(db)
+    queue.enqueue(["a", "b"], {"model": "tiny"})
+    queue.enqueue(["bad"], {"model": "tiny"}, max_attempts=1)
+
+    assert run_worker(db, exit_when_empty=True, output_dir=str(tmp_path), device="cpu") == 3
+    assert loads == ["tiny"]  # loaded once for all jobs
+    assert queue.counts() == {"queued": 0, "running": 0, "done": 2, "failed": 1}
+    done = queue.jobs("done")
+    assert json.loads(done[0]["result"]) == {"output_path": str(tmp_path / "a.srt")}
+    assert queue.jobs("failed")[0]["error"] == "code de sortie 3"
+
+
+def test_worker_exit_when_empty_waits_for_retries(tmp_path, monkeypatch, clock):
+    monkeypatch.setattr(jobqueue, "resolve_device", lambda device: "cpu")
+    monkeypatch.setattr(jobqueue, "load_transcriber", lambda model, device, **kw: model)
+    sleeps = []
+
+    def _sleep(seconds):
+        sleeps.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(jobqueue.time, "sleep", _sleep)
+    attempts = []
+
+    def _transcribe(url, **options):
+        attempts.append(url)
+        if len(attempts) == 1:
+            raise RuntimeError("HTTP Error 429")
+        return str(tmp_path / f"{url}.srt")
+
+    monkeypatch.setattr(jobqueue, "transcribe_youtube", _transcribe)
+    db = str(tmp_path / "jobs.sqlite")
+    queue = JobQueue(db)
+    queue.enqueue(["a"], max_attempts=2)
+
+    assert run_worker(db, exit_when_empty=True, output_dir=str(tmp_path), device="cpu") == 2
+    assert attempts == ["a", "a"]
+    assert queue.counts()["done"] == 1
+    # Slept through the retry delay (15-30 s) in poll-sized steps
+    assert 15.0 <= sum(sleeps) <= 30.0 + 0.1
+    assert queue.next_claim_delay() is None
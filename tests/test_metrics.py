@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe.metrics import JobMetrics, MetricsSink
+
+
+def test_job_metrics_record_and_export(tmp_path):
+    metrics = JobMetrics(model="small", video_id="abc")
+    with metrics.stage("transcribe"):
+        time.sleep(0.01)
+    with metrics.stage("write"):
+        pass
+    metrics.set("audio_seconds", 60.0)
+    metrics.set("download_retries", 1)
+    metrics.add("replacements", 2)
+    metrics.add("replacements", 3)
+
+    record = metrics.record("ok")
+    assert record["model"] == "small" and record["video_id"] == "abc" and record["host"]
+    assert record["stages"]["transcribe"] >= 0.01
+    assert record["realtime_factor"] > 0
+    assert record["replacements"] == 5
+
+    jsonl, prom = tmp_path / "m.jsonl", tmp_path / "m.prom"
+    sink = MetricsSink(str(jsonl), str(prom))
+    sink.emit(record)
+    sink.emit(metrics.record("error"))
+
+    lines = jsonl.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["status"] for line in lines] == ["ok", "error"]
+    text = prom.read_text(encoding="utf-8")
+    assert 'yt_whisper_stage_seconds{host="' in text and 'stage="transcribe"} ' in text
+    assert text.count("# TYPE yt_whisper_stage_seconds gauge") == 1
+    assert 'yt_whisper_download_retries{host="' in text
+    # The textfile holds the last job only
+    assert "yt_whisper_last_job_success{" in text
+    success = [line for line in text.splitlines() if line.startswith("yt_whisper_last_job_success")]
+    assert [line.split()[-1] for line in success] == ["0.0"]
+    assert not MetricsSink()
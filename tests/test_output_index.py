@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe.output_index import OutputIndex, video_id_from_url
+
+
+def test_video_id_from_url_shapes():
+    assert video_id_from_url("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=3") == "dQw4w9WgXcQ"
+    assert video_id_from_url("https://youtu.be/dQw4w9WgXcQ?si=x") == "dQw4w9WgXcQ"
+    assert video_id_from_url("https://youtube.com/shorts/dQw4w9WgXcQ") == "dQw4w9WgXcQ"
+    assert video_id_from_url("https://www.youtube.com/playlist?list=PL123") is None
+    assert video_id_from_url("https://vimeo.com/12345") is None
+
+
+def test_output_index_scans_existing_files_and_records(tmp_path):
+    (tmp_path / "My-Video-dQw4w9WgXcQ.en.srt").write_text("1\n", encoding="utf-8")
+    index = OutputIndex(str(tmp_path))
+
+    assert index.lookup("dQw4w9WgXcQ", "srt", "en").endswith("My-Video-dQw4w9WgXcQ.en.srt")
+    assert index.lookup("dQw4w9WgXcQ", "srt") is not None  # --language auto
+    assert index.lookup("dQw4w9WgXcQ", "txt") is None
+    assert index.lookup("dQw4w9WgXcQ", "srt", "fr") is None
+
+    out = tmp_path / "Other-abcdefghijk.fr.txt"
+    out.write_text("x", encoding="utf-8")
+    index.record("abcdefghijk", str(out), "fr", "txt")
+    # Persisted for the next run
+    assert OutputIndex(str(tmp_path)).lookup("abcdefghijk", "txt", "fr") == str(out)
+    out.unlink()
+    assert OutputIndex(str(tmp_path)).lookup("abcdefghijk", "txt", "fr") is None
@@ -0,0 +1,126 @@
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe import pipeline
+from yt_whisper_scribe.download import DownloadError
+
+
+class _FakeTranscriber:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_job(tmp_path, monkeypatch):
+    """transcribe_youtube with a fake model loader, download and transcription."""
+    state = {"loaded": [], "used": [], "download_error": None}
+    load_started = threading.Event()
+
+    def load_transcriber(model, device, **kwargs):
+        load_started.set()
+        transcriber = _FakeTranscriber()
+        state["loaded"].append(transcriber)
+        return transcriber
+
+    def download_audio(url, output_template, **kwargs):
+        # The model load is already running while the audio downloads
+        state["overlapped"] = load_started.wait(5)
+        if state["download_error"] is not None:
+            raise state["download_error"]
+        audio_path = output_template + ".m4a"
+        Path(audio_path).write_bytes(b"audio")
+        return {"id": "abc", "title": "Demo"}, audio_path
+
+    def transcribe_downloaded(info_dict, audio, *, whisper_model, **kwargs):
+        state["used"].append(whisper_model)
+        return str(tmp_path / "Demo-abc.en.srt")
+
+    monkeypatch.setattr(pipeline, "resolve_device", lambda device: "cpu")
+    monkeypatch.setattr(pipeline, "check_ffmpeg", lambda: None)
+    monkeypatch.setattr(pipeline, "load_transcriber", load_transcriber)
+    monkeypatch.setattr(pipeline, "download_audio", download_audio)
+    monkeypatch.setattr(pipeline, "transcribe_downloaded", transcribe_downloaded)
+    return tmp_path, state
+
+
+def _wait_closed(transcriber, timeout=5.0):
+    # discard_model_load closes a running load from a callback, not inline
+    deadline = time.monotonic() + timeout
+    while not transcriber.closed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return transcriber.closed
+
+
+def test_transcribe_youtube_loads_model_during_download(fake_job):
+    tmp_path, state = fake_job
+    output = pipeline.transcribe_youtube("https://youtu.be/abc", output_dir=str(tmp_path))
+    assert output == str(tmp_path / "Demo-abc.en.srt")
+    assert state["overlapped"]
+    assert len(state["loaded"]) == 1 and state["used"] == state["loaded"]
+    assert state["loaded"][0].closed
+    assert not list(tmp_path.glob(".job-*"))
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [(DownloadError("403"), SystemExit), (KeyboardInterrupt(), KeyboardInterrupt)],
+)
+def test_transcribe_youtube_releases_model_when_download_fails(fake_job, error, expected):
+    tmp_path, state = fake_job
+    state["download_error"] = error
+    with pytest.raises(expected):
+        pipeline.transcribe_youtube("https://youtu.be/abc", output_dir=str(tmp_path))
+    assert state["used"] == []
+    assert len(state["loaded"]) == 1 and _wait_closed(state["loaded"][0])
+
+
+def test_discard_model_load_ignores_failed_load():
+    future = Future()
+    future.set_exception(RuntimeError("CUDA out of memory"))
+    pipeline.discard_model_load(future)
+
+
+def test_discard_model_load_does_not_wait_for_a_running_load():
+    future = Future()
+    future.set_running_or_notify_cancel()
+    pipeline.discard_model_load(future)
+
+    transcriber = _FakeTranscriber()
+    future.set_result(transcriber)
+    assert transcriber.closed
+
+
+def test_discard_model_load_cancels_a_load_not_begun():
+    future = Future()
+    pipeline.discard_model_load(future)
+    assert future.cancelled()
+
+
+def test_load_transcriber_warms_up_chunked_workers(monkeypatch):
+    from yt_whisper_scribe import chunked
+
+    class FakeChunked(_FakeTranscriber):
+        def __init__(self, model, **kwargs):
+            super().__init__()
+            self.warmed = False
+
+        def warm_up(self):
+            self.warmed = True
+
+    monkeypatch.setattr(chunked, "ChunkedTranscriber", FakeChunked)
+    assert pipeline.load_transcriber("small", "cpu", cpu_workers=2, warm_up=True).warmed
+    assert not pipeline.load_transcriber("small", "cpu", cpu_workers=2).warmed
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import stat
+import sys
+from pathlib import Path
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe.recorrect import STAMPS_FILENAME, recorrect_corpus
+from yt_whisper_scribe.srt import generate_srt_content, parse_srt
+
+SEGMENTS = [
+    {"start": 0.0, "end": 1.5, "text": " open s"},
+    {"start": 1.5, "end": 3723.004, "text": " wood design"},
+    {"start": 3723.004, "end": 3724.0, "text": ""},
+    {"start": 3724.0, "end": 3725.0, "text": " done"},
+]
+
+
+def test_parse_srt_round_trips_generate_srt_content():
+    content = generate_srt_content({"segments": SEGMENTS})
+    store = parse_srt(content)
+    assert list(store.ends) == [1.5, 3723.004, 3724.0, 3725.0]
+    assert store.texts == ["open s", "wood design", "", "done"]
+    assert generate_srt_content({"segments": store}) == content
+    # BOM and CRLF, as written on Windows
+    assert parse_srt("\ufeff" + content.replace("\n", "\r\n")).texts == store.texts
+
+
+def _corpus(tmp_path: Path) -> tuple[Path, Path]:
+    data = tmp_path / "data"
+    (data / "sub").mkdir(parents=True)
+    (data / "A-aaaaaaaaaaa.en.srt").write_text(
+        generate_srt_content({"segments": SEGMENTS}), encoding="utf-8"
+    )
+    (data / "sub" / "B-bbbbbbbbbbb.en.txt").write_bytes(b"nothing to fix\r\n")
+    (data / "sub" / "C-ccccccccccc.en.txt").write_text("we use swood today", encoding="utf-8")
+    glossary = tmp_path / "g.json"
+    glossary.write_text(
+        json.dumps(
+            {
+                "glossary": [
+                    {"correct_term": "SWOOD Design", "detected_variants": ["s wood design"]},
+                    {"correct_term": "SWOOD", "detected_variants": ["swood"]},
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    return data, glossary
+
+
+def test_recorrect_corpus_rewrites_changed_files_and_stamps(tmp_path):
+    data, glossary = _corpus(tmp_path)
+    untouched = (data / "sub" / "B-bbbbbbbbbbb.en.txt").stat().st_mtime_ns
+
+    summary = recorrect_corpus(str(data), str(glossary), workers=2)
+    assert summary["changed"] == 2 and summary["unchanged"] == 1 and summary["error"] == 0
+    assert parse_srt((data / "A-aaaaaaaaaaa.en.srt").read_text(encoding="utf-8")).texts[:2] == [
+        "open SWOOD Design",
+        "",
+    ]
+    assert (data / "sub" / "C-ccccccccccc.en.txt").read_text(
+        encoding="utf-8"
+    ) == "we use SWOOD today"
+    assert (data / "sub" / "B-bbbbbbbbbbb.en.txt").stat().st_mtime_ns == untouched
+    assert (data / STAMPS_FILENAME).exists()
+    assert not list(data.rglob("*.tmp"))
+
+    # Same glossary: everything is skipped
+    assert recorrect_corpus(str(data), str(glossary), workers=1)["skipped"] == 3
+
+    # A file rewritten since its stamp, or a new glossary, is processed again
+    (data / "sub" / "C-ccccccccccc.en.txt").write_text("swood again", encoding="utf-8")
+    summary = recorrect_corpus(str(data), str(glossary), workers=1)
+    assert (summary["skipped"], summary["changed"]) == (2, 1)
+    glossary.write_text(glossary.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    assert recorrect_corpus(str(data), str(glossary), workers=1)["skipped"] == 0
+
+
+def test_recorrect_dry_run_writes_nothing(tmp_path):
+    data, glossary = _corpus(tmp_path)
+    before = (data / "A-aaaaaaaaaaa.en.srt").read_text(encoding="utf-8")
+    summary = recorrect_corpus(str(data), str(glossary), dry_run=True)
+    assert summary["changed"] == 2
+    assert (data / "A-aaaaaaaaaaa.en.srt").read_text(encoding="utf-8") == before
+    assert not (data / STAMPS_FILENAME).exists()
+
+
+def test_recorrect_keeps_permissions_and_stamps_context_window(tmp_path):
+    data, glossary = _corpus(tmp_path)
+    target = data / "sub" / "C-ccccccccccc.en.txt"
+    target.chmod(0o640)
+
+    assert recorrect_corpus(str(data), str(glossary), workers=1)["changed"] == 2
+    assert stat.S_IMODE(target.stat().st_mode) == 0o640
+
+    # Another context window can decide differently: nothing is skipped
+    summary = recorrect_corpus(str(data), str(glossary), workers=1, context_window=None)
+    assert summary["skipped"] == 0
+    summary = recorrect_corpus(str(data), str(glossary), workers=1, context_window=None)
+    assert summary["skipped"] == 3
+
+
+def test_recorrect_only_touches_transcript_outputs(tmp_path):
+    data, glossary = _corpus(tmp_path)
+    cookies = "# Netscape HTTP Cookie File\n.youtube.com\tTRUE\t/\tTRUE\t0\tswood\t1\n"
+    (data / "cookies.txt").write_text(cookies, encoding="utf-8")
+    (data / "vocab.txt").write_text("swood\n", encoding="utf-8")
+
+    assert recorrect_corpus(str(data), str(glossary), workers=1)["changed"] == 2
+    assert (data / "cookies.txt").read_text(encoding="utf-8") == cookies
+    assert (data / "vocab.txt").read_text(encoding="utf-8") == "swood\n"
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import json
+import os
+import random
 import sys
 from pathlib import Path
 
@@ -9,7 +12,13 @@ SRC_PATH = PROJECT_ROOT / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
 
-from yt_whisper_scribe.replace import apply_glossary_replacements
+from yt_whisper_scribe import replace
+from yt_whisper_scribe.replace import (
+    StreamingReplacer,
+    apply_glossary_replacements,
+    compiled_cache_path,
+    load_compiled_glossary,
+)
 
 
 def _glossary(correct: str, variants: list[str]) -> dict:
@@ -39,3 +48,296 @@ def test_replace_cross_boundary_spanning_two_segments():
     assert new_segments[0]["text"].endswith("SWOOD")  # replacement placed in left segment
     assert new_segments[1]["text"].startswith(" box module")  # overlap removed from right
     assert any(e.kind == "cross_boundary" for e in events)
+
+
+def test_replace_longest_match_wins_on_overlap():
+    # "as wood design" (longest) must win over "as wood" and "s wood"
+    glossary = {
+        "glossary": [
+            {"correct_term": "SWOOD", "detected_variants": ["s wood", "as wood"]},
+            {"correct_term": "SWOOD Design", "detected_variants": ["as wood design"]},
+        ]
+    }
+    segments = [{"start": 0.0, "end": 1.0, "text": "open As Wood design, then s wood cam"}]
+    new_segments, events = apply_glossary_replacements(segments, glossary)
+
+    assert new_segments[0]["text"] == "open SWOOD Design, then SWOOD cam"
+    assert [e.correct_term for e in events] == ["SWOOD", "SWOOD Design"]
+    assert events[-1].after == new_segments[0]["text"]
+
+
+def test_replace_respects_word_boundaries_and_punctuation():
+    glossary = _glossary("report.cfg", ["report that's cfg", "report.cfj"])
+    segments = [
+        {"start": 0.0, "end": 1.0, "text": "edit the report.cfj file"},
+        {"start": 1.0, "end": 2.0, "text": "the report.cfjx and report that's cfg"},
+    ]
+    new_segments, _ = apply_glossary_replacements(segments, glossary)
+
+    assert new_segments[0]["text"] == "edit the report.cfg file"
+    assert new_segments[1]["text"] == "the report.cfjx and report.cfg"
+
+
+def test_compiled_glossary_cached_in_memory_and_on_disk(tmp_path):
+    path = tmp_path / "glossary.json"
+    path.write_text(json.dumps(_glossary("SWOOD", ["s wood"])), encoding="utf-8")
+
+    compiled = load_compiled_glossary(path)
+    assert load_compiled_glossary(path) is compiled
+    assert compiled_cache_path(path).exists()
+
+    # Same content from another process: the artifact is reused by hash
+    replace._compiled_cache.clear()
+    reloaded = load_compiled_glossary(path)
+    assert reloaded.sha256 == compiled.sha256
+    segments = [{"start": 0.0, "end": 1.0, "text": "s wood"}]
+    assert apply_glossary_replacements(segments, reloaded)[0][0]["text"] == "SWOOD"
+
+    # Content change invalidates both caches
+    path.write_text(json.dumps(_glossary("SWOOD CAM", ["s wood"])), encoding="utf-8")
+    os.utime(path, ns=(0, 0))
+    updated = load_compiled_glossary(path)
+    assert updated.sha256 != compiled.sha256
+    assert apply_glossary_replacements(segments, updated)[0][0]["text"] == "SWOOD CAM"
+
+
+def test_replace_cross_boundary_spanning_three_segments():
+    segments = [
+        {"start": 0.0, "end": 1.0, "text": "open s wood"},
+        {"start": 1.0, "end": 1.5, "text": " as"},
+        {"start": 1.5, "end": 2.0, "text": " wood"},
+        {"start": 2.0, "end": 3.0, "text": " design now, s wood"},
+    ]
+    glossary = {
+        "glossary": [
+            {"correct_term": "SWOOD", "detected_variants": ["s wood"]},
+            {"correct_term": "SWOOD Design", "detected_variants": ["as wood design"]},
+        ]
+    }
+    new_segments, events = apply_glossary_replacements(segments, glossary)
+
+    assert [s["text"] for s in new_segments] == ["open SWOOD", " SWOOD Design", "", " now, SWOOD"]
+    cross = [e for e in events if e.kind == "cross_boundary"]
+    assert [(e.segment_index, e.next_segment_index) for e in cross] == [(1, 3)]
+
+
+def test_streaming_replacer_matches_whole_transcript():
+    glossary = {
+        "glossary": [
+            {"correct_term": "SWOOD Design", "detected_variants": ["s wood design"]},
+            {"correct_term": "SWOOD", "detected_variants": ["s wood", "swood"]},
+            {"correct_term": "Nesting", "detected_variants": ["nest ting"]},
+        ]
+    }
+    texts = ["open s", "wood", "design and", "nest", "ting in swood", "then s wood", "end"]
+    segments = [{"start": float(i), "end": i + 1.0, "text": t} for i, t in enumerate(texts)]
+    expected, expected_events = apply_glossary_replacements(segments, glossary)
+
+    # Feed in uneven windows, as Whisper would deliver them
+    replacer = StreamingReplacer(glossary)
+    out, events = [], []
+    for lo, hi in ((0, 1), (1, 2), (2, 5), (5, 7)):
+        released, new_events = replacer.feed(segments[lo:hi])
+        out.extend(released)
+        events.extend(new_events)
+    released, new_events = replacer.flush()
+    out.extend(released)
+    events.extend(new_events)
+
+    assert [s["text"] for s in out] == [s["text"] for s in expected]
+    key = lambda e: (e.segment_index, e.kind, e.correct_term)  # noqa: E731
+    assert sorted(map(key, events)) == sorted(map(key, expected_events))
+
+
+GATED_GLOSSARY = {
+    "glossary": [
+        {
+            "correct_term": "SWOOD",
+            "detected_variants": ["swood", "this would", "suit"],
+            "confidence_keywords": ["software", "cam", "report center"],
+            "anti_keywords": ["hardwood", "plywood", "this", "jacket"],
+        }
+    ]
+}
+
+
+def _texts(texts: list[str], context_window=1) -> list[str]:
+    segments = [{"start": float(i), "end": i + 1.0, "text": t} for i, t in enumerate(texts)]
+    out, _ = apply_glossary_replacements(segments, GATED_GLOSSARY, context_window=context_window)
+    return [s["text"] for s in out]
+
+
+def test_context_keywords_gate_risky_variants():
+    # Anti keyword in a neighbouring segment, none of the confidence keywords
+    assert _texts(["a new suit", "and a jacket"]) == ["a new suit", "and a jacket"]
+    # Outweighed by confidence keywords (including a multi-word one)
+    assert _texts(["open the report center", "the suit", "plywood"]) == [
+        "open the report center",
+        "the SWOOD",
+        "plywood",
+    ]
+    # Outside the window: not counted
+    assert _texts(["jacket", "x", "the suit software"]) == ["jacket", "x", "the SWOOD software"]
+    # No context evidence either way: applied
+    assert _texts(["suit the machine"]) == ["SWOOD the machine"]
+    # "this" inside the match counts against it
+    assert _texts(["this would open"]) == ["this would open"]
+    assert _texts(["this would work in swood"]) == ["this would work in SWOOD"]
+    # ... but only there: a variant word near another variant is no evidence
+    assert _texts(["in this", "suit"]) == ["in this", "SWOOD"]
+    # A tie with one confidence keyword is applied
+    assert _texts(["this would", "cam"]) == ["SWOOD", "cam"]
+    assert _texts(["this would", "plywood cam"]) == ["this would", "plywood cam"]
+    # Already spelled like the term: always applied
+    assert _texts(["swood and plywood"]) == ["SWOOD and plywood"]
+    # Gating disabled
+    assert _texts(["a new suit", "and a jacket"], context_window=None)[0] == "a new SWOOD"
+
+
+def test_context_gate_treats_anti_keywords_inside_matches_consistently():
+    glossary = {
+        "glossary": [
+            {
+                "correct_term": "SWOOD",
+                "detected_variants": ["s wood", "as wood"],
+                "confidence_keywords": ["software"],
+                "anti_keywords": ["as"],
+            }
+        ]
+    }
+    segments = [
+        {"start": 0.0, "end": 1.0, "text": "I use s wood daily"},
+        {"start": 1.0, "end": 2.0, "text": "as wood is fine"},
+    ]
+    out, _ = apply_glossary_replacements(segments, glossary)
+    assert [s["text"] for s in out] == ["I use SWOOD daily", "as wood is fine"]
+    segments.append({"start": 2.0, "end": 3.0, "text": "the software"})
+    out, _ = apply_glossary_replacements(segments, glossary)
+    assert [s["text"] for s in out] == ["I use SWOOD daily", "SWOOD is fine", "the software"]
+
+
+def test_context_gate_keeps_real_corrections_with_shipped_glossary():
+    glossary = json.loads((PROJECT_ROOT / "SWOOD_Glossary.json").read_text(encoding="utf-8"))
+    sentences = {
+        "Welcome to this s wood tutorial.": "Welcome to this SWOOD tutorial.",
+        "Now open the solid works add in.": "Now open the SolidWorks add in.",
+        "Open the s wood box and pick your hinge.": "Open the SWOODBox and pick your hinge.",
+        "Expand the feature manager on the left.": "Expand the FeatureManager on the left.",
+        "Then export the toolpath with the post processor.": (
+            "Then export the toolpath with the Post-Processor."
+        ),
+        # Evidence against the correction
+        "This would be a nice plywood shelf.": "This would be a nice plywood shelf.",
+        "He would rather edit the photo with the post processor.": (
+            "He would rather edit the photo with the post processor."
+        ),
+    }
+    segments = [{"start": 0.0, "end": 1.0, "text": text} for text in sentences]
+    for text, expected in sentences.items():
+        out, _ = apply_glossary_replacements([{"start": 0.0, "end": 1.0, "text": text}], glossary)
+        assert out[0]["text"] == expected
+    # Same verdicts as with gating off, except where the context says no
+    ungated, _ = apply_glossary_replacements(segments, glossary, context_window=None)
+    assert [s["text"] for s in ungated][:5] == list(sentences.values())[:5]
+
+
+def test_streaming_replacer_gates_like_whole_transcript():
+    texts = ["jacket", "the suit", "x", "y", "suit of", "cam", "hardwood", "this would", "z"]
+    segments = [{"start": float(i), "end": i + 1.0, "text": t} for i, t in enumerate(texts)]
+    expected, _ = apply_glossary_replacements(segments, GATED_GLOSSARY)
+
+    replacer = StreamingReplacer(GATED_GLOSSARY)
+    out = []
+    for i in range(len(segments)):
+        out.extend(replacer.feed(segments[i : i + 1])[0])
+    out.extend(replacer.flush()[0])
+    assert [s["text"] for s in out] == [s["text"] for s in expected]
+    assert [s["text"] for s in expected][1] == "the suit"
+
+
+def _stream(segments, glossary, chunks, **kwargs):
+    replacer = StreamingReplacer(glossary, **kwargs)
+    out, i = [], 0
+    for size in chunks:
+        out.extend(replacer.feed(segments[i : i + size])[0])
+        i += size
+    out.extend(replacer.flush()[0])
+    return [s["text"] for s in out]
+
+
+def test_streaming_replacer_waits_for_right_context_of_rejected_cross_match():
+    texts = ["plywood this", "would x y z w", "software cam"]
+    segments = [{"start": float(i), "end": i + 1.0, "text": t} for i, t in enumerate(texts)]
+    expected, _ = apply_glossary_replacements(segments, GATED_GLOSSARY)
+    assert [s["text"] for s in expected] == ["plywood SWOOD", " x y z w", "software cam"]
+    assert _stream(segments, GATED_GLOSSARY, [1, 1, 1]) == [s["text"] for s in expected]
+
+
+def test_streaming_replacer_equals_whole_transcript_for_random_chunkings():
+    glossary = {
+        "glossary": [
+            dict(
+                GATED_GLOSSARY["glossary"][0],
+                detected_variants=["swood", "this would", "suit", "s wood", "as wood"],
+                anti_keywords=["hardwood", "plywood", "this", "as"],
+            ),
+            {
+                "correct_term": "SWOOD Design",
+                "detected_variants": ["s wood design", "this would design"],
+                "confidence_keywords": ["panel"],
+                "anti_keywords": ["camera"],
+            },
+            {"correct_term": "Nesting", "detected_variants": ["nest ting"]},
+        ]
+    }
+    vocab = (
+        "this would suit s wood as design nest ting software cam report center "
+        "plywood hardwood panel camera x"
+    ).split()
+    rng = random.Random(0)
+    for _ in range(400):
+        texts = [
+            " ".join(rng.choice(vocab) for _ in range(rng.randint(0, 3)))
+            for _ in range(rng.randint(1, 10))
+        ]
+        segments = [{"start": float(i), "end": i + 1.0, "text": t} for i, t in enumerate(texts)]
+        chunks = [rng.randint(1, 3) for _ in texts]
+        for window in (None, 1, 3):
+            expected, _ = apply_glossary_replacements(segments, glossary, context_window=window)
+            assert _stream(segments, glossary, chunks, context_window=window) == [
+                s["text"] for s in expected
+            ], (texts, chunks, window)
+
+
+def test_events_render_before_after_lazily():
+    glossary = {
+        "glossary": [
+            {"correct_term": "SWOOD Design", "detected_variants": ["s wood design"]},
+            {"correct_term": "SWOOD", "detected_variants": ["s wood", "swood"]},
+        ]
+    }
+    texts = ["open s", "wood design and swood", "x s", "wood b s", "wood"]
+    segments = [{"start": float(i), "end": i + 1.0, "text": t} for i, t in enumerate(texts)]
+    new_segments, events = apply_glossary_replacements(segments, glossary)
+
+    assert [s["text"] for s in new_segments] == [
+        "open SWOOD Design",
+        " and SWOOD",
+        "x SWOOD",
+        " b SWOOD",
+        "",
+    ]
+    rendered = [(e.kind, e.segment_index, e.before, e.after) for e in events]
+    assert rendered == [
+        ("segment", 1, "wood design and swood", "wood design and SWOOD"),
+        ("cross_boundary", 0, "open s | wood design and SWOOD", "open SWOOD Design |  and SWOOD"),
+        ("cross_boundary", 2, "x s | wood b s", "x SWOOD |  b s"),
+        ("cross_boundary", 3, " b s | wood", " b SWOOD | "),
+    ]
+    # Events hold offsets and ids, not text copies
+    assert not hasattr(events[0], "__dict__")
+
+    counted, counts = apply_glossary_replacements(segments, glossary, counts_only=True)
+    assert counted == new_segments
+    assert (counts.total, counts.cross_boundary) == (4, 3)
+    assert counts.by_term == {"SWOOD": 3, "SWOOD Design": 1}
@@ -0,0 +1,116 @@
+import json
+import sys
+from pathlib import Path
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe.pipeline import rerender_cached
+from yt_whisper_scribe.result_cache import ResultCache, result_cache_params
+
+
+def _params(**overrides):
+    params = dict(
+        model="small",
+        language="en",
+        task="transcribe",
+        temperature=0.0,
+        condition_on_previous_text=True,
+        initial_prompt=None,
+    )
+    params.update(overrides)
+    return result_cache_params(**params)
+
+
+def test_result_cache_roundtrip_and_rerender(tmp_path):
+    cache = ResultCache(str(tmp_path / "results"))
+    result = {
+        "text": " we use s wood",
+        "language": "en",
+        "segments": [{"start": 0.0, "end": 1.5, "text": " we use s wood", "tokens": [1, 2]}],
+    }
+    info = {"id": "dQw4w9WgXcQ", "title": "Demo", "formats": []}
+    path = cache.save(info, _params(), result)
+
+    entry = cache.load("dQw4w9WgXcQ", _params())
+    assert entry["info"] == {"id": "dQw4w9WgXcQ", "title": "Demo"}
+    assert "tokens" not in entry["result"]["segments"][0]
+    # Any decoding parameter change is a different entry
+    assert cache.load("dQw4w9WgXcQ", _params(model="medium")) is None
+    assert cache.load("dQw4w9WgXcQ", _params(initial_prompt="SWOOD.")) is None
+
+    glossary = tmp_path / "glossary.json"
+    glossary.write_text(
+        json.dumps({"glossary": [{"correct_term": "SWOOD", "detected_variants": ["s wood"]}]}),
+        encoding="utf-8",
+    )
+    out = rerender_cached(
+        path, output_format="txt", output_dir=str(tmp_path / "out"), replace_map=str(glossary)
+    )
+    assert out.endswith("Demo-dQw4w9WgXcQ.en.txt")
+    assert Path(out).read_text(encoding="utf-8") == "we use SWOOD"
+
+
+def _cache_demo(tmp_path):
+    cache_dir = str(tmp_path / "results")
+    result = {
+        "text": " we use s wood",
+        "language": "en",
+        "segments": [{"start": 0.0, "end": 1.5, "text": " we use s wood"}],
+    }
+    ResultCache(cache_dir).save({"id": "dQw4w9WgXcQ", "title": "Demo"}, _params(), result)
+    return cache_dir
+
+
+def _no_download(*args, **kwargs):
+    raise AssertionError("cached video downloaded")
+
+
+def test_batch_renders_cached_results_without_downloading(tmp_path, monkeypatch):
+    from concurrent.futures import Future
+
+    from yt_whisper_scribe import batch
+
+    loaded = Future()
+    loaded.set_result(object())
+    monkeypatch.setattr(batch, "resolve_device", lambda device: "cpu")
+    monkeypatch.setattr(batch, "check_ffmpeg", lambda: None)
+    monkeypatch.setattr(batch, "start_model_load", lambda *a, **kw: loaded)
+    monkeypatch.setattr(batch, "download_audio", _no_download)
+
+    items = batch.transcribe_batch(
+        ["https://youtu.be/dQw4w9WgXcQ"],
+        output_dir=str(tmp_path / "out"),
+        result_cache_dir=_cache_demo(tmp_path),
+        output_format="txt",
+        replace_map=None,
+    )
+    assert [item.error for item in items] == [None]
+    assert Path(items[0].output_path).read_text(encoding="utf-8") == "we use s wood"
+
+
+def test_server_renders_cached_results_without_downloading(tmp_path, monkeypatch):
+    from yt_whisper_scribe import server
+
+    monkeypatch.setattr(server, "resolve_device", lambda device: "cpu")
+    monkeypatch.setattr(server, "check_ffmpeg", lambda: None)
+    monkeypatch.setattr(server, "download_audio", _no_download)
+
+    service = server.TranscriptionService(
+        models=[], output_dir=str(tmp_path / "out"), result_cache_dir=_cache_demo(tmp_path)
+    )
+    response = service.run(
+        {
+            "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "output_format": "txt",
+            "replace_map": None,
+            "return_segments": True,
+        }
+    )
+    assert response["video_id"] == "dQw4w9WgXcQ"
+    assert response["output_path"].endswith("Demo-dQw4w9WgXcQ.en.txt")
+    assert response["segments"] == [{"start": 0.0, "end": 1.5, "text": " we use s wood"}]
+    assert service.pool.names() == []
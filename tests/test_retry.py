@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import sys
+import threading
+import types
+from pathlib import Path
+
+import pytest
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe import download
+from yt_whisper_scribe.download import DownloadError, download_audio
+from yt_whisper_scribe.retry import CircuitBreaker, backoff_delay, host_key
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_backoff_is_exponential_capped_and_jittered():
+    for attempt in range(8):
+        expected = min(60.0, 2.0 * 2**attempt)
+        delays = {backoff_delay(attempt) for _ in range(20)}
+        assert all(expected / 2 <= d <= expected for d in delays)
+        assert len(delays) > 1
+
+
+def test_host_key_groups_youtube_aliases():
+    assert host_key("https://youtu.be/dQw4w9WgXcQ") == "youtube.com"
+    assert host_key("https://m.youtube.com/watch?v=dQw4w9WgXcQ") == "youtube.com"
+    assert host_key("https://vimeo.com/1") == "vimeo.com"
+
+
+def test_circuit_opens_after_threshold_and_lets_one_trial_through():
+    clock = _Clock()
+    breaker = CircuitBreaker(threshold=2, cooldown=10.0, clock=clock)
+    breaker.record_failure("h")
+    assert breaker.wait_time("h") == 0.0
+    breaker.record_failure("h")
+    assert breaker.wait_time("h") == 10.0
+    assert breaker.wait_time("other") == 0.0
+
+    clock.now = 10.0
+    assert breaker.wait_time("h") == 0.0  # the trial
+    assert breaker.wait_time("h") > 0  # others wait for its outcome
+    breaker.record_failure("h")
+    assert breaker.wait_time("h") == 20.0  # reopened, cooldown doubled
+
+    clock.now = 30.0
+    assert breaker.wait_time("h") == 0.0
+    breaker.record_success("h")
+    assert breaker.wait_time("h") == 0.0
+    assert breaker.wait_time("h") == 0.0
+
+
+def test_breaker_trial_released_without_outcome_goes_to_next_caller():
+    clock = _Clock()
+    breaker = CircuitBreaker(threshold=1, cooldown=10.0, clock=clock)
+    breaker.record_failure("h")
+    clock.now = 10.0
+    assert breaker.wait_time("h") == 0.0  # this thread runs the trial
+    assert breaker.wait_time("h") > 0
+    # Only the trial's own thread can give it up
+    other = threading.Thread(target=breaker.release_trial, args=("h",))
+    other.start()
+    other.join()
+    assert breaker.wait_time("h") > 0
+    breaker.release_trial("h")
+    assert breaker.wait_time("h") == 0.0
+
+
+def _fake_yt_dlp(monkeypatch, errors):
+    calls = []
+
+    class FakeYDL:
+        def __init__(self, params):
+            self.params = params
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def extract_info(self, url, download=True):
+            calls.append(url)
+            if errors:
+                raise errors.pop(0)
+            path = self.params["outtmpl"] % {"ext": "webm"}
+            Path(path).write_bytes(b"audio")
+            return {"id": "dQw4w9WgXcQ", "requested_downloads": [{"filepath": path}]}
+
+    monkeypatch.setitem(sys.modules, "yt_dlp", types.SimpleNamespace(YoutubeDL=FakeYDL))
+    return calls
+
+
+def test_download_retries_with_backoff_and_feeds_breaker(tmp_path, monkeypatch):
+    clock = _Clock()
+    sleeps = []
+
+    def _sleep(seconds):
+        sleeps.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(download.time, "sleep", _sleep)
+    calls = _fake_yt_dlp(monkeypatch, [OSError("HTTP Error 429"), OSError("HTTP Error 429")])
+    breaker = CircuitBreaker(threshold=2, cooldown=5.0, clock=clock)
+    info, path = download_audio(
+        "https://youtu.be/dQw4w9WgXcQ",
+        str(tmp_path / "audio"),
+        audio_format="native",
+        output_dir=str(tmp_path),
+        breaker=breaker,
+    )
+    assert path == str(tmp_path / "audio.webm")
+    assert len(calls) == 3
+    # Two backoff sleeps; the second failure opened the circuit, so the trial
+    # waits out the rest of its cooldown
+    assert 1.0 <= sleeps[0] <= 2.0 and 2.0 <= sleeps[1] <= 4.0
+    assert sum(sleeps[1:]) == pytest.approx(5.0)
+    assert breaker.wait_time("youtube.com") == 0.0
+
+
+def test_download_does_not_retry_unavailable_video(tmp_path, monkeypatch):
+    monkeypatch.setattr(download.time, "sleep", lambda s: None)
+    calls = _fake_yt_dlp(monkeypatch, [OSError("ERROR: Private video")])
+    with pytest.raises(DownloadError):
+        download_audio(
+            "https://youtu.be/dQw4w9WgXcQ",
+            str(tmp_path / "audio"),
+            audio_format="native",
+            output_dir=str(tmp_path),
+        )
+    assert len(calls) == 1
+
+
+def test_download_without_session_uses_process_breaker(tmp_path, monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(download.time, "sleep", lambda s: None)
+    monkeypatch.setattr(
+        download, "_default_breaker", CircuitBreaker(threshold=3, cooldown=30.0, clock=clock)
+    )
+    _fake_yt_dlp(monkeypatch, [OSError("HTTP Error 429")] * 3)
+    with pytest.raises(DownloadError):
+        download_audio(
+            "https://youtu.be/dQw4w9WgXcQ",
+            str(tmp_path / "audio"),
+            audio_format="native",
+            output_dir=str(tmp_path),
+        )
+    assert download._default_breaker.wait_time("youtube.com") == 30.0
+
+
+def test_download_interrupted_trial_frees_the_circuit(tmp_path, monkeypatch):
+    clock = _Clock()
+    breaker = CircuitBreaker(threshold=1, cooldown=5.0, clock=clock)
+    breaker.record_failure("youtube.com")
+    clock.now = 5.0
+    _fake_yt_dlp(monkeypatch, [KeyboardInterrupt()])
+    with pytest.raises(KeyboardInterrupt):
+        download_audio(
+            "https://youtu.be/dQw4w9WgXcQ",
+            str(tmp_path / "audio"),
+            audio_format="native",
+            output_dir=str(tmp_path),
+            breaker=breaker,
+        )
+    # The next job runs a new trial instead of polling forever
+    assert breaker.wait_time("youtube.com") == 0.0
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe.replace import apply_glossary_replacements
+from yt_whisper_scribe.segments import SegmentStore
+from yt_whisper_scribe.srt import generate_srt_content
+from yt_whisper_scribe.writers import open_writers
+
+SEGMENTS = [
+    {"id": 0, "start": 0.0, "end": 2.0, "text": " we use s", "tokens": [1, 2, 3]},
+    {
+        "id": 1,
+        "start": 2.0,
+        "end": 4.5,
+        "text": " wood design today",
+        "words": [{"word": " wood", "start": 2.0, "end": 2.4, "probability": 0.9}],
+    },
+    {"id": 2, "start": 4.5, "end": 6.0, "text": " and S Wood again"},
+]
+GLOSSARY = {"glossary": [{"correct_term": "SWOOD", "detected_variants": ["s wood"]}]}
+
+
+def test_store_round_trip_keeps_only_rendered_fields():
+    store = SegmentStore.from_segments(SEGMENTS)
+    assert len(store) == 3
+    assert list(store.starts) == [0.0, 2.0, 4.5]
+    assert store.words == {1: SEGMENTS[1]["words"]}
+    assert store.to_segments() == [
+        {"start": 0.0, "end": 2.0, "text": " we use s"},
+        {"start": 2.0, "end": 4.5, "text": " wood design today", "words": SEGMENTS[1]["words"]},
+        {"start": 4.5, "end": 6.0, "text": " and S Wood again"},
+    ]
+    tail = store.slice(1, 3)
+    assert tail.words == {0: SEGMENTS[1]["words"]}
+    head = store.slice(0, 1)
+    head.extend(tail)
+    assert head.to_segments() == store.to_segments()
+
+
+def test_replacements_on_store_match_dict_path():
+    from_dicts, dict_events = apply_glossary_replacements(SEGMENTS, GLOSSARY)
+    store = SegmentStore.from_segments(SEGMENTS)
+    from_store, store_events = apply_glossary_replacements(store, GLOSSARY)
+
+    assert isinstance(from_store, SegmentStore)
+    assert from_store.to_segments() == from_dicts
+    assert store_events == dict_events
+    # The input store is left untouched
+    assert store.texts[0] == " we use s"
+
+
+def test_writers_and_srt_accept_store(tmp_path):
+    store = SegmentStore.from_segments(SEGMENTS)
+    assert generate_srt_content({"segments": store}) == generate_srt_content({"segments": SEGMENTS})
+
+    from_store = {f: str(tmp_path / f"store.{f}") for f in ("srt", "json", "tsv")}
+    from_dicts = {f: str(tmp_path / f"dicts.{f}") for f in ("srt", "json", "tsv")}
+    for paths, segments in ((from_store, store), (from_dicts, SEGMENTS)):
+        writer = open_writers(paths, meta={"id": "x"})
+        writer.write(segments)
+        writer.close()
+    for fmt in from_store:
+        assert Path(from_store[fmt]).read_text(encoding="utf-8") == Path(from_dicts[fmt]).read_text(
+            encoding="utf-8"
+        )
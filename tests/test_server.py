@@ -0,0 +1,179 @@
+import json
+import sys
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe import server
+from yt_whisper_scribe.server import JobError, ModelPool, TranscriptionService, _Handler
+
+
+class _FakePool:
+    def names(self):
+        return ["small"]
+
+
+class _FakeService:
+    pool = _FakePool()
+
+    def run(self, job):
+        if "url" not in job:
+            raise JobError("champ 'url' manquant")
+        if job["url"] == "boom":
+            raise ValueError("erreur interne")
+        return {"output_path": "/tmp/out.srt", "segments": []}
+
+
+def _post(base, payload):
+    req = urllib.request.Request(
+        base + "/transcribe",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(req) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_server_http_roundtrip():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.service = _FakeService()
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    try:
+        with urllib.request.urlopen(base + "/health") as resp:
+            assert json.loads(resp.read()) == {"status": "ok", "models": ["small"]}
+        assert _post(base, {"url": "https://youtu.be/x"}) == (
+            200,
+            {"output_path": "/tmp/out.srt", "segments": []},
+        )
+        status, body = _post(base, {"model": "small"})
+        assert status == 400 and "url" in body["error"]
+        # Only request errors are the client's fault
+        assert _post(base, {"url": "boom"})[0] == 500
+        assert _post(base, ["https://youtu.be/x"])[0] == 400
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+class _FakeModel:
+    def __init__(self, name):
+        self.name = name
+
+
+@pytest.fixture
+def service_env(tmp_path, monkeypatch):
+    """TranscriptionService with stubbed model loading, download and transcription."""
+    loads = []
+    calls = []
+
+    def load_whisper_model(name, device, *, warm_up=False, backend="whisper"):
+        loads.append(name)
+        return _FakeModel(name)
+
+    def download_audio(url, output_template, **kwargs):
+        audio_path = output_template + ".m4a"
+        Path(audio_path).write_bytes(b"audio")
+        return {"id": "abc", "title": "Demo"}, audio_path
+
+    def transcribe_downloaded(info_dict, audio, *, whisper_model, model, on_result, **kwargs):
+        calls.append({"model": whisper_model.name, **kwargs})
+        if kwargs.get("task") == "fail":
+            raise RuntimeError("transcription impossible")
+        on_result({"segments": [{"start": 0.0, "end": 1.0, "text": " hi", "words": []}]})
+        return str(tmp_path / "out" / "Demo-abc.en.srt")
+
+    monkeypatch.setattr(server, "resolve_device", lambda device: "cpu")
+    monkeypatch.setattr(server, "check_ffmpeg", lambda: None)
+    monkeypatch.setattr(server, "load_whisper_model", load_whisper_model)
+    monkeypatch.setattr(server, "download_audio", download_audio)
+    monkeypatch.setattr(server, "decode_pcm", lambda path: [0.0])
+    monkeypatch.setattr(server, "transcribe_downloaded", transcribe_downloaded)
+    return tmp_path / "out", loads, calls
+
+
+def test_service_run_uses_default_model_and_returns_segments(service_env):
+    out, loads, calls = service_env
+    service = TranscriptionService(models=["small", "turbo"], output_dir=str(out))
+    assert loads == ["small", "large-v3-turbo"]
+
+    response = service.run({"url": "https://youtu.be/abc", "language": "fr"})
+    assert response == {
+        "output_path": str(out / "Demo-abc.en.srt"),
+        "video_id": "abc",
+        "model": "small",
+    }
+    assert calls[-1]["model"] == "small" and calls[-1]["language"] == "fr"
+
+    response = service.run({"url": "https://youtu.be/abc", "model": "turbo", "return_segments": 1})
+    assert response["model"] == "large-v3-turbo"
+    assert response["segments"] == [{"start": 0.0, "end": 1.0, "text": " hi"}]
+    # Models are loaded once, at startup
+    assert loads == ["small", "large-v3-turbo"]
+    assert not list(out.glob(".job-*"))
+
+
+def test_service_run_rejects_invalid_jobs(service_env):
+    out, loads, calls = service_env
+    service = TranscriptionService(models=["small"], output_dir=str(out))
+    with pytest.raises(JobError, match="options inconnues: beam"):
+        service.run({"url": "https://youtu.be/abc", "beam": 5})
+    with pytest.raises(JobError, match="format"):
+        service.run({"url": "https://youtu.be/abc", "output_format": "docx"})
+    with pytest.raises(JobError, match="modèle non disponible"):
+        service.run({"url": "https://youtu.be/abc", "model": "large"})
+    assert loads == ["small"] and calls == []
+
+
+def test_service_run_cleans_workspace_on_failure(service_env):
+    out, loads, calls = service_env
+    service = TranscriptionService(models=["small"], output_dir=str(out))
+    with pytest.raises(RuntimeError, match="transcription impossible"):
+        service.run({"url": "https://youtu.be/abc", "task": "fail"})
+    assert len(calls) == 1
+    assert not list(out.glob(".job-*"))
+
+
+def test_model_pool_loads_each_allowed_model_once(service_env):
+    out, loads, calls = service_env
+    pool = ModelPool("cpu", allowed=["turbo"])
+    first = pool.get("turbo")
+    assert pool.get("large-v3-turbo") is first
+    assert loads == ["large-v3-turbo"] and pool.names() == ["large-v3-turbo"]
+    with pytest.raises(JobError):
+        pool.get("small")
+    assert loads == ["large-v3-turbo"]
+
+
+def test_service_run_skips_existing_output_before_downloading(service_env, monkeypatch):
+    out, loads, calls = service_env
+
+    def _no_download(*args, **kwargs):
+        raise AssertionError("téléchargement inattendu")
+
+    monkeypatch.setattr(server, "download_audio", _no_download)
+    out.mkdir()
+    existing = out / "Demo-abcdefghijk.en.srt"
+    existing.write_text("1\n00:00:00,000 --> 00:00:01,500\nHello\n", encoding="utf-8")
+    service = TranscriptionService(models=["small"], output_dir=str(out))
+
+    job = {"url": "https://youtu.be/abcdefghijk", "skip_existing": True}
+    response = service.run(dict(job, return_segments=True))
+    assert response["output_path"] == str(existing)
+    assert response["video_id"] == "abcdefghijk"
+    assert response["segments"] == [{"start": 0.0, "end": 1.5, "text": "Hello"}]
+    assert "segments" not in service.run(job)
+    assert calls == []
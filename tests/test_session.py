@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe.session import DownloadSession
+
+
+class _FakeYDL:
+    created = []
+    cookie_loads = 0
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, params):
+        self.params = dict(params)
+        self.params["outtmpl"] = {"default": params["outtmpl"]} if "outtmpl" in params else {}
+        self.cookiejar = object()
+        if params.get("cookiefile"):
+            type(self).cookie_loads += 1
+        self.closed = False
+        type(self).created.append(self)
+
+    def extract_info(self, url, download=True):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(0.01)
+        with cls.lock:
+            cls.active -= 1
+        return {"id": url, "outtmpl": self.params["outtmpl"].get("default")}
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+
+def _install_fake(monkeypatch):
+    fake = type("FakeYDL", (_FakeYDL,), {"created": [], "cookie_loads": 0, "active": 0, "peak": 0})
+    monkeypatch.setitem(sys.modules, "yt_dlp", types.SimpleNamespace(YoutubeDL=fake))
+    return fake
+
+
+def test_session_shares_cookie_jar_and_reuses_instances(tmp_path, monkeypatch):
+    fake = _install_fake(monkeypatch)
+    cookies = tmp_path / "cookies.txt"
+    cookies.write_text("# Netscape HTTP Cookie File\n", encoding="utf-8")
+    session = DownloadSession(cookies_file=str(cookies), output_dir=str(tmp_path))
+
+    for stem in ("a", "b"):
+        with session.downloader(str(tmp_path / stem), audio_format="m4a") as ydl:
+            info = ydl.extract_info("vid", download=True)
+        assert info["outtmpl"] == str(tmp_path / stem)
+    session.extract_info("vid")
+
+    # One instance per option set, the cookie file parsed once, the jar shared
+    assert len(fake.created) == 2
+    assert fake.cookie_loads == 1
+    assert fake.created[1].cookiejar is fake.created[0].cookiejar
+
+    session.close()
+    assert all(ydl.closed for ydl in fake.created)
+
+
+def test_session_limits_concurrent_instances(tmp_path, monkeypatch):
+    fake = _install_fake(monkeypatch)
+    session = DownloadSession(output_dir=str(tmp_path), max_concurrent=2)
+    threads = [threading.Thread(target=session.extract_info, args=(str(i),)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    session.close()
+
+    assert fake.peak <= 2
+    assert len(fake.created) <= 2
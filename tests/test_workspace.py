@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from yt_whisper_scribe.workspace import JobWorkspace
+
+
+def test_job_workspaces_are_unique_and_removed(tmp_path):
+    a, b = JobWorkspace(str(tmp_path)), JobWorkspace(str(tmp_path))
+    assert a.dir != b.dir
+    assert a.path("audio") != b.path("audio")
+
+    Path(a.path("audio.webm")).write_bytes(b"x")
+    a.cleanup()
+    assert not Path(a.dir).exists()
+    assert Path(b.dir).is_dir()
+    b.cleanup()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_keyed_workspace_is_kept_on_release_and_locked(tmp_path):
+    a = JobWorkspace(str(tmp_path), key="dQw4w9WgXcQ")
+    assert a.resumable and a.dir == str(tmp_path / ".job-dQw4w9WgXcQ")
+    # Held by a: a concurrent job for the same video gets a private directory
+    busy = JobWorkspace(str(tmp_path), key="dQw4w9WgXcQ")
+    assert not busy.resumable and busy.dir != a.dir
+    busy.release()
+    assert not Path(busy.dir).exists()
+
+    Path(a.path("audio.webm.part")).write_bytes(b"partial")
+    a.release()
+    b = JobWorkspace(str(tmp_path), key="dQw4w9WgXcQ")
+    assert b.dir == a.dir
+    assert Path(b.path("audio.webm.part")).read_bytes() == b"partial"
+    b.cleanup()
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure 'src' is on sys.path for the src-layout
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+import json
+
+import pytest
+
+from yt_whisper_scribe.srt import generate_srt_content
+from yt_whisper_scribe.writers import (
+    SrtWriter,
+    TxtWriter,
+    open_writers,
+    parse_output_formats,
+    read_output_segments,
+    read_segments,
+)
+
+SEGMENTS = [
+    {"start": 0.0, "end": 1.5, "text": " Hello"},
+    {"start": 1.5, "end": 3.25, "text": " world. "},
+    {"start": 3.25, "end": 61.0, "text": "Done"},
+]
+
+
+def test_srt_writer_streams_same_content_as_generate_srt(tmp_path):
+    path = tmp_path / "out.srt"
+    writer = SrtWriter(str(path))
+    writer.write(SEGMENTS[:1])
+    # Partial output is visible while the file is incomplete
+    assert not path.exists()
+    assert (tmp_path / "out.srt.part").read_text(encoding="utf-8").startswith("1\n")
+    writer.write(SEGMENTS[1:])
+    assert writer.close() == str(path)
+
+    assert path.read_text(encoding="utf-8") == generate_srt_content({"segments": SEGMENTS})
+    assert not (tmp_path / "out.srt.part").exists()
+
+
+def test_txt_writer_joins_stripped_texts(tmp_path):
+    path = tmp_path / "out.txt"
+    writer = TxtWriter(str(path))
+    writer.write(SEGMENTS[:2])
+    writer.write([{"start": 61.0, "end": 62.0, "text": "  "}])
+    writer.write(SEGMENTS[2:])
+    writer.close()
+    assert path.read_text(encoding="utf-8") == "Hello world. Done"
+
+
+def test_open_writers_emits_all_formats_in_one_pass(tmp_path):
+    segments = [dict(SEGMENTS[0], words=[{"word": " Hello", "start": 0.1, "end": 0.9}])]
+    segments += SEGMENTS[1:]
+    paths = {
+        fmt: str(tmp_path / f"out.{fmt}") for fmt in parse_output_formats("srt, vtt,tsv,json,txt")
+    }
+    writer = open_writers(paths, meta={"id": "abc", "title": "T", "language": "en"})
+    writer.write(segments[:1])
+    writer.write(segments[1:])
+    assert writer.close() == list(paths.values())
+
+    read = {fmt: Path(p).read_text(encoding="utf-8") for fmt, p in paths.items()}
+    assert read["srt"] == generate_srt_content({"segments": SEGMENTS})
+    assert read["txt"] == "Hello world. Done"
+    assert read["vtt"].startswith("WEBVTT\n\n00:00:00.000 --> 00:00:01.500\nHello\n\n")
+    assert "00:00:03.250 --> 00:01:01.000\nDone\n" in read["vtt"]
+    assert read["tsv"].splitlines() == [
+        "start\tend\ttext",
+        "0\t1500\tHello",
+        "1500\t3250\tworld.",
+        "3250\t61000\tDone",
+    ]
+    data = json.loads(read["json"])
+    assert (data["id"], data["language"]) == ("abc", "en")
+    assert [s["text"] for s in data["segments"]] == ["Hello", "world.", "Done"]
+    assert data["segments"][0]["words"] == [{"word": " Hello", "start": 0.1, "end": 0.9}]
+    assert "words" not in data["segments"][1]
+
+
+def test_json_writer_without_segments_is_valid(tmp_path):
+    paths = {"json": str(tmp_path / "empty.json")}
+    open_writers(paths).close()
+    assert json.loads(Path(paths["json"]).read_text(encoding="utf-8")) == {"segments": []}
+
+
+def test_parse_output_formats_rejects_unknown():
+    assert parse_output_formats("srt,srt,VTT") == ["srt", "vtt"]
+    with pytest.raises(ValueError):
+        parse_output_formats("srt,docx")
+
+
+def test_read_segments_reads_back_every_format(tmp_path):
+    paths = {fmt: str(tmp_path / f"out.{fmt}") for fmt in ("srt", "vtt", "tsv", "json", "txt")}
+    writer = open_writers(paths, meta={"id": "abc"})
+    writer.write(SEGMENTS)
+    writer.close()
+    expected = [(s["start"], s["end"], s["text"].strip()) for s in SEGMENTS]
+    for fmt in ("srt", "vtt", "tsv", "json"):
+        assert [(s["start"], s["end"], s["text"]) for s in read_segments(paths[fmt])] == expected
+    assert read_segments(paths["txt"]) == [{"start": 0.0, "end": 0.0, "text": "Hello world. Done"}]
+    # The timed sibling of a txt output is preferred
+    assert read_output_segments(paths["txt"], "txt,srt") == read_segments(paths["srt"])